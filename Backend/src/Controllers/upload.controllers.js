@@ -1,100 +1,100 @@
 import Statement from "../Models/statements.models.js";
-import path from "path";
-import fs from "fs";
-import { spawn } from "child_process";
+import mongoose from "mongoose";
 import APIError from "../Utils/apiError.utils.js";
+import jobQueue from "../Utils/jobQueue.utils.js";
+import parserPool from "../Utils/parserPool.utils.js";
+
+// Parses while the request waits (POST /upload?wait=true), through the warm
+// parser pool. Kept for scripts that want the result in one call. The upload
+// goes to the worker straight from memory; no temporary file is written.
+const parseNow = async (req, res, next, newStatement) => {
+  let jsonData;
+  try {
+    jsonData = await parserPool.parse(req.file.buffer, req.file.originalname);
+  } catch (err) {
+    console.error("Python parser failed:", err);
+    newStatement.status = "Failed";
+    newStatement.errorMessage = err.message;
+    await newStatement.save();
+    return next(new APIError(500, "Python parser failed."));
+  }
+
+  try {
+    newStatement.parsedData = jsonData;
+    newStatement.issuerBank = jsonData.bank_detected || "Unknown";
+    newStatement.status = "Parsed";
+    await newStatement.save();
+
+    return res.json({
+      success: true,
+      message: `File uploaded and parsed successfully (${newStatement.issuerBank})`,
+      data: jsonData,
+    });
+  } catch (err) {
+    console.error("Error after Python parse:", err);
+    newStatement.status = "Failed";
+    newStatement.errorMessage = err.message;
+    await newStatement.save();
+    return next(new APIError(500, "Server error after Python parse."));
+  }
+};
 
 const uploadStatement = async (req, res, next) => {
   try {
     if (!req.file) throw new APIError(400, "No file was uploaded");
 
-    const uploadsDir = "./uploads";
-    if (!fs.existsSync(uploadsDir)) fs.mkdirSync(uploadsDir, { recursive: true });
-
-    const tempFilePath = path.join(uploadsDir, `${Date.now()}-${req.file.originalname}`);
-    fs.writeFileSync(tempFilePath, req.file.buffer);
-
     const newStatement = await Statement.create({
       fileName: req.file.originalname,
       status: "Pending",
     });
 
-    const pythonCmd = process.platform === "win32" ? "py" : "python3";
-
-    const python = spawn(pythonCmd, ["src/parser/main_parser.py", tempFilePath], {
-      stdio: ["ignore", "pipe", "pipe"],
-    });
-
-    let parsedData = "";
-    let pythonError = "";
-
-    python.stdout.on("data", (data) => {
-      parsedData += data.toString();
-    });
-
-    python.stderr.on("data", (data) => {
-      pythonError += data.toString();
-      console.error("Python error:", data.toString());
-    });
+    if (req.query.wait === "true") return parseNow(req, res, next, newStatement);
 
-    python.on("error", async (err) => {
-      console.error("Failed to start Python process:", err);
+    try {
+      await jobQueue.enqueue(newStatement.id, req.file.buffer, req.file.originalname);
+    } catch (err) {
+      console.error("Queueing the statement failed:", err);
       newStatement.status = "Failed";
       newStatement.errorMessage = err.message;
       await newStatement.save();
-      if (fs.existsSync(tempFilePath)) fs.unlinkSync(tempFilePath);
-      return next(new APIError(500, "Failed to start Python process."));
+      // a full queue answers 503 so the client can retry
+      return next(err instanceof APIError ? err : new APIError(500, "Could not queue the statement for parsing."));
+    }
+
+    return res.status(202).json({
+      success: true,
+      message: "File uploaded; parsing has been queued",
+      data: { id: newStatement.id, status: newStatement.status },
     });
+  } catch (error) {
+    next(error);
+  }
+};
 
-    python.on("close", async (code) => {
-      try {
-        if (fs.existsSync(tempFilePath)) fs.unlinkSync(tempFilePath);
-
-        if (code === 0 && parsedData.trim()) {
-          const cleanOutput = parsedData
-            .trim()
-            .replace(/^[^\{]*({[\s\S]*})[^\}]*$/m, "$1");
-
-          let jsonData;
-          try {
-            jsonData = JSON.parse(cleanOutput);
-          } catch (parseErr) {
-            newStatement.status = "Failed";
-            newStatement.errorMessage = "Invalid JSON from parser.";
-            await newStatement.save();
-            return next(new APIError(500, "Failed to parse Python output."));
-          }
-
-          newStatement.parsedData = jsonData;
-          newStatement.issuerBank = jsonData.bank_detected || "Unknown";
-          newStatement.status = "Parsed";
-          await newStatement.save();
-
-          return res.json({
-            success: true,
-            message: `File uploaded and parsed successfully (${newStatement.issuerBank})`,
-            data: jsonData,
-          });
-        } else {
-          newStatement.status = "Failed";
-          newStatement.errorMessage =
-            pythonError || `Python exited with code ${code}`;
-          await newStatement.save();
-
-          console.error("Python parser failed:", pythonError);
-          return next(new APIError(500, "Python parser failed."));
-        }
-      } catch (err) {
-        console.error("Error after Python close:", err);
-        newStatement.status = "Failed";
-        newStatement.errorMessage = err.message;
-        await newStatement.save();
-        return next(new APIError(500, "Server error after Python parse."));
-      }
+const getStatementStatus = async (req, res, next) => {
+  try {
+    if (!mongoose.isValidObjectId(req.params.id)) throw new APIError(404, "Statement not found");
+    const statement = await Statement.findById(req.params.id);
+    if (!statement) throw new APIError(404, "Statement not found");
+
+    const pending = statement.status === "Pending";
+    return res.json({
+      success: true,
+      data: {
+        id: statement.id,
+        fileName: statement.fileName,
+        status: statement.status,
+        // where a pending job is: "queued", "running", or null once it has finished
+        queueState: pending ? jobQueue.state(statement.id) : null,
+        issuerBank: statement.issuerBank,
+        errorMessage: statement.errorMessage,
+        parsedData: statement.status === "Parsed" ? statement.parsedData : null,
+      },
     });
   } catch (error) {
     next(error);
   }
 };
 
+export { getStatementStatus };
 export default uploadStatement;
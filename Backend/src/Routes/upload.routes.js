@@ -1,4 +1,4 @@
-import uploadStatement from "../Controllers/upload.controllers.js";
+import uploadStatement, { getStatementStatus } from "../Controllers/upload.controllers.js";
 import express from "express";
 import multer from "multer";
 
@@ -8,5 +8,6 @@ const storage = multer.memoryStorage();
 const upload = multer({ storage });
 
 router.post("/upload", upload.single("file"), uploadStatement);
+router.get("/statements/:id", getStatementStatus);
 
 export default router;
\ No newline at end of file
@@ -0,0 +1,139 @@
+import fs from "fs";
+import path from "path";
+import Statement from "../Models/statements.models.js";
+import APIError from "./apiError.utils.js";
+import parserPool from "./parserPool.utils.js";
+
+// Same layout as src/parser/jobs.py: a job moves incoming/ -> working/ ->
+// done/ or failed/ by renames, so no reader ever sees a partial file.
+const SPOOL_DIR = path.resolve(process.env.PARSER_SPOOL_DIR || ".spool");
+const STATES = ["incoming", "working", "done", "failed"];
+const QUEUE_STATE = { incoming: "queued", working: "running" };
+
+// By default queued jobs go to this server's warm parser pool (the one
+// ?wait=true uses), straight from memory. With PARSER_QUEUE=spool uploads are
+// written to a shared spool instead and parsed by `main_parser.py
+// --queue-worker` processes, which survive API restarts and scale separately.
+const SPOOL = process.env.PARSER_QUEUE === "spool";
+// Jobs held in memory at once; uploads past it are refused until some finish.
+const MAX_JOBS = Number(process.env.PARSER_QUEUE_MAX) || 100;
+const COLLECT_MS = Number(process.env.PARSER_QUEUE_POLL_MS) || 500;
+
+// Queue of parse jobs. Uploads are enqueued and answered at once; finished
+// jobs are recorded in their Statement documents.
+class JobQueue {
+  constructor(pool) {
+    this.pool = pool;
+    // "queued" or "running" for each job held in memory
+    this.jobs = new Map();
+    this.started = false;
+    this.collecting = false;
+  }
+
+  start() {
+    if (this.started) return;
+    this.started = true;
+    this.startedAt = new Date();
+    if (!this.pool) {
+      for (const state of STATES) fs.mkdirSync(path.join(SPOOL_DIR, state), { recursive: true });
+      this.timer = setInterval(() => this.collect(), COLLECT_MS);
+      this.timer.unref();
+    }
+    this.recover().catch((err) => console.error("Recovering pending statements failed:", err));
+  }
+
+  // Fail the statements a previous run left "Pending" with no job behind
+  // them: in memory the upload went with that run, and in the spool its
+  // file is gone. Assumes one API server per database in memory mode.
+  async recover() {
+    const pending = await Statement.find({ status: "Pending", createdAt: { $lt: this.startedAt } }, "_id");
+    for (const { id } of pending) {
+      if (!this.pool && STATES.some((state) => fs.existsSync(this.jobPath(state, id)))) continue;
+      await Statement.updateOne(
+        { _id: id, status: "Pending" },
+        { status: "Failed", errorMessage: "The server restarted before the statement was parsed; upload it again." }
+      );
+    }
+  }
+
+  jobPath(state, id) {
+    return path.join(SPOOL_DIR, state, `${id}${state === "done" || state === "failed" ? ".json" : ".pdf"}`);
+  }
+
+  async enqueue(id, buffer, name) {
+    this.start();
+    if (this.pool) {
+      if (this.jobs.size >= MAX_JOBS) throw new APIError(503, "The parse queue is full; try again shortly.");
+      this.jobs.set(id, "queued");
+      this.pool
+        .parse(buffer, name, () => this.jobs.set(id, "running"))
+        .then(
+          (result) => this.record(id, { type: "result", result }),
+          (err) => this.record(id, { type: "error", error: err.message })
+        )
+        .catch((err) => console.error("Recording a parse result failed:", err))
+        .finally(() => this.jobs.delete(id));
+      return;
+    }
+    const tmp = path.join(SPOOL_DIR, "incoming", `.${id}.${process.pid}.tmp`);
+    await fs.promises.writeFile(tmp, buffer);
+    await fs.promises.rename(tmp, this.jobPath("incoming", id));
+  }
+
+  // "queued" or "running" while the job is pending, otherwise null.
+  state(id) {
+    if (this.pool) return this.jobs.get(id) ?? null;
+    for (const state of ["working", "incoming"]) {
+      if (fs.existsSync(this.jobPath(state, id))) return QUEUE_STATE[state];
+    }
+    return null;
+  }
+
+  async collect() {
+    if (this.collecting) return;
+    this.collecting = true;
+    try {
+      for (const state of ["done", "failed"]) {
+        const names = await fs.promises.readdir(path.join(SPOOL_DIR, state));
+        for (const name of names) {
+          if (name.startsWith(".") || !name.endsWith(".json")) continue;
+          await this.finish(path.join(SPOOL_DIR, state, name));
+        }
+      }
+    } catch (err) {
+      console.error("Collecting parse results failed:", err);
+    } finally {
+      this.collecting = false;
+    }
+  }
+
+  async finish(file) {
+    const frame = JSON.parse(await fs.promises.readFile(file, "utf8"));
+    await this.record(frame.id, frame);
+    await fs.promises.unlink(file);
+  }
+
+  // Store a "result" or "error" frame (see protocol.py) in its Statement.
+  async record(id, frame) {
+    const statement = await Statement.findById(id);
+    if (!statement) return;
+    if (frame.type === "result") {
+      statement.parsedData = frame.result;
+      statement.issuerBank = frame.result.bank_detected || "Unknown";
+      statement.status = "Parsed";
+    } else {
+      statement.status = "Failed";
+      statement.errorMessage = frame.error || "Parser failed";
+    }
+    await statement.save();
+  }
+
+  close() {
+    this.started = false;
+    clearInterval(this.timer);
+  }
+}
+
+const jobQueue = new JobQueue(SPOOL ? null : parserPool);
+
+export default jobQueue;
@@ -0,0 +1,166 @@
+import os from "os";
+import readline from "readline";
+import { spawn } from "child_process";
+
+const pythonCmd = process.platform === "win32" ? "py" : "python3";
+const PARSER_SCRIPT = "src/parser/main_parser.py";
+// Replies are one JSON frame per line; PARSER_FORMAT=orjson encodes them
+// faster when the orjson package is installed. Logs arrive on stderr.
+const PARSER_FORMAT = process.env.PARSER_FORMAT === "orjson" ? "orjson" : "json";
+
+// The worker abandons a parse after PARSER_TIMEOUT seconds (0 disables it)
+// and replies with an error. If no reply comes even a little after that,
+// the process is stuck outside Python and is killed; the pool replaces it.
+const PARSE_TIMEOUT_S = Number(process.env.PARSER_TIMEOUT ?? 120);
+const KILL_GRACE_MS = 5000;
+
+// A single long-running `main_parser.py --serve` process. It handles one
+// request at a time; the pool takes care of queueing. A statement is sent
+// either as a path or, for uploads held in memory, as its bytes right after
+// the request line, so nothing has to be written to disk for the worker.
+class ParserWorker {
+  constructor(onExit) {
+    this.job = null;
+    this.alive = true;
+    this.nextId = 1;
+
+    this.proc = spawn(pythonCmd, [PARSER_SCRIPT, "--serve", "--format", PARSER_FORMAT], {
+      stdio: ["pipe", "pipe", "pipe"],
+    });
+
+    readline.createInterface({ input: this.proc.stdout }).on("line", (line) => {
+      this.handleReply(line);
+    });
+
+    // A dead worker surfaces through "exit"; swallow EPIPE on the request pipe.
+    this.proc.stdin.on("error", () => {});
+
+    this.proc.stderr.on("data", (data) => {
+      const msg = data.toString().trimEnd();
+      if (msg) console.error("Python worker:", msg);
+    });
+
+    const fail = (err) => {
+      if (!this.alive) return;
+      this.alive = false;
+      clearTimeout(this.killTimer);
+      if (this.job) {
+        this.job.reject(err);
+        this.job = null;
+      }
+      onExit(this);
+    };
+
+    this.proc.on("error", (err) => fail(err));
+    this.proc.on("exit", (code) => fail(new Error(`Python worker exited with code ${code}`)));
+  }
+
+  get idle() {
+    return this.alive && this.job === null;
+  }
+
+  run(pdf, name, resolve, reject) {
+    const id = this.nextId++;
+    this.job = { id, resolve, reject };
+    if (PARSE_TIMEOUT_S > 0) {
+      this.killTimer = setTimeout(() => this.proc.kill("SIGKILL"), PARSE_TIMEOUT_S * 1000 + KILL_GRACE_MS);
+    }
+    if (Buffer.isBuffer(pdf)) {
+      // the buffer is queued on the pipe as it is, not copied
+      this.proc.stdin.write(JSON.stringify({ id, size: pdf.length, name }) + "\n");
+      this.proc.stdin.write(pdf);
+    } else {
+      this.proc.stdin.write(JSON.stringify({ id, path: pdf }) + "\n");
+    }
+  }
+
+  handleReply(line) {
+    let reply;
+    try {
+      reply = JSON.parse(line);
+    } catch (err) {
+      console.error("Ignoring malformed worker output:", line);
+      return;
+    }
+    const job = this.job;
+    if (!job) return;
+    // an error frame without an id answers a request the worker could not
+    // read, which can only be the one in flight
+    if (reply.id !== job.id && !(reply.type === "error" && reply.id == null)) return;
+    clearTimeout(this.killTimer);
+    this.job = null;
+    switch (reply.type) {
+      case "result":
+        job.resolve(reply.result);
+        break;
+      case "error":
+        job.reject(new Error(reply.error || "Parser failed"));
+        break;
+      default:
+        job.reject(new Error(`Unexpected parser reply type: ${reply.type}`));
+    }
+  }
+
+  stop() {
+    this.alive = false;
+    this.proc.stdin.end();
+  }
+}
+
+// Fixed-size pool of warm parser processes shared by all requests.
+class ParserPool {
+  constructor(size) {
+    this.size = size;
+    this.workers = [];
+    this.queue = [];
+  }
+
+  // `pdf` is a path, or a Buffer holding the PDF (`name` labels it in the
+  // worker's logs and metrics). `onStart` is called when a worker takes it.
+  parse(pdf, name, onStart) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ pdf, name, onStart, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  dispatch() {
+    while (this.workers.length < this.size) {
+      this.workers.push(new ParserWorker((worker) => this.replace(worker)));
+    }
+    for (const worker of this.workers) {
+      if (!this.queue.length) return;
+      if (!worker.idle) continue;
+      const { pdf, name, onStart, resolve, reject } = this.queue.shift();
+      if (onStart) onStart();
+      worker.run(
+        pdf,
+        name,
+        (result) => {
+          resolve(result);
+          this.dispatch();
+        },
+        (err) => {
+          reject(err);
+          this.dispatch();
+        }
+      );
+    }
+  }
+
+  replace(worker) {
+    this.workers = this.workers.filter((w) => w !== worker);
+    if (this.queue.length) this.dispatch();
+  }
+
+  close() {
+    for (const worker of this.workers) worker.stop();
+    this.workers = [];
+  }
+}
+
+const poolSize = Number(process.env.PARSER_WORKERS) || Math.min(2, os.cpus().length);
+const parserPool = new ParserPool(poolSize);
+
+export { ParserPool };
+export default parserPool;
@@ -1,11 +1,14 @@
 import app from "./app.js";
 import dotenv from "dotenv";
 import dbConn from "./DB/dbConn.js";
+import jobQueue from "./Utils/jobQueue.utils.js";
 
 dotenv.config();
 
 const PORT = process.env.PORT || 8080;
 dbConn().then(()=>{
+    // collect results left in the spool and fail statements orphaned by a previous run
+    jobQueue.start();
     app.listen(PORT,()=>{
         console.log(`server is running on port ${PORT}`);
     })
@@ -0,0 +1,210 @@
+"""
+Text extraction backends: pdfplumber (the text the bank parsers were
+written against, the default), pdfminer (its layout analysis without box
+ordering) and pypdfium2 (PDFium, optional). open_pdf() gives a reader with
+len(), text(i, regions=None) and close(), from a path or the PDF's bytes;
+only pdfplumber crops a page to `regions`. PARSER_BACKEND, PARSER_DETECT_BACKEND
+and PARSER_REGIONS=0 override the defaults.
+"""
+import io
+import os
+import re
+from functools import lru_cache
+from importlib.metadata import version as package_version
+
+import pdfplumber
+from pdfplumber.utils import chars_to_textmap
+
+try:
+    import pypdfium2
+except ImportError:
+    pypdfium2 = None
+
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams, LTChar, LTContainer
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+
+BACKENDS = ("pdfplumber", "pdfminer", "pypdfium2")
+DEFAULT_BACKEND = "pdfplumber"
+
+# boxes_flow=None skips ordering text boxes by position, the costliest part
+# of pdfminer's analysis; statements are read top to bottom anyway. The
+# margins keep a table row's cells on one line as pdfplumber does.
+LAPARAMS = LAParams(line_margin=0.3, char_margin=3.0, word_margin=0.1, boxes_flow=None)
+# pdfminer separates text boxes with a blank line and pads lines with spaces;
+# pdfplumber's text has neither, and the parsers expect that
+_BOX_BREAKS = re.compile(r"[ \t]*\n+")
+
+
+def default_backend():
+    return os.environ.get("PARSER_BACKEND") or DEFAULT_BACKEND
+
+
+def detect_backend():
+    return os.environ.get("PARSER_DETECT_BACKEND") or ("pypdfium2" if pypdfium2 else default_backend())
+
+
+def as_file(source):
+    """A PDF path as it is, or a PDF's bytes as a file object over them."""
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def _layout_chars(objects):
+    for obj in objects:
+        if isinstance(obj, LTChar):
+            yield obj
+        elif isinstance(obj, LTContainer):
+            yield from _layout_chars(obj)
+
+
+def _in_regions(obj, page, regions):
+    # the character's centre, as page fractions from the top left
+    x = ((obj.x0 + obj.x1) / 2 - page.x0) / page.width
+    y = (page.y1 - (obj.y0 + obj.y1) / 2) / page.height
+    return any(x0 <= x <= x1 and top <= y <= bottom for x0, top, x1, bottom in regions)
+
+
+class Reader:
+    # whether text() reads only the `regions` it is given
+    crops = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class PdfplumberReader(Reader):
+    crops = True
+
+    def __init__(self, pdf_path):
+        self.pdf = pdfplumber.open(as_file(pdf_path))
+
+    def __len__(self):
+        return len(self.pdf.pages)
+
+    def text(self, index, regions=None):
+        # what page.extract_text() gives, but only characters are turned into
+        # pdfplumber objects: lines, rects, curves and images on the page, and
+        # characters outside `regions`, are dropped while still pdfminer's
+        page = self.pdf.pages[index]
+        try:
+            layout = page.layout
+            chars = [page.process_object(obj) for obj in _layout_chars(layout)
+                     if not regions or _in_regions(obj, layout, regions)]
+            if not chars:
+                return ""
+            return chars_to_textmap(chars, layout_bbox=page.bbox, layout_width=page.width,
+                                    layout_height=page.height).as_string
+        finally:
+            # the page keeps its layout until closed; a page is read once
+            page.close()
+
+    def close(self):
+        self.pdf.close()
+
+
+class PdfminerReader(Reader):
+    def __init__(self, pdf_path):
+        self.fh = io.BytesIO(pdf_path) if isinstance(pdf_path, bytes) else open(pdf_path, "rb")
+        try:
+            self.pages = list(PDFPage.create_pages(PDFDocument(PDFParser(self.fh))))
+        except Exception:
+            self.fh.close()
+            raise
+        # fonts are shared by the pages, so they are decoded once
+        self.resources = PDFResourceManager(caching=True)
+
+    def __len__(self):
+        return len(self.pages)
+
+    def text(self, index, regions=None):
+        out = io.StringIO()
+        device = TextConverter(self.resources, out, laparams=LAPARAMS)
+        try:
+            PDFPageInterpreter(self.resources, device).process_page(self.pages[index])
+        finally:
+            device.close()
+        # TextConverter ends every page with a form feed
+        return _BOX_BREAKS.sub("\n", out.getvalue().rstrip("\f")).strip("\n")
+
+    def close(self):
+        self.fh.close()
+
+
+class PdfiumReader(Reader):
+    def __init__(self, pdf_path):
+        self.pdf = pypdfium2.PdfDocument(pdf_path)
+
+    def __len__(self):
+        return len(self.pdf)
+
+    def text(self, index, regions=None):
+        page = self.pdf[index]
+        try:
+            textpage = page.get_textpage()
+            try:
+                text = textpage.get_text_range()
+            finally:
+                textpage.close()
+        finally:
+            page.close()
+        return text.replace("\r\n", "\n").replace("\r", "\n")
+
+    def close(self):
+        self.pdf.close()
+
+
+_READERS = {"pdfplumber": PdfplumberReader, "pdfminer": PdfminerReader, "pypdfium2": PdfiumReader}
+_PACKAGES = {"pypdfium2": pypdfium2}
+# distribution each backend comes from, for backend_tag()
+_DISTRIBUTIONS = {"pdfplumber": "pdfplumber", "pdfminer": "pdfminer.six", "pypdfium2": "pypdfium2"}
+
+
+def available_backends():
+    return [name for name in BACKENDS if _PACKAGES.get(name, True) is not None]
+
+
+def get_backend(name=None):
+    """The reader class for backend `name` (default: default_backend())."""
+    name = name or default_backend()
+    if name not in _READERS:
+        raise ValueError(f"Unknown extraction backend {name!r}; choose one of {', '.join(BACKENDS)}.")
+    if _PACKAGES.get(name, True) is None:
+        raise ValueError(f"Extraction backend {name!r} needs the {name} package.")
+    return _READERS[name]
+
+
+@lru_cache(maxsize=None)
+def backend_tag(name):
+    """Backend and library version, e.g. "pdfminer-20250506": what cached text was extracted with."""
+    return f"{name}-{package_version(_DISTRIBUTIONS[name])}"
+
+
+def tag_backend(tag):
+    """The backend a backend_tag() names, or None if it is unknown or was another version."""
+    name = (tag or "").rsplit("-", 1)[0]
+    return name if name in available_backends() and backend_tag(name) == tag else None
+
+
+def regions_enabled():
+    return os.environ.get("PARSER_REGIONS", "1").lower() not in ("0", "false", "off", "no")
+
+
+def region_boxes(regions):
+    """
+    A parser's REGIONS dict, or the boxes of one as stored in the text cache,
+    as the tuple of boxes readers take; None for the whole page.
+    """
+    if not regions:
+        return None
+    return tuple(tuple(box) for box in (regions.values() if isinstance(regions, dict) else regions))
+
+
+def open_pdf(pdf_path, backend=None):
+    """A reader over `pdf_path`, a path or the PDF's bytes."""
+    return get_backend(backend)(pdf_path)
@@ -1,22 +1,67 @@
 import re
+import banks
 
-def bank_detect(text):
-    patterns = {
-        "axis": re.compile(r"(Axis Bank|AXIS BANK|Neo Credit Card|MyZone Credit Card|Flipkart Axis Bank Credit Card)", re.IGNORECASE),
-        "icici": re.compile(r"(ICICI Bank|ICICI Bank Credit Card Statement)", re.IGNORECASE),
-        "hdfc": re.compile(r"(HDFC Bank|HDFC Bank Credit Card Statement)", re.IGNORECASE),
-        # ✅ IDFC FIRST BANK (replaces Kotak)
-        "idfc": re.compile(r"(IDFC\s*FIRST\s*Bank|IDFC FIRST Bank Credit Card Statement|IDFC Bank)", re.IGNORECASE),
-    }
 
+def build_detector(signatures):
+    """
+    Compile every bank's signatures into one alternation with a named group
+    per bank, so the text is scanned once however many banks there are.
+    """
+    alternatives = [f"(?P<{bank}>{'|'.join(sigs)})" for bank, sigs in signatures.items()]
+    pattern = "|".join(alternatives)
+    first_chars = {sig[0] for sigs in signatures.values() for sig in sigs}
+    if all(c.isalnum() for c in first_chars):
+        # a one-character lookahead lets the scanner skip straight to candidate
+        # offsets instead of trying every alternative at every position
+        pattern = f"(?=[{''.join(sorted(first_chars))}])(?:{pattern})"
+    return re.compile(pattern, re.IGNORECASE), tuple(signatures)
+
+
+_detector_cache = {}
+
+
+def registry_detector():
+    """Detector for the bank registry, rebuilt only when the registry changes."""
+    version = banks.registry_version
+    if version not in _detector_cache:
+        _detector_cache.clear()
+        _detector_cache[version] = build_detector(banks.bank_signatures())
+    return _detector_cache[version]
+
+
+def bank_counts(text, decisive_margin=None, detector=None, counts=None):
+    """
+    Signature hits per bank in `text`, added to `counts` when given. With
+    `decisive_margin`, scanning stops once one bank leads by that many hits.
+    """
+    pattern, order = detector or registry_detector()
+    counts = dict.fromkeys(order, 0) if counts is None else counts
+    for m in pattern.finditer(text):
+        bank = m.lastgroup
+        counts[bank] += 1
+        if decisive_margin and counts[bank] >= decisive_margin and decisive(counts, decisive_margin):
+            break
+    return counts
+
+
+def decisive(counts, margin):
+    """Whether one bank leads every other by at least `margin` hits."""
+    top, runner_up = (sorted(counts.values(), reverse=True) + [0, 0])[:2]
+    return top - runner_up >= margin
+
+
+def leading_bank(counts):
     max_confidence = 0
     detected_bank = None
-
-    for bank, pattern in patterns.items():
-        matches = len(pattern.findall(text))
-        confidence = matches * 10  # Simple scoring logic
+    for bank, hits in counts.items():
+        confidence = hits * 10  # Simple scoring logic
         if confidence > max_confidence:
             max_confidence = confidence
             detected_bank = bank
 
     return (detected_bank, max_confidence)
+
+
+def bank_detect(text, decisive_margin=None, detector=None):
+    """Return (bank, confidence) where confidence is 10 per signature hit (see bank_counts)."""
+    return leading_bank(bank_counts(text, decisive_margin, detector))
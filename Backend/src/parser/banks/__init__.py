@@ -0,0 +1,84 @@
+"""
+Bank parser registry: each bank's module, the signatures bank_detect
+recognises it by and an optional preferred extraction "backend". A parser
+module defines parse(text) and may declare PAGE_PLAN, REGIONS, LAYOUT and
+iter_page_transactions(pages). Modules are imported on first detection.
+"""
+from importlib import import_module
+
+# Dict order is bank_detect's tie-break order. Signatures are regex fragments
+# without capturing groups, matched case-insensitively.
+BANKS = {
+    "axis": {
+        "module": "axis_parser",
+        "signatures": (r"Axis Bank", r"AXIS BANK", r"Neo Credit Card", r"MyZone Credit Card",
+                       r"Flipkart Axis Bank Credit Card"),
+    },
+    "icici": {
+        "module": "icici_parser",
+        "signatures": (r"ICICI Bank", r"ICICI Bank Credit Card Statement"),
+        # same fields and rows as pdfplumber on the samples, ~25x faster
+        # (benchmarks/bench_backends.py)
+        "backend": "pypdfium2",
+    },
+    "hdfc": {
+        "module": "hdfc_parser",
+        "signatures": (r"HDFC Bank", r"HDFC Bank Credit Card Statement"),
+    },
+    # ✅ IDFC FIRST BANK (replaces Kotak)
+    "idfc": {
+        "module": "idfc_parser",
+        "signatures": (r"IDFC\s*FIRST\s*Bank", r"IDFC FIRST Bank Credit Card Statement", r"IDFC Bank"),
+    },
+}
+
+GENERAL_PARSER = "general_parser"
+
+# Bumped on every registration so bank_detect knows to rebuild its pattern.
+registry_version = 0
+
+
+def register_bank(bank, module, signatures, backend=None):
+    """Add or replace a bank at runtime; `module` is a dotted import path."""
+    global registry_version
+    BANKS[bank] = {"module": module, "signatures": tuple(signatures)}
+    if backend:
+        BANKS[bank]["backend"] = backend
+    registry_version += 1
+
+
+def bank_signatures():
+    return {bank: spec["signatures"] for bank, spec in BANKS.items()}
+
+
+def _import(module):
+    # bare names are modules of this package; anything else is a full path
+    return import_module(f".{module}", __name__) if "." not in module else import_module(module)
+
+
+def load_parser(bank):
+    """Import (once) and return the parser module for `bank`, or None if unknown."""
+    spec = BANKS.get(bank)
+    return _import(spec["module"]) if spec else None
+
+
+def bank_backend(bank):
+    """The extraction backend `bank` asks for, or None for the default."""
+    spec = BANKS.get(bank)
+    return spec.get("backend") if spec else None
+
+
+def load_general_parser():
+    return _import(GENERAL_PARSER)
+
+
+def page_transactions(parser, pages):
+    """
+    `parser`'s transaction rows over `pages`, an iterable of page texts that
+    is consumed one page at a time. Without an iter_page_transactions() of
+    its own, the parser's iter_transactions() searches each page by itself.
+    """
+    paged = getattr(parser, "iter_page_transactions", None)
+    if paged is not None:
+        return paged(pages)
+    return (row for page in pages for row in parser.iter_transactions(page))
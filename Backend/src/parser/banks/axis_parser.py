@@ -1,39 +1,65 @@
 import re
+from itertools import islice
+
+from .common import find_nearby_amounts
+from .document import as_document
+from .money import to_paise
+from .table import TransactionTable
+
+# Pages this parser needs: everything up to the end-of-statement banner.
+PAGE_PLAN = {"start": None, "stop": ("END OF STATEMENT",)}
+
+# First-page regions extraction reads, as page fractions (x0, top, x1, bottom);
+# the repayment advice column beside the summary is left out (see backends.py).
+REGIONS = {
+    "header": (0, 0, 1, 0.255),
+    "summary": (0, 0.255, 0.76, 0.31),
+    "transactions": (0, 0.31, 1, 1),
+}
+
+# Column headings for the layout extraction mode (see layout.py).
+LAYOUT = {
+    "columns": {"date": ("DATE",), "description": ("TRANSACTION", "DETAILS"), "amount": ("AMOUNT",)},
+    "table": {"drcr_suffix": "capitalize"},
+}
+
+# Patterns, compiled once and keyed by field (see common.py).
+PATTERNS = {
+    "name.digit": re.compile(r"\d"),
+    "name.non_word": re.compile(r"[^\w ]"),
+    "card_number": [re.compile(p, re.IGNORECASE) for p in (
+        r"Card\s*(?:No\.?|Number)\s*[:\-]?\s*([0-9\*]{4,20})",
+        r"(\d{4,6}\*{2,}\d{4})",
+        r"(\d{4}\*{4}\d{4})",
+    )],
+    "dates.top": re.compile(r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})"),
+    "payment_due_date": re.compile(r"Payment\s*Due\s*Date\s*[:\-]?\s*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})", re.IGNORECASE),
+    "statement_date": re.compile(r"Statement\s*Date\s*[:\-]?\s*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})", re.IGNORECASE),
+    "summary": re.compile(r"PAYMENT\s*SUMMARY|BILL\s*SUMMARY|STATEMENT\s*SUMMARY", re.IGNORECASE),
+    "total_amount_due": re.compile(r"(?:Total\s*(?:Payment|Amount)\s*Due)\s*[:\-]?\s*([\d,]+(?:\.\d{2})?)"),
+    "minimum_amount_due": re.compile(r"(?:Minimum\s*(?:Payment|Amount)\s*Due)\s*[:\-]?\s*([\d,]+(?:\.\d{2})?)"),
+    "credit_limit": re.compile(r"(?:Credit\s*Limit|Total\s*Limit|Available\s*Limit)\s*[:\-]?\s*([\d,]+(?:\.\d{2})?)"),
+    "transactions": re.compile(
+        r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})\s+([A-Za-z0-9 ,.&'\/\-:()]{5,120}?)\s+([\d,]+(?:\.\d{2})?)\s*(Dr|Cr)",
+        re.IGNORECASE
+    ),
+}
 
-# ---------------- Helper functions ----------------
-def lines_of(text):
-    return [ln.rstrip() for ln in text.splitlines()]
-
-def first_n_lines(text, n=80):
-    return "\n".join(lines_of(text)[:n])
-
-def find_nearby_amounts(text_block, max_amounts=5):
-    amt_re = re.compile(r"([\d]{1,3}(?:[,]\d{3})*(?:\.\d{2})?|\d+(?:\.\d{2})?)\s*(Dr|Cr)?", re.IGNORECASE)
-    res = []
-    for m in amt_re.finditer(text_block):
-        val = m.group(1)
-        drcr = m.group(2) or ""
-        res.append((val, drcr.strip()))
-        if len(res) >= max_amounts:
-            break
-    return res
 
-def normalize_money(s):
-    if not s or s == "N/A":
-        return "0.00"
-    s2 = s.replace(",", "")
-    if re.match(r"^\d+$", s2):
-        return f"{s2}.00"
-    if re.match(r"^\d+\.\d{1}$", s2):
-        return f"{s2}0"
-    return s2
+def iter_transactions(text):
+    """(date, description, paise, drcr, extra) for every transaction, in order."""
+    for m in PATTERNS["transactions"].finditer(text):
+        yield m.group(1), m.group(2).strip(), to_paise(m.group(3)), m.group(4), {}
 
 
 # ---------------- Main Axis Bank parser ----------------
-def parse(text):
+def parse(text, limit=None):
+    """`text` is a Document or a string; `limit` keeps only the first that many transactions."""
+    doc = as_document(text)
+    text = doc.text
     result = {}
-    raw_lines = lines_of(text)
-    top_block = first_n_lines(text, 100)
+    raw_lines = doc.lines
+    top_block = doc.head(100)
 
     # ------------------ 1) Cardholder name ------------------
     name = "N/A"
@@ -46,9 +72,9 @@ def parse(text):
         if not s:
             continue
         if s == s.upper() and 3 <= len(s) <= 40 and not any(k in s for k in skip_keywords):
-            if re.search(r"\d", s):
+            if PATTERNS["name.digit"].search(s):
                 continue
-            tokens = set(re.sub(r"[^\w ]", " ", s).split())
+            tokens = set(PATTERNS["name.non_word"].sub(" ", s).split())
             if tokens & {"NR", "RD", "ROAD", "BLDG", "PIN"}:
                 continue
             name = s
@@ -57,13 +83,8 @@ def parse(text):
 
     # ------------------ 2) Card number ------------------
     card_no = "N/A"
-    card_patterns = [
-        r"Card\s*(?:No\.?|Number)\s*[:\-]?\s*([0-9\*]{4,20})",
-        r"(\d{4,6}\*{2,}\d{4})",
-        r"(\d{4}\*{4}\d{4})",
-    ]
-    for pat in card_patterns:
-        m = re.search(pat, text, re.IGNORECASE)
+    for pat in PATTERNS["card_number"]:
+        m = pat.search(text)
         if m:
             card_no = m.group(1).strip()
             break
@@ -72,7 +93,7 @@ def parse(text):
     # ------------------ 3) Dates (period + due + statement) ------------------
     # Try to capture all 4 dates from top section — pattern found in Axis PDFs:
     # Example: "16/04/2021 - 15/05/2021 04/06/2021 15/05/2021"
-    dates_found = re.findall(r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})", top_block)
+    dates_found = PATTERNS["dates.top"].findall(top_block)
     result["statement_period_start"] = "N/A"
     result["statement_period_end"] = "N/A"
     result["payment_due_date"] = "N/A"
@@ -88,59 +109,46 @@ def parse(text):
 
     # Fallbacks using labeled text
     if result["payment_due_date"] == "N/A":
-        m = re.search(r"Payment\s*Due\s*Date\s*[:\-]?\s*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})", text, re.IGNORECASE)
+        m = PATTERNS["payment_due_date"].search(text)
         if m:
             result["payment_due_date"] = m.group(1)
 
     if result["statement_date"] == "N/A":
-        m = re.search(r"Statement\s*Date\s*[:\-]?\s*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})", text, re.IGNORECASE)
+        m = PATTERNS["statement_date"].search(text)
         if m:
             result["statement_date"] = m.group(1)
 
     # ------------------ 4) Amounts (summary) ------------------
-    total_amount = "0.00"
-    min_amount = "0.00"
-    credit_limit = "0.00"
+    total_amount = min_amount = credit_limit = 0
 
-    ps_idx = re.search(r"PAYMENT\s*SUMMARY|BILL\s*SUMMARY|STATEMENT\s*SUMMARY", text, re.IGNORECASE)
+    ps_idx = PATTERNS["summary"].search(text)
     if ps_idx:
         block = text[ps_idx.start(): ps_idx.start() + 600]
         found = find_nearby_amounts(block, max_amounts=6)
         if found:
-            total_amount = normalize_money(found[0][0])
+            total_amount = found[0][0]
             if len(found) >= 2:
-                min_amount = normalize_money(found[1][0])
+                min_amount = found[1][0]
 
-    if total_amount == "0.00":
-        m = re.search(r"(?:Total\s*(?:Payment|Amount)\s*Due)\s*[:\-]?\s*([\d,]+(?:\.\d{2})?)", text)
+    if not total_amount:
+        m = PATTERNS["total_amount_due"].search(text)
         if m:
-            total_amount = normalize_money(m.group(1))
+            total_amount = to_paise(m.group(1))
 
-    if min_amount == "0.00":
-        m = re.search(r"(?:Minimum\s*(?:Payment|Amount)\s*Due)\s*[:\-]?\s*([\d,]+(?:\.\d{2})?)", text)
+    if not min_amount:
+        m = PATTERNS["minimum_amount_due"].search(text)
         if m:
-            min_amount = normalize_money(m.group(1))
+            min_amount = to_paise(m.group(1))
 
-    cl_m = re.search(r"(?:Credit\s*Limit|Total\s*Limit|Available\s*Limit)\s*[:\-]?\s*([\d,]+(?:\.\d{2})?)", text)
+    cl_m = PATTERNS["credit_limit"].search(text)
     if cl_m:
-        credit_limit = normalize_money(cl_m.group(1))
+        credit_limit = to_paise(cl_m.group(1))
 
     result["total_amount_due"] = total_amount
     result["minimum_amount_due"] = min_amount
     result["credit_limit"] = credit_limit
 
     # ------------------ 5) Transactions ------------------
-    trans_pattern = re.compile(
-        r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})\s+([A-Za-z0-9 ,.&'\/\-:()]{5,120}?)\s+([\d,]+(?:\.\d{2})?)\s*(Dr|Cr)",
-        re.IGNORECASE
-    )
-    transactions = []
-    for m in trans_pattern.finditer(text):
-        transactions.append({
-            "date": m.group(1),
-            "description": m.group(2).strip(),
-            "amount": f"{normalize_money(m.group(3))} {m.group(4).capitalize()}"
-        })
-
-    result["transactions"] = transactions[:300]
+    result["transactions"] = TransactionTable(drcr_suffix="capitalize").extend(
+        islice(iter_transactions(text), limit))
     return result
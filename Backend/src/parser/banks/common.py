@@ -0,0 +1,25 @@
+"""
+Helpers shared by the bank parsers. Each parser keeps its patterns in a
+module-level PATTERNS dict, compiled once at import and keyed by field so
+benchmarks/bench_fields.py can time each one. Gaps between a label and its
+value are bounded: an unbounded lazy gap rescans the rest of the text for
+every label with nothing after it (benchmarks/bench_regex.py).
+"""
+import re
+
+from .money import to_paise
+
+AMOUNT_DRCR = re.compile(r"([\d]{1,3}(?:[,]\d{3})*(?:\.\d{1,2})?|\d+(?:\.\d{1,2})?)\s*(Dr|Cr)?", re.IGNORECASE)
+
+
+def find_nearby_amounts(text_block, max_amounts=None):
+    """
+    Amounts in the block, in order, as (paise, "DR"/"CR"/"") pairs; at most
+    `max_amounts` of them when given.
+    """
+    res = []
+    for m in AMOUNT_DRCR.finditer(text_block):
+        res.append((to_paise(m.group(1)), (m.group(2) or "").upper()))
+        if max_amounts is not None and len(res) >= max_amounts:
+            break
+    return res
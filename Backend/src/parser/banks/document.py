@@ -0,0 +1,100 @@
+"""One statement's text with the views every parser needs, each built once."""
+from bisect import bisect_right
+
+from .sections import SectionIndex
+
+
+class Document(SectionIndex):
+    """
+    `text` is the statement (its pages joined by newlines) and `pages` the
+    page texts when the caller has them. Views, each built on first use:
+
+      raw_lines     text.splitlines()
+      lines         the same lines rstripped
+      upper_lines   raw_lines upper-cased
+      head(n)       the first n `lines` joined
+      line_starts   offset of every line; line_at() maps an offset back
+      page_starts   offset of every page; page_at() maps an offset back
+    """
+
+    def __init__(self, text, pages=None):
+        super().__init__(text)
+        self.pages = pages
+        self._raw_lines = None
+        self._upper_lines = None
+        self._line_starts = None
+        self._page_starts = None
+        self._heads = {}
+        self._newlines_only = None
+
+    @property
+    def raw_lines(self):
+        if self._raw_lines is None:
+            self._raw_lines = self.text.splitlines()
+        return self._raw_lines
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            self._lines = [ln.rstrip() for ln in self.raw_lines]
+        return self._lines
+
+    @property
+    def upper_lines(self):
+        if self._upper_lines is None:
+            self._upper_lines = [ln.upper() for ln in self.raw_lines]
+        return self._upper_lines
+
+    def head(self, n):
+        if n not in self._heads:
+            self._heads[n] = "\n".join(self.lines[:n])
+        return self._heads[n]
+
+    @property
+    def line_starts(self):
+        if self._line_starts is None:
+            starts, pos = [], 0
+            for line in self.text.splitlines(True):
+                starts.append(pos)
+                pos += len(line)
+            self._line_starts = starts
+        return self._line_starts
+
+    def line_at(self, offset):
+        """Index of the line holding `offset`."""
+        return bisect_right(self.line_starts, offset) - 1
+
+    def line_span(self, start, stop):
+        """
+        The text of lines start..stop-1 in one slice (without the last
+        line's break); "\\n".join(raw_lines[start:stop]) for this text.
+        """
+        stop = min(stop, len(self.raw_lines))
+        if start >= stop:
+            return ""
+        if self._newlines_only is None:
+            # splitlines() also breaks on \r, \f and friends; a slice would keep those
+            text = self.text
+            self._newlines_only = len(self.raw_lines) == text.count("\n") + (not text.endswith("\n"))
+        if not self._newlines_only:
+            return "\n".join(self.raw_lines[start:stop])
+        return self.text[self.line_starts[start]:self.line_starts[stop - 1] + len(self.raw_lines[stop - 1])]
+
+    @property
+    def page_starts(self):
+        if self._page_starts is None:
+            starts, pos = [], 0
+            for page in self.pages or [self.text]:
+                starts.append(pos)
+                pos += len(page) + 1
+            self._page_starts = starts
+        return self._page_starts
+
+    def page_at(self, offset):
+        """Index of the page holding `offset`."""
+        return bisect_right(self.page_starts, offset) - 1
+
+
+def as_document(text):
+    """`text` as a Document; parsers accept either a Document or a plain string."""
+    return text if isinstance(text, Document) else Document(text)
@@ -1,75 +1,134 @@
 import re
 from datetime import datetime
+from itertools import islice
+
+from .common import find_nearby_amounts
+from .money import to_paise
+from .document import as_document
+from .sections import SectionIndex
+from .table import TransactionTable
+
+DATE_RE = r"\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4}"
+AMOUNT_RE = r"[\d,]+(?:\.\d{1,2})?"
+
+_NAME_SKIP_TOKENS = (
+    "PAYMENT", "STATEMENT", "PAGE", "CONTACT", "CUSTOMER", "CREDIT",
+    "ACCOUNT", "CARD", "LIMIT", "SUMMARY", "GST", "IMPORTANT", "BANK",
+    "DUPLICATE", "GENERATION", "DATE", "PERIOD", "FLIPKART", "AXIS",
+    "HDFC", "ICICI", "KOTAK", "WELCOME", "DEAR", "MR", "MS", "MRS", "NAME",
+)
+_ADDRESS_TOKENS = ("NR", "NEAR", "RD", "ROAD", "STREET", "APT", "FLAT", "PIN", "PINCODE", "B-", "NO", "BLDG", "VILL", "DIST", "TEHSIL")
+
+
+def _any_word(tokens):
+    return re.compile(r"\b(?:" + "|".join(re.escape(t) for t in tokens) + r")\b")
+
+
+# Patterns, compiled once and keyed by field (see common.py).
+PATTERNS = {
+    "date.numeric": re.compile(r'(\d{1,2})[\/\-](\d{1,2})[\/\-](\d{4})'),
+    "date.mon": re.compile(r'(\d{1,2})-([A-Za-z]{3})-(\d{4})'),
+    "name.label": re.compile(r"(?:Cardholder|Card Holder|Card Holder Name|Name|Account Name)\s*[:\-]\s*([A-Z][A-Z\s]{3,80}?)\b", re.IGNORECASE | re.MULTILINE),
+    "name.skip_token": _any_word(_NAME_SKIP_TOKENS),
+    "name.address_token": _any_word(_ADDRESS_TOKENS),
+    "name.digit": re.compile(r'\d'),
+    "name.non_word": re.compile(r'[^\w ]'),
+    "name.long_number": re.compile(r'\d{4,}'),
+    "name.address_word": re.compile(r'\b(PIN|ROAD|STREET|FLAT|NO|B-|APT)\b'),
+    "card_number.candidates": [re.compile(p, re.IGNORECASE) for p in (
+        r"(?:Card\s*(?:No\.?|Number)\s*[:\-]?\s*)([0-9]{4,8}[\s\*Xx]{2,12}[0-9]{4})",
+        r"([0-9]{4,8}\*{2,12}[0-9]{4})",
+        r"([0-9]{4}(?:[\sXx\*]{2,12})[0-9]{4})",
+        r"(\d{4}\s+\d{4}\s+\*+\s+\d{4})",
+    )],
+    "card_number.mask": re.compile(r'[\*Xx]'),
+    "card_number.space": re.compile(r'\s+'),
+    "card_number.fallback": re.compile(r"([0-9]{4,8}\*{4,10}[0-9]{4})"),
+    "statement_date.labels": [re.compile(p, re.IGNORECASE | re.DOTALL) for p in (
+        rf"Statement\s+(?:Generation\s+)?Date\s*[:\-]\s*({DATE_RE})",
+        rf"Statement\s+Date\s*[:\-]\s*({DATE_RE})",
+        rf"Generated\s+(?:on|date)\s*[:\-]\s*({DATE_RE})",
+        rf"Statement\s+for\s+period.{{0,500}}?({DATE_RE})",
+    )],
+    "statement_date.period": re.compile(rf"({DATE_RE})\s*[-to]+\s*({DATE_RE})"),
+    "date.any": re.compile(rf"({DATE_RE})"),
+    "due_date.labels": [re.compile(p, re.IGNORECASE) for p in (
+        rf"Payment\s*Due\s*Date\s*[:\-]?\s*({DATE_RE})",
+        rf"Due\s*Date\s*[:\-]?\s*({DATE_RE})",
+    )],
+    "total_due.labels": [re.compile(p, re.IGNORECASE) for p in (
+        rf"Total\s+Payment\s+Due\s*[:\-]?\s*({AMOUNT_RE})",
+        rf"Total\s+Amount\s+Due\s*[:\-]?\s*({AMOUNT_RE})",
+        rf"Amount\s+Payable\s*[:\-]?\s*({AMOUNT_RE})",
+        rf"Total\s+Outstanding\s*[:\-]?\s*({AMOUNT_RE})",
+    )],
+    "total_due.table": re.compile(rf"Previous\s+Balance.{{0,500}}?=\s*Total\s*Payment\s*Due\s*({AMOUNT_RE})", re.IGNORECASE | re.DOTALL),
+    "minimum_due.labels": [re.compile(p, re.IGNORECASE) for p in (
+        rf"Minimum\s+Payment\s+Due\s*[:\-]?\s*({AMOUNT_RE})",
+        rf"Minimum\s+Amount\s+Due\s*[:\-]?\s*({AMOUNT_RE})",
+    )],
+    "credit_limit.label": re.compile(rf"(?:Credit\s*Limit|Available\s*Credit|Total\s*Limit)\s*[:\-]?\s*({AMOUNT_RE})", re.IGNORECASE),
+    "credit_limit.grouped": re.compile(r"([\d]{1,3}(?:[,]\d{3})+(?:\.\d{1,2})?)"),
+    "transactions.rows": [
+        re.compile(r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})\s+([A-Za-z][A-Za-z0-9\s&'.,\-/()]{3,120}?)\s+([\d,]+(?:\.\d{1,2})?)\s*(?:([Dd]r|[Cc]r))?", re.MULTILINE),
+        re.compile(r"(\d{2}\/\d{2}\/\d{4})\s+([A-Z][A-Z0-9\s&'.,\-/()]{3,120}?)\s+([\d,]+(?:\.\d{1,2})?)\s*(?:([Dd]r|[Cc]r))?", re.MULTILINE),
+    ],
+    "transactions.numeric_desc": re.compile(r'^[\d\s,\.]+$'),
+    "transactions.headline_desc": re.compile(r'^[A-Z\s]{30,}$'),
+    "transactions.line": re.compile(r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}).*?([\d,]+(?:\.\d{1,2})?)"),
+}
 
-def parse(text):
+def parse(text, limit=None):
     """
     Truly Universal Credit Card Statement Parser (improved).
     Uses multiple strategies and picks the best result for each field.
+    `text` is a Document or a string; `limit` keeps only the first that many transactions.
     """
     result = {}
-    lines = [ln.rstrip() for ln in text.splitlines()]
+    # headings and line split are found once and shared by every extractor
+    doc = as_document(text)
 
     # 1. CARDHOLDER NAME
-    result["cardholder_name"] = extract_name(text, lines)
+    result["cardholder_name"] = extract_name(doc)
 
     # 2. CARD NUMBER
-    result["card_number"] = extract_card_number(text)
+    result["card_number"] = extract_card_number(doc)
 
     # 3. STATEMENT DATE
-    result["statement_date"] = extract_statement_date(text)
+    result["statement_date"] = extract_statement_date(doc)
 
     # 4. PAYMENT DUE DATE
-    result["payment_due_date"] = extract_due_date(text)
+    result["payment_due_date"] = extract_due_date(doc)
 
     # 5. TOTAL AMOUNT DUE
-    result["total_amount_due"] = extract_total_due(text)
+    result["total_amount_due"] = extract_total_due(doc)
 
     # 6. MINIMUM AMOUNT DUE
-    result["minimum_amount_due"] = extract_minimum_due(text)
+    result["minimum_amount_due"] = extract_minimum_due(doc)
 
     # 7. CREDIT LIMIT
-    result["credit_limit"] = extract_credit_limit(text)
+    result["credit_limit"] = extract_credit_limit(doc)
 
     # 8. TRANSACTIONS
-    result["transactions"] = extract_transactions(text)[:50]
+    result["transactions"] = extract_transactions(doc, limit)
 
     return result
 
 
 # ----------------------------- Utilities -------------------------------------
 
-def normalize_money(s):
-    """Normalize monetary values to 'x.xx' string. Accepts commas."""
-    if not s:
-        return "0.00"
-    s2 = str(s).replace(",", "").strip()
-    # remove trailing non-digits (like Dr/Cr if accidently passed)
-    s2 = re.sub(r"[^\d\.]", "", s2)
-    if s2 == "":
-        return "0.00"
-    if "." not in s2:
-        return f"{s2}.00"
-    # pad decimal to 2
-    parts = s2.split(".")
-    if len(parts[1]) == 1:
-        parts[1] = parts[1] + "0"
-    elif len(parts[1]) == 0:
-        parts[1] = "00"
-    return f"{parts[0]}.{parts[1][:2]}"
-
-
 def normalize_date(date_str):
     """Return date in DD/MM/YYYY when recognizable, else return original trimmed."""
     if not date_str:
         return "N/A"
     s = date_str.strip()
     # dd/mm/yyyy or d/m/yyyy
-    m = re.match(r'(\d{1,2})[\/\-](\d{1,2})[\/\-](\d{4})', s)
+    m = PATTERNS["date.numeric"].match(s)
     if m:
         dd, mm, yy = m.groups()
         return f"{int(dd):02d}/{int(mm):02d}/{yy}"
     # dd-Mon-YYYY
-    m = re.match(r'(\d{1,2})-([A-Za-z]{3})-(\d{4})', s)
+    m = PATTERNS["date.mon"].match(s)
     if m:
         try:
             dt = datetime.strptime(s, "%d-%b-%Y")
@@ -85,23 +144,9 @@ def normalize_date(date_str):
     return s
 
 
-def find_amounts_with_drcr(block):
-    """
-    Returns list of tuples (amount_str, drcr) found in text block in order.
-    Accepts amounts with commas and optional decimals, optionally followed/preceded by Dr/Cr.
-    """
-    pat = re.compile(r"([\d]{1,3}(?:[,]\d{3})*(?:\.\d{1,2})?|\d+(?:\.\d{1,2})?)\s*(?:([Dd]r|[Cc]r))?")
-    res = []
-    for m in pat.finditer(block):
-        amt = m.group(1)
-        drcr = m.group(2) or ""
-        res.append((amt, drcr.upper()))
-    return res
-
-
 # ------------------------- NAME EXTRACTION -----------------------------------
 
-def extract_name(text, lines):
+def extract_name(doc):
     """
     Heuristics:
     1) Try label-based 'Name' first.
@@ -111,25 +156,17 @@ def extract_name(text, lines):
        - Has 2-4 tokens that look like name tokens (len 2..20)
     """
     # Label-based attempts (common)
-    label_patterns = [
-        r"(?:Cardholder|Card Holder|Card Holder Name|Name|Account Name)\s*[:\-]\s*([A-Z][A-Z\s]{3,80}?)\b",
-    ]
-    for pat in label_patterns:
-        m = re.search(pat, text[:2000], re.IGNORECASE | re.MULTILINE)
-        if m:
-            candidate = m.group(1).strip()
-            if is_valid_name(candidate):
-                return candidate
+    m = doc.search(PATTERNS["name.label"], 2000)
+    if m:
+        candidate = m.group(1).strip()
+        if is_valid_name(candidate):
+            return candidate
 
     # Fallback: scan lines near top
-    skip_tokens = {
-        "PAYMENT", "STATEMENT", "PAGE", "CONTACT", "CUSTOMER", "CREDIT",
-        "ACCOUNT", "CARD", "LIMIT", "SUMMARY", "GST", "IMPORTANT", "BANK",
-        "DUPLICATE", "GENERATION", "DATE", "PERIOD", "FLIPKART", "AXIS",
-        "HDFC", "ICICI", "KOTAK", "WELCOME", "DEAR", "MR", "MS", "MRS", "NAME"
-    }
-
-    address_tokens = {"NR", "NEAR", "RD", "ROAD", "STREET", "APT", "FLAT", "PIN", "PINCODE", "B-", "NO", "BLDG", "VILL", "DIST", "TEHSIL"}
+    lines = doc.lines
+    skip_token = PATTERNS["name.skip_token"]
+    address_token = PATTERNS["name.address_token"]
+    digit = PATTERNS["name.digit"]
 
     candidates = []
     top_n = min(len(lines), 120)
@@ -141,18 +178,18 @@ def extract_name(text, lines):
         # strong candidate: all caps, length, not contain digits-heavy
         if s_up == s and 5 <= len(s) <= 60:
             # skip lines that include skip tokens
-            if any(re.search(r'\b' + re.escape(tok) + r'\b', s_up) for tok in skip_tokens):
+            if skip_token.search(s_up):
                 continue
             # skip lines with many digits (likely pin or acc)
-            if len(re.findall(r'\d', s_up)) > 3:
+            if len(digit.findall(s_up)) > 3:
                 continue
 
             # check next line — if next line has address tokens, then current is likely name
             next_line = lines[idx + 1].strip().upper() if idx + 1 < len(lines) else ""
-            has_address_next = any(re.search(r'\b' + re.escape(tok) + r'\b', next_line) for tok in address_tokens)
+            has_address_next = bool(address_token.search(next_line))
             # ensure tokens of the candidate look like personal name tokens
-            tokens = [t for t in re.sub(r'[^\w ]', ' ', s_up).split() if t]
-            name_like_tokens = [t for t in tokens if 2 <= len(t) <= 18 and not re.search(r'\d', t)]
+            tokens = [t for t in PATTERNS["name.non_word"].sub(' ', s_up).split() if t]
+            name_like_tokens = [t for t in tokens if 2 <= len(t) <= 18 and not digit.search(t)]
             if len(name_like_tokens) >= 2:
                 score = 90
                 if has_address_next:
@@ -178,16 +215,16 @@ def is_valid_name(name):
     if len(name.split()) < 2:
         return False
     # disallow if mostly digits / contains typical address tokens
-    if re.search(r'\d{4,}', name):
+    if PATTERNS["name.long_number"].search(name):
         return False
-    if re.search(r'\b(PIN|ROAD|STREET|FLAT|NO|B-|APT)\b', name.upper()):
+    if PATTERNS["name.address_word"].search(name.upper()):
         return False
     return True
 
 
 # ------------------------- CARD NUMBER -------------------------------------
 
-def extract_card_number(text):
+def extract_card_number(doc):
     """
     Tolerant card number detection for masked formats:
     Examples matched:
@@ -196,22 +233,16 @@ def extract_card_number(text):
       5334****1060
       5334XXXXXXXX1060
     """
-    patterns = [
-        r"(?:Card\s*(?:No\.?|Number)\s*[:\-]?\s*)([0-9]{4,8}[\s\*Xx]{2,12}[0-9]{4})",
-        r"([0-9]{4,8}\*{2,12}[0-9]{4})",
-        r"([0-9]{4}(?:[\sXx\*]{2,12})[0-9]{4})",
-        r"(\d{4}\s+\d{4}\s+\*+\s+\d{4})"
-    ]
-    for pat in patterns:
-        m = re.search(pat, text, re.IGNORECASE)
+    for pat in PATTERNS["card_number.candidates"]:
+        m = doc.search(pat)
         if m:
             cand = m.group(1).strip()
             # basic sanity: must contain stars or X or spaces masking
-            if re.search(r'[\*Xx]', cand) or (' ' in cand and len(cand.replace(' ', '')) >= 12):
+            if PATTERNS["card_number.mask"].search(cand) or (' ' in cand and len(cand.replace(' ', '')) >= 12):
                 # normalize spaces
-                return re.sub(r'\s+', ' ', cand)
+                return PATTERNS["card_number.space"].sub(' ', cand)
     # final fallback: any masked chunk of length >=12 with stars
-    m = re.search(r"([0-9]{4,8}\*{4,10}[0-9]{4})", text)
+    m = doc.search(PATTERNS["card_number.fallback"])
     if m:
         return m.group(1).strip()
     return "N/A"
@@ -219,44 +250,34 @@ def extract_card_number(text):
 
 # ------------------------- DATES -------------------------------------------
 
-def extract_statement_date(text):
-    patterns = [
-        r"Statement\s+(?:Generation\s+)?Date\s*[:\-]\s*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})",
-        r"Statement\s+Date\s*[:\-]\s*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})",
-        r"Generated\s+(?:on|date)\s*[:\-]\s*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})",
-        r"Statement\s+for\s+period.*?(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})",
-    ]
-    for p in patterns:
-        m = re.search(p, text[:4000], re.IGNORECASE | re.DOTALL)
+def extract_statement_date(doc):
+    text = doc.text
+    for p in PATTERNS["statement_date.labels"]:
+        m = doc.search(p, 4000)
         if m:
             return normalize_date(m.group(1))
     # fallback: try to pick a date after the statement period if present
-    period = re.search(r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})\s*[-to]+\s*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})", text)
+    period = PATTERNS["statement_date.period"].search(text)
     if period:
         # often statement date appears nearby; search window after period
         after = text[period.end(): period.end() + 200]
-        m = re.search(r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})", after)
+        m = PATTERNS["date.any"].search(after)
         if m:
             return normalize_date(m.group(1))
     return "N/A"
 
 
-def extract_due_date(text):
+def extract_due_date(doc):
     # Try label-based first
-    patterns = [
-        r"Payment\s*Due\s*Date\s*[:\-]?\s*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})",
-        r"Due\s*Date\s*[:\-]?\s*(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})",
-    ]
-    for p in patterns:
-        m = re.search(p, text[:5000], re.IGNORECASE)
+    for p in PATTERNS["due_date.labels"]:
+        m = doc.search(p, 5000)
         if m:
             return normalize_date(m.group(1))
 
     # Try PAYMENT SUMMARY block: there are usually multiple dates/nums; pick the date-like token
-    m = re.search(r"(PAYMENT\s+SUMMARY|Payment\s+Summary)", text, re.IGNORECASE)
-    if m:
-        block = text[m.start(): m.start() + 500]
-        dm = re.search(r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{4})", block)
+    block = doc.window("payment_summary", 500)
+    if block is not None:
+        dm = PATTERNS["date.any"].search(block)
         if dm:
             return normalize_date(dm.group(1))
     return "N/A"
@@ -264,7 +285,7 @@ def extract_due_date(text):
 
 # ------------------------- AMOUNTS -----------------------------------------
 
-def extract_total_due(text):
+def extract_total_due(doc):
     """
     Priority:
       1. Look in PAYMENT SUMMARY slice for amounts with Dr/Cr and map first positive (or Dr) to total due.
@@ -272,148 +293,223 @@ def extract_total_due(text):
       3. Table fallback scanning near 'Previous Balance - Payments - Credits + Purchase ... = Total Payment Due' pattern.
     """
     # 1) PAYMENT SUMMARY block
-    m = re.search(r"(PAYMENT\s+SUMMARY|Payment\s+Summary)", text, re.IGNORECASE)
-    if m:
-        block = text[m.start(): m.start() + 800]
-        amts = find_amounts_with_drcr(block)
+    block = doc.window("payment_summary", 800)
+    if block is not None:
+        amts = find_nearby_amounts(block)
         # heuristics: we expect a few numbers; Axis has "1,289.00   Dr 100.00   Dr" — first is total, second minimum
         if amts:
             # Prefer amounts that have a Dr suffix (amount due likely marked Dr in your sample)
             # choose first amount that's > 0
-            for amt, drcr in amts:
-                val = float(amt.replace(",", "")) if amt.replace(",", "").replace(".", "").isdigit() else 0.0
-                if val > 0:
-                    return normalize_money(amt)
+            for paise, drcr in amts:
+                if paise > 0:
+                    return paise
     # 2) Label-based
-    patterns = [
-        r"Total\s+Payment\s+Due\s*[:\-]?\s*([\d,]+(?:\.\d{1,2})?)",
-        r"Total\s+Amount\s+Due\s*[:\-]?\s*([\d,]+(?:\.\d{1,2})?)",
-        r"Amount\s+Payable\s*[:\-]?\s*([\d,]+(?:\.\d{1,2})?)",
-        r"Total\s+Outstanding\s*[:\-]?\s*([\d,]+(?:\.\d{1,2})?)",
-    ]
-    for p in patterns:
-        mm = re.search(p, text, re.IGNORECASE)
+    for p in PATTERNS["total_due.labels"]:
+        mm = doc.search(p)
         if mm:
-            return normalize_money(mm.group(1))
+            return to_paise(mm.group(1))
     # 3) Table-like fallback
-    m = re.search(r"Previous\s+Balance.*?=\s*Total\s*Payment\s*Due\s*([\d,]+(?:\.\d{1,2})?)", text, re.IGNORECASE | re.DOTALL)
+    m = doc.search(PATTERNS["total_due.table"])
     if m:
-        return normalize_money(m.group(1))
-    return "0.00"
+        return to_paise(m.group(1))
+    return 0
 
 
-def extract_minimum_due(text):
+def extract_minimum_due(doc):
     # 1) PAYMENT SUMMARY block - second amount often minimum due
-    m = re.search(r"(PAYMENT\s+SUMMARY|Payment\s+Summary)", text, re.IGNORECASE)
-    if m:
-        block = text[m.start(): m.start() + 800]
-        amts = find_amounts_with_drcr(block)
+    block = doc.window("payment_summary", 800)
+    if block is not None:
+        amts = find_nearby_amounts(block)
         if len(amts) >= 2:
-            return normalize_money(amts[1][0])
+            return amts[1][0]
 
     # 2) label-based
-    patterns = [
-        r"Minimum\s+Payment\s+Due\s*[:\-]?\s*([\d,]+(?:\.\d{1,2})?)",
-        r"Minimum\s+Amount\s+Due\s*[:\-]?\s*([\d,]+(?:\.\d{1,2})?)",
-    ]
-    for p in patterns:
-        mm = re.search(p, text, re.IGNORECASE)
+    for p in PATTERNS["minimum_due.labels"]:
+        mm = doc.search(p)
         if mm:
-            return normalize_money(mm.group(1))
-    return "0.00"
+            return to_paise(mm.group(1))
+    return 0
 
 
-def extract_credit_limit(text):
+def extract_credit_limit(doc):
     # Try to find "Credit Limit" near top; Axis has "Credit  Card Number ... 115,000.00 113,711.00 34,500.00"
-    top = text[:2500]
-    m = re.search(r"(?:Credit\s*Limit|Available\s*Credit|Total\s*Limit)\s*[:\-]?\s*([\d,]+(?:\.\d{1,2})?)", top, re.IGNORECASE)
+    m = doc.search(PATTERNS["credit_limit.label"], 2500)
     if m:
-        return normalize_money(m.group(1))
+        return to_paise(m.group(1))
     # fallback: search anywhere for a large numeric that looks like a limit (heuristic)
-    all_nums = re.findall(r"([\d]{1,3}(?:[,]\d{3})+(?:\.\d{1,2})?)", text[:4000])
-    # choose the largest found (most likely limit)
+    all_nums = doc.findall(PATTERNS["credit_limit.grouped"], 4000)
+    # choose the largest found (most likely limit), within a sane range
     if all_nums:
-        cleaned = [(n, float(n.replace(",", ""))) for n in all_nums if n.replace(",", "").replace(".", "").isdigit()]
-        if cleaned:
-            cleaned.sort(key=lambda x: x[1], reverse=True)
-            top_val = cleaned[0][0]
-            # sanity check range
-            v = cleaned[0][1]
-            if 1000 <= v <= 50000000:
-                return normalize_money(top_val)
-    return "0.00"
+        largest = max(to_paise(n) for n in all_nums)
+        if 1000_00 <= largest <= 5_00_00_000_00:
+            return largest
+    return 0
 
 
 # ---------------------- TRANSACTIONS ----------------------------------------
 
-def extract_transactions(text):
+def extract_transactions(doc, limit=None):
     """
-    Extract transactions from the statement. Uses several patterns; returns list of dicts.
+    Extract transactions from the statement. Uses several patterns; returns a TransactionTable.
     """
-    transactions = []
-
-    # find a transaction-like section
-    trans_marker = re.search(r"(?:TRANSACTION\s+DETAILS|Transaction\s+Details|DATE\s+TRANSACTION|Date\s+Description\s+Amount|Account\s+Summary|Account\s+Transactions|Account\s+Summary)", text, re.IGNORECASE)
-    if trans_marker:
-        start = trans_marker.start()
-        section = text[start:start + 8000]
-    else:
-        # fallback: entire text
-        section = text
+    return TransactionTable(drcr_suffix="upper").extend(islice(iter_transactions(doc), limit))
 
-    # Patterns: date, description, amount (Dr/Cr optional)
-    patterns = [
-        re.compile(r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4})\s+([A-Za-z][A-Za-z0-9\s&'.,\-/()]{3,120}?)\s+([\d,]+(?:\.\d{1,2})?)\s*(?:([Dd]r|[Cc]r))?", re.MULTILINE),
-        re.compile(r"(\d{2}\/\d{2}\/\d{4})\s+([A-Z][A-Z0-9\s&'.,\-/()]{3,120}?)\s+([\d,]+(?:\.\d{1,2})?)\s*(?:([Dd]r|[Cc]r))?", re.MULTILINE),
-    ]
-
-    for pat in patterns:
-        for m in pat.finditer(section):
-            dt = normalize_date(m.group(1))
-            desc = ' '.join(m.group(2).split())
-            amt = normalize_money(m.group(3))
-            drcr = (m.group(4) or "").upper()
-            if drcr:
-                amt = f"{amt} {drcr}"
-            else:
-                # optionally infer Dr/Cr from nearby text (not implemented here)
-                pass
-
-            # filters to avoid catching headers or name lines
-            if len(desc) < 3:
-                continue
-            if re.match(r'^[\d\s,\.]+$', desc):
-                continue
-            if desc.upper().startswith(("DATE", "TRANSACTION", "BALANCE", "OPENING", "CLOSING")):
-                continue
-            # avoid picking very long all-caps lines that are likely headlines
-            if re.match(r'^[A-Z\s]{30,}$', desc):
-                continue
 
-            transactions.append({
-                "date": dt,
-                "description": desc,
-                "amount": amt
-            })
-            if len(transactions) >= 200:
-                break
-        if transactions:
-            break
+def iter_transactions(text):
+    """(date, description, paise, drcr, extra) for every transaction, in order."""
+    doc = as_document(text)
+
+    # find a transaction-like section; it runs to the end of the text, so
+    # the patterns search the text from there rather than a copy of it
+    start = doc.find("transactions", "account_summary")
+    if start is None:
+        # fallback: entire text
+        start = 0
+
+    # Patterns: date, description, amount (Dr/Cr optional); the first
+    # pattern that finds anything wins
+    found = False
+    for pat in PATTERNS["transactions.rows"]:
+        for m in pat.finditer(doc.text, start):
+            row = _transaction_row(m)
+            if row:
+                found = True
+                yield row
+        if found:
+            return
 
     # final fallback: try the simpler line-by-line parse if nothing found
-    if not transactions:
-        for line in section.splitlines():
-            m = re.search(r"(\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}).*?([\d,]+(?:\.\d{1,2})?)", line)
-            if m:
-                transactions.append({
-                    "date": normalize_date(m.group(1)),
-                    "description": line[:60].strip(),
-                    "amount": normalize_money(m.group(2))
-                })
-            if len(transactions) >= 50:
-                break
+    for line in doc.text[start:].splitlines():
+        row = _line_row(line)
+        if row:
+            yield row
+
+
+def _transaction_row(m):
+    """The row a transactions.rows match stands for, or None for a header or name line."""
+    desc = ' '.join(m.group(2).split())
+    # filters to avoid catching headers or name lines
+    if len(desc) < 3:
+        return None
+    if PATTERNS["transactions.numeric_desc"].match(desc):
+        return None
+    if desc.upper().startswith(("DATE", "TRANSACTION", "BALANCE", "OPENING", "CLOSING")):
+        return None
+    # avoid picking very long all-caps lines that are likely headlines
+    if PATTERNS["transactions.headline_desc"].match(desc):
+        return None
+    # rows without Dr/Cr are left unmarked (no inference from nearby text)
+    return normalize_date(m.group(1)), desc, to_paise(m.group(3)), m.group(4) or "", {}
+
+
+def _line_row(line):
+    m = PATTERNS["transactions.line"].search(line)
+    if m:
+        return normalize_date(m.group(1)), line[:60].strip(), to_paise(m.group(2)), "", {}
+    return None
+
+
+# How far past where it starts a row match (or a heading) can look. The last
+# this many characters of a page are searched again with the next one, so a
+# row that crosses a page break is found as in the whole text.
+ROW_REACH = 1000
 
-    return transactions
+
+def iter_page_transactions(pages):
+    """
+    iter_transactions() over an iterable of page texts, holding one page at
+    a time. Until a transaction heading turns up the rows are found from the
+    first page on and held, since with no heading the whole text is searched.
+    """
+    whole = _PagedRows()
+    section = None
+    tail = ""
+    for page in pages:
+        if section is not None:
+            section.feed(page)
+            yield from section.ready()
+            continue
+        # a heading may start at the end of the page before
+        text = tail + "\n" + page if whole.started else page
+        start = SectionIndex(text).find("transactions", "account_summary")
+        if start is None:
+            whole.feed(page)
+            tail = page[-ROW_REACH:]
+            continue
+        section = _PagedRows()
+        section.feed(text[start:])
+        whole = None
+        yield from section.ready()
+    yield from (section or whole).finish()
+
+
+class _PagedRows:
+    """
+    The rows iter_transactions() finds in a text fed to it in pieces. The
+    first pattern's rows are ready as soon as they are certain; another
+    pattern's, or the line fallback's, only win if no earlier one finds
+    anything, so they are held until finish().
+    """
+
+    def __init__(self):
+        n = len(PATTERNS["transactions.rows"])
+        self.pending = [""] * n
+        self.rows = [[] for _ in range(n)]
+        self.found = [False] * n
+        self.lines = []
+        self.started = False
+
+    def _active(self):
+        """Patterns that can still win: up to the first that found anything."""
+        n = len(self.found)
+        return range(self.found.index(True) + 1 if True in self.found else n)
+
+    def feed(self, piece):
+        if self.started:
+            piece = "\n" + piece
+        self.started = True
+        for i in self._active():
+            self.pending[i] += piece
+            self._search(i, final=False)
+        # the fallback's rows are kept as their lines until they are known to count
+        if True in self.found:
+            self.lines = []
+        else:
+            self.lines += (line for line in piece.splitlines() if PATTERNS["transactions.line"].search(line))
+
+    def _search(self, i, final):
+        # matches ending within ROW_REACH of the end may change with more text
+        text = self.pending[i]
+        limit = len(text) if final else len(text) - ROW_REACH
+        pos = 0
+        for m in PATTERNS["transactions.rows"][i].finditer(text):
+            if m.end() > limit:
+                cut = max(pos, min(m.start(), limit))
+                break
+            pos = m.end()
+            row = _transaction_row(m)
+            if row:
+                self.found[i] = True
+                self.rows[i].append(row)
+        else:
+            cut = max(pos, limit)
+        self.pending[i] = text[cut:]
+        # a later pattern's rows are dropped once an earlier one has some
+        for j in range(i + 1, len(self.rows)):
+            if self.found[i]:
+                self.rows[j] = []
+
+    def ready(self):
+        rows, self.rows[0] = self.rows[0], []
+        return rows
+
+    def finish(self):
+        for i in self._active():
+            self._search(i, final=True)
+        for i in self._active():
+            if self.found[i]:
+                return self.rows[i]
+        return map(_line_row, self.lines)
 
 
 # ---------------------------------------------------------------------------
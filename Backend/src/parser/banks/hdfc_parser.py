@@ -1,39 +1,66 @@
 import re
+from itertools import islice
 
-def lines_of(text):
-    return [ln.rstrip() for ln in text.splitlines()]
+from .document import as_document
+from .money import printed_paise
+from .table import TransactionTable
 
-def first_n_lines(text, n=60):
-    return "\n".join(lines_of(text)[:n])
+# Pages this parser needs: the transaction listing ends at the reward summary.
+PAGE_PLAN = {"start": "DOMESTIC TRANSACTIONS", "stop": ("REWARD POINTS SUMMARY",)}
 
-def find_nearby_amounts(text_block, max_amounts=5):
-    # Find monetary values like 1,289.00 or 1289.00 or 1,289
-    amt_re = re.compile(r"([\d]{1,3}(?:[,]\d{3})*(?:\.\d{2})?|\d+(?:\.\d{2})?)\s*(Dr|Cr)?", re.IGNORECASE)
-    res = []
-    for m in amt_re.finditer(text_block):
-        val = m.group(1)
-        drcr = m.group(2) or ""
-        # normalize to have two decimals if present, else keep as-is
-        res.append((val, drcr.strip()))
-        if len(res) >= max_amounts:
-            break
-    return res
+# First-page regions extraction reads, as page fractions (x0, top, x1, bottom);
+# the column of notices left of the summary is left out (see backends.py).
+REGIONS = {
+    "header": (0, 0, 1, 0.15),
+    "summary": (0.4, 0.15, 1, 0.5),
+    "transactions": (0, 0.5, 1, 1),
+}
+
+# Amounts are written out as the statement prints them: "22,935.00", "30,000"
+# in the Indian grouping HDFC uses, "5217.50" where it prints none.
+AMOUNT_GROUPING = "indian"
+
+# Column headings for the layout extraction mode (see layout.py).
+LAYOUT = {
+    "columns": {"date": ("DATE",), "description": ("TRANSACTION", "DESCRIPTION"), "amount": ("AMOUNT",)},
+    "table": {"grouping": AMOUNT_GROUPING},
+}
+
+# Patterns, compiled once and keyed by field (see common.py).
+PATTERNS = {
+    "name.digit": re.compile(r"\d"),
+    "name.non_word": re.compile(r"[^\w ]"),
+    "card_number": re.compile(r"Card No\s*:\s*(\d{4}\s+\d{2}XX\s+XXXX\s+\d{4})"),
+    "statement_date": re.compile(r"Statement Date\s*:\s*(\d{2}/\d{2}/\d{4})"),
+    "payment_due_date": re.compile(r"Payment Due Date[\s\S]{0,500}?(\d{2}/\d{2}/\d{4})"),
+    "total_amount_due.table": re.compile(
+        r"Payment Due Date\s+Total Dues\s+Minimum Amount Due.{0,500}?\n.{0,500}?(\d{1,2}/\d{1,2}/\d{4})\s+([\d,]+\.?\d*)",
+        re.DOTALL
+    ),
+    "total_amount_due.summary": re.compile(r"Total Dues\s+([\d,]+\.\d{2})"),
+    "minimum_amount_due.table": re.compile(
+        r"Payment Due Date\s+Total Dues\s+Minimum Amount Due.{0,500}?\n.{0,500}?\d{1,2}/\d{1,2}/\d{4}\s+[\d,]+\.?\d*\s+([\d,]+\.?\d*)",
+        re.DOTALL
+    ),
+    "minimum_amount_due.summary": re.compile(r"Minimum Amount Due\s+([\d,]+\.\d{2})"),
+    "credit_limit": re.compile(r"Credit Limit[\s\S]{0,500}?([\d.,]+)"),
+    "transactions": re.compile(r"(\d{2}/\d{2}/\d{4})\s+([A-Z0-9* ]+)\s+([A-Z]+)?\s+([\d.,]+)", re.MULTILINE),
+}
 
-def normalize_money(s):
-    if not s or s == "N/A":
-        return "0.00"
-    s2 = s.replace(",", "")
-    # ensure two decimal places if missing
-    if re.match(r"^\d+$", s2):
-        return f"{s2}.00"
-    if re.match(r"^\d+\.\d{1}$", s2):
-        return f"{s2}0"
-    return s2
 # --- Main parser ------------------------------------------------------------
 
-def parse(text):
+def iter_transactions(text):
+    """(date, description, paise, drcr, extra) for every transaction, in order."""
+    for match in PATTERNS["transactions"].finditer(text):
+        yield match.group(1), match.group(2).strip(), printed_paise(match.group(4)), "", {}
+
+
+def parse(text, limit=None):
+    """`text` is a Document or a string; `limit` keeps only the first that many transactions."""
+    doc = as_document(text)
+    text = doc.text
     result = {}
-    raw_lines = lines_of(text)
+    raw_lines = doc.lines
     name = "N/A"
     skip_keywords = {
         "PAYMENT", "STATEMENT", "PAGE", "CONTACT", "CUSTOMER", "CREDIT", 
@@ -48,12 +75,12 @@ def parse(text):
         # is uppercase and not too long
         if s == s.upper() and 3 <= len(s) <= 40 and not any(k in s for k in skip_keywords):
             # reject if it contains digits/pincode or only direction words
-            if re.search(r"\d", s):
+            if PATTERNS["name.digit"].search(s):
                 continue
             # also avoid lines with city/state only (heuristic: multiple words with short words like NR, NR., RD)
             # Accept if contains at least one "name-like" token (not NR, B-002, ROAD, APT)
             bad_tokens = {"NR", "ND", "RD", "ROAD", "STREET", "APT", "FLAT", "PIN", "PINCODE", "B-", "NO.", "NO", "BLDG"}
-            tokens = set(re.sub(r"[^\w ]", " ", s).split())
+            tokens = set(PATTERNS["name.non_word"].sub(" ", s).split())
             if tokens & bad_tokens:
                 continue
             name = s
@@ -61,59 +88,41 @@ def parse(text):
     result["cardholder_name"] = name
     
     # Card Number - Your regex works perfectly!
-    card_match = re.search(r"Card No\s*:\s*(\d{4}\s+\d{2}XX\s+XXXX\s+\d{4})", text)
+    card_match = PATTERNS["card_number"].search(text)
     result["card_number"] = card_match.group(1).strip() if card_match else "N/A"
     
     # Statement Date - Works!
-    statement_match = re.search(r"Statement Date\s*:\s*(\d{2}/\d{2}/\d{4})", text)
+    statement_match = PATTERNS["statement_date"].search(text)
     result["statement_date"] = statement_match.group(1) if statement_match else "N/A"
     
     # Payment Due Date - Works!
-    due_match = re.search(r"Payment Due Date[\s\S]*?(\d{2}/\d{2}/\d{4})", text)
+    due_match = PATTERNS["payment_due_date"].search(text)
     result["payment_due_date"] = due_match.group(1) if due_match else "N/A"
     
     # Total Amount Due - FIX: Avoid matching "0" by being more specific
     # Look for the actual table row with Payment Due Date and amounts
-    total_match = re.search(
-        r"Payment Due Date\s+Total Dues\s+Minimum Amount Due.*?\n.*?(\d{1,2}/\d{1,2}/\d{4})\s+([\d,]+\.?\d*)",
-        text,
-        re.DOTALL
-    )
+    total_match = PATTERNS["total_amount_due.table"].search(text)
     if total_match and total_match.group(2) != "0":
-        result["total_amount_due"] = total_match.group(2)
+        result["total_amount_due"] = printed_paise(total_match.group(2))
     else:
         # Fallback: Look in Account Summary section for non-zero value
-        total_match2 = re.search(r"Total Dues\s+([\d,]+\.\d{2})", text)
-        result["total_amount_due"] = total_match2.group(1) if total_match2 else "0.00"
+        total_match2 = PATTERNS["total_amount_due.summary"].search(text)
+        result["total_amount_due"] = printed_paise(total_match2.group(1)) if total_match2 else 0
     
     # Minimum Amount Due - FIX: Similar approach
-    min_match = re.search(
-        r"Payment Due Date\s+Total Dues\s+Minimum Amount Due.*?\n.*?\d{1,2}/\d{1,2}/\d{4}\s+[\d,]+\.?\d*\s+([\d,]+\.?\d*)",
-        text,
-        re.DOTALL
-    )
+    min_match = PATTERNS["minimum_amount_due.table"].search(text)
     if min_match and min_match.group(1) != "0":
-        result["minimum_amount_due"] = min_match.group(1)
+        result["minimum_amount_due"] = printed_paise(min_match.group(1))
     else:
         # Fallback
-        min_match2 = re.search(r"Minimum Amount Due\s+([\d,]+\.\d{2})", text)
-        result["minimum_amount_due"] = min_match2.group(1) if min_match2 else "0.00"
+        min_match2 = PATTERNS["minimum_amount_due.summary"].search(text)
+        result["minimum_amount_due"] = printed_paise(min_match2.group(1)) if min_match2 else 0
     
     # Credit Limit - Works!
-    credit_match = re.search(r"Credit Limit[\s\S]*?([\d.,]+)", text)
-    result["credit_limit"] = credit_match.group(1) if credit_match else "0.00"
+    credit_match = PATTERNS["credit_limit"].search(text)
+    result["credit_limit"] = printed_paise(credit_match.group(1)) if credit_match else 0
 
     # Transactions - Works!
-    transactions = []
-    trans_pattern = re.compile(r"(\d{2}/\d{2}/\d{4})\s+([A-Z0-9* ]+)\s+([A-Z]+)?\s+([\d.,]+)", re.MULTILINE)
-    for match in trans_pattern.finditer(text):
-        if len(transactions) >= 10:
-            break
-        transactions.append({
-            "date": match.group(1),
-            "description": match.group(2).strip(),
-            "amount": match.group(4)
-        })
-    result["transactions"] = transactions
+    result["transactions"] = TransactionTable(grouping=AMOUNT_GROUPING).extend(islice(iter_transactions(text), limit))
     
     return result
\ No newline at end of file
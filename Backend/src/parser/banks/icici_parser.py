@@ -1,48 +1,96 @@
 import re
 from datetime import datetime
+from itertools import islice
+
+from .document import as_document
+from .money import to_paise
+from .table import TransactionTable
+
+# Pages this parser needs: the MITC pages that close the statement carry no fields.
+PAGE_PLAN = {"start": None, "stop": ("MOST IMPORTANT TERMS AND CONDITIONS",)}
+
+# First-page regions extraction reads, as page fractions (x0, top, x1, bottom);
+# the app and contact-details panel beside the header and the spends chart
+# beside the transactions are left out (see backends.py).
+REGIONS = {
+    "header": (0, 0, 0.46, 0.3),
+    "summary": (0, 0.3, 1, 0.45),
+    "transactions": (0.3, 0.45, 1, 1),
+}
+
+# Column headings for the layout extraction mode (see layout.py).
+LAYOUT = {
+    "columns": {"date": ("DATE",), "serial_no": ("SERNO",), "description": ("TRANSACTION", "DETAILS"),
+                "points": ("REWARD", "POINTS"), "amount": ("AMOUNT",)},
+    "table": {"layout": ("date", "serial_no", "description", "points", "amount", "type")},
+    "skip_zero": True,
+}
+
+# Patterns, compiled once and keyed by field (see common.py).
+PATTERNS = {
+    "cardholder_name": re.compile(r'^(MR|MRS|MS|DR)\s+[A-Z][A-Z\s]{2,60}$'),
+    "card_number": re.compile(r'(\d{4}[Xx\*]{4,12}\d{4})'),
+    "statement_date.label": re.compile(r"STATEMENT\s+DATE", re.IGNORECASE),
+    "payment_due_date.label": re.compile(r"PAYMENT\s+DUE\s+DATE", re.IGNORECASE),
+    "date.long": re.compile(r'([A-Za-z]+\s+\d{1,2},\s*\d{4})'),
+    "date.numeric": re.compile(r'(\d{2}/\d{2}/\d{4})'),
+    "total_amount_due.label": re.compile(r"Total\s+Amount\s+due", re.IGNORECASE),
+    "minimum_amount_due.label": re.compile(r"Minimum\s+Amount\s+due", re.IGNORECASE),
+    "credit_limit.label": re.compile(r"Credit\s+Limit", re.IGNORECASE),
+    "amount.rupee": re.compile(r'[₹`]\s*([\d,]+\.\d{2})'),
+    "transactions": re.compile(
+        r'(\d{2}/\d{2}/\d{4})\s+(\d{6,12})\s+([A-Za-z0-9\s\-,.&\'()/@]{1,120}?)\s+(-?\d+)\s+([\d,]+\.\d{2})\s*(CR|DR|Cr|Dr)?',
+        re.MULTILINE | re.IGNORECASE
+    ),
+}
+
+def iter_transactions(text):
+    """(date, description, paise, drcr, extra) for every transaction, in order."""
+    for m in PATTERNS["transactions"].finditer(text):
+        desc = " ".join(m.group(3).split())
+        if any(k in desc.upper() for k in ["DATE", "TRANSACTION", "DETAILS", "REWARD"]):
+            continue
+
+        paise = to_paise(m.group(5))
+        if paise == 0:
+            continue  # Skip zero amounts
+        yield m.group(1), desc, paise, m.group(6) or "", {"serial_no": m.group(2), "points": m.group(4)}
 
-def parse(text):
+def parse(text, limit=None):
+    """`text` is a Document or a string; `limit` keeps only the first that many transactions."""
+    doc = as_document(text)
+    text = doc.text
     result = {
         "bank": "icici",
         "cardholder_name": "N/A",
         "card_number": "N/A",
         "statement_date": "N/A",
         "payment_due_date": "N/A",
-        "total_amount_due": "0.00",
-        "minimum_amount_due": "0.00",
-        "credit_limit": "0.00",
-        "transactions": [],
-        "transaction_categories": {
-            "Fuel": 0,
-            "Food": 0,
-            "Shopping": 0,
-            "Online Payments": 0,
-            "Travel": 0,
-            "Bills": 0,
-            "Entertainment": 0,
-            "Other": 0
-        }
+        "total_amount_due": 0,
+        "minimum_amount_due": 0,
+        "credit_limit": 0,
+        "transactions": []
     }
 
-    lines = text.splitlines()
+    lines = doc.raw_lines
 
     # Cardholder name
     for line in lines[:50]:
         line = line.strip()
-        if re.match(r'^(MR|MRS|MS|DR)\s+[A-Z][A-Z\s]{2,60}$', line):
+        if PATTERNS["cardholder_name"].match(line):
             result["cardholder_name"] = line
             break
 
     # Card number
-    card_match = re.search(r'(\d{4}[Xx\*]{4,12}\d{4})', text)
+    card_match = PATTERNS["card_number"].search(text)
     if card_match:
         result["card_number"] = card_match.group(1)
 
     def find_date(label):
         for i, l in enumerate(lines):
-            if re.search(label, l, re.IGNORECASE):
+            if label.search(l):
                 for j in range(i, min(i + 5, len(lines))):
-                    m = re.search(r'([A-Za-z]+\s+\d{1,2},\s*\d{4})', lines[j])
+                    m = PATTERNS["date.long"].search(lines[j])
                     if m:
                         try:
                             dt = datetime.strptime(m.group(1).strip(), "%B %d, %Y")
@@ -50,89 +98,31 @@ def parse(text):
                         except ValueError:
                             pass
                     # Fallback for direct dd/mm/yyyy
-                    m = re.search(r'(\d{2}/\d{2}/\d{4})', lines[j])
+                    m = PATTERNS["date.numeric"].search(lines[j])
                     if m:
                         return m.group(1)
         return "N/A"
 
-    result["statement_date"] = find_date("STATEMENT\\s+DATE")
-    result["payment_due_date"] = find_date("PAYMENT\\s+DUE\\s+DATE")
+    result["statement_date"] = find_date(PATTERNS["statement_date.label"])
+    result["payment_due_date"] = find_date(PATTERNS["payment_due_date.label"])
 
     def find_amount(label):
         for i, l in enumerate(lines):
-            if re.search(label, l, re.IGNORECASE):
+            if label.search(l):
                 for j in range(i, min(i + 10, len(lines))):  # Broader search
-                    m = re.search(r'[₹`]\s*([\d,]+\.\d{2})', lines[j])
+                    m = PATTERNS["amount.rupee"].search(lines[j])
                     if m:
-                        return normalize_money(m.group(1))
-        return "0.00"
+                        return to_paise(m.group(1))
+        return 0
 
-    result["total_amount_due"] = find_amount("Total\\s+Amount\\s+due")
-    result["minimum_amount_due"] = find_amount("Minimum\\s+Amount\\s+due")
-    result["credit_limit"] = find_amount("Credit\\s+Limit")
+    result["total_amount_due"] = find_amount(PATTERNS["total_amount_due.label"])
+    result["minimum_amount_due"] = find_amount(PATTERNS["minimum_amount_due.label"])
+    result["credit_limit"] = find_amount(PATTERNS["credit_limit.label"])
 
     # Transactions
-    trans_pattern = re.compile(
-        r'(\d{2}/\d{2}/\d{4})\s+(\d{6,12})\s+([A-Za-z0-9\s\-,.&\'()/@]+?)\s+(-?\d+)\s+([\d,]+\.\d{2})\s*(CR|DR|Cr|Dr)?',
-        re.MULTILINE | re.IGNORECASE
-    )
-
-    transactions = []
-    categories = result["transaction_categories"]
-
-    for m in trans_pattern.finditer(text):
-        desc = " ".join(m.group(3).split())
-        if any(k in desc.upper() for k in ["DATE", "TRANSACTION", "DETAILS", "REWARD"]):
-            continue
-
-        amount_str = m.group(5)
-        amount_val = float(normalize_money(amount_str))
-        if amount_val == 0:
-            continue  # Skip zero amounts
-        tx_type = (m.group(6) or "").upper()
-
-        tx = {
-            "date": m.group(1),
-            "serial_no": m.group(2),
-            "description": desc,
-            "points": m.group(4),
-            "amount": normalize_money(amount_str),
-            "type": tx_type
-        }
-
-        desc_l = desc.lower()
-        # Categorization (unchanged, working well)
-        if any(k in desc_l for k in ["fuel", "petrol", "indianoil", "hindustan petroleum", "hpcl", "bharat petroleum", "shell"]):
-            categories["Fuel"] += amount_val
-        elif any(k in desc_l for k in ["zomato", "swiggy", "restaurant", "food", "cafe", "dominos", "pizza", "mcdonald", "eat", "barbeque"]):
-            categories["Food"] += amount_val
-        elif any(k in desc_l for k in ["flipkart", "amazon", "myntra", "ajio", "shopping", "reliance digital", "rel retail", "croma", "electronics", "store", "mall"]):
-            categories["Shopping"] += amount_val
-        elif any(k in desc_l for k in ["upi", "paytm", "gpay", "google pay", "phonepe", "netbanking", "neft", "imps", "transfer", "received"]):
-            categories["Online Payments"] += amount_val
-        elif any(k in desc_l for k in ["irctc", "goibibo", "makemytrip", "yatra", "airlines", "indigo", "air india", "travel", "hotel", "booking"]):
-            categories["Travel"] += amount_val
-        elif any(k in desc_l for k in ["electricity", "gas", "water", "broadband", "postpaid", "prepaid", "billdesk", "vodafone", "airtel", "jio", "bsnl", "reliance energy"]):
-            categories["Bills"] += amount_val
-        elif any(k in desc_l for k in ["bookmyshow", "pvr", "inox", "cinema", "netflix", "spotify", "hotstar", "ott", "entertainment", "youtube"]):
-            categories["Entertainment"] += amount_val
-        else:
-            categories["Other"] += amount_val
-
-        transactions.append(tx)
+    transactions = TransactionTable(layout=("date", "serial_no", "description", "points", "amount", "type"))
+    transactions.extend(islice(iter_transactions(text), limit))
 
     result["transactions"] = transactions
-    result["transaction_categories"] = categories
     return result
 
-
-# Utility helpers (improved normalize_money)
-def normalize_money(s):
-    if not s:
-        return "0.00"
-    s2 = re.sub(r'[₹`,]', '', s).replace(",", "").strip()
-    if re.match(r'^\d+$', s2):
-        return f"{s2}.00"
-    if re.match(r'^\d+\.\d$', s2):
-        return f"{s2}0"
-    return s2
\ No newline at end of file
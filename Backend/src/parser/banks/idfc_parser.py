@@ -1,21 +1,49 @@
 import re
-
-
-def lines_of(text):
-    return [ln.rstrip() for ln in text.splitlines()]
-
-
-def normalize_money(s):
-    """Clean money strings: r18,100 → 18100.00"""
-    if not s:
-        return "0.00"
-    s = s.replace("₹", "").replace("r", "").replace(",", "").strip()
-    s = re.sub(r"[^\d.]", "", s)
-    if not s:
-        return "0.00"
-    if "." not in s:
-        return f"{s}.00"
-    return s
+from itertools import islice
+
+from .document import as_document
+from .money import to_paise
+from .table import TransactionTable
+
+
+# Pages this parser needs: the same markers that end the transaction section in parse().
+PAGE_PLAN = {"start": "YOUR TRANSACTIONS", "stop": ("REWARDS", "IMPORTANT INFORMATION")}
+
+# First-page regions extraction reads, as page fractions (x0, top, x1, bottom);
+# the message of the month beside the address and the payment modes column
+# beside the transactions are left out (see backends.py).
+REGIONS = {
+    "header": (0, 0, 0.78, 0.165),
+    "summary": (0, 0.165, 1, 0.38),
+    "transactions": (0.32, 0.38, 1, 1),
+}
+
+# Column headings for the layout extraction mode (see layout.py).
+LAYOUT = {
+    "columns": {"date": ("DATE",), "description": ("TRANSACTIONAL", "TRANSATIONAL", "DETAILS"),
+                "amount": ("AMOUNT",)},
+    "table": {"layout": ("date", "description", "amount", "type")},
+    "default_drcr": "DR",
+    "dedupe": True,
+}
+
+# Patterns, compiled once and keyed by field (see common.py).
+PATTERNS = {
+    "name.reject": re.compile(r"\d|₹|r", re.IGNORECASE),
+    "name.shape": re.compile(r"^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+$"),
+    "name.anchor": re.compile(r"Account\s*Number", re.IGNORECASE),
+    "name.money_like": re.compile(r"[₹r\d]"),
+    "statement_period": re.compile(r"(\d{2}/\d{2}/\d{4})\s*-\s*(\d{2}/\d{2}/\d{4})"),
+    "account_number": re.compile(r"Account\s*Number\s*[:\s]*([0-9]{6,})", re.IGNORECASE),
+    "customer_relationship_no": re.compile(r"Customer\s*Relationship\s*(?:No\.?)?\s*([0-9A-Za-z\-]+)", re.IGNORECASE),
+    "payment_due_date": re.compile(r"Payment\s+Due\s+Date.{0,500}?(\d{2}/\d{2}/\d{4})", re.IGNORECASE | re.DOTALL),
+    "opening_balance": re.compile(r"Opening\s*Balance.{0,500}?r(\d[\d,\.]*)", re.IGNORECASE | re.DOTALL),
+    "total_amount_due": re.compile(r"Total\s*Amount\s*Due.{0,500}?r(\d[\d,\.]*)", re.IGNORECASE | re.DOTALL),
+    "minimum_amount_due": re.compile(r"Minimum\s*Amount\s*Due.{0,500}?r(\d[\d,\.]*)", re.IGNORECASE | re.DOTALL),
+    "credit_limit": re.compile(r"r(\d{1,3}(?:,\d{2,3})*(?:\.\d+)?)", re.IGNORECASE),
+    "card_number": re.compile(r"Card\s*Number\s*[:\s]*XXXX\s*(\d{4})", re.IGNORECASE),
+    "transactions": re.compile(r"(\d{2}/\d{2}/\d{4})\s+(.{1,120}?)\s+(\d[\d,\.]*)\s*(CR)?", re.MULTILINE),
+}
 
 
 def looks_like_name(s):
@@ -23,11 +51,11 @@ def looks_like_name(s):
     s = s.strip()
     if not s:
         return False
-    if re.search(r"\d|₹|r", s, re.IGNORECASE):  # reject lines with digits or money
+    if PATTERNS["name.reject"].search(s):  # reject lines with digits or money
         return False
     if len(s.split()) > 4 or len(s.split()) < 2:
         return False
-    if not re.match(r"^[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+$", s):
+    if not PATTERNS["name.shape"].match(s):
         return False
     return True
 
@@ -46,16 +74,16 @@ def next_line_has_address(next_line: str):
 
 def extract_name_idfc(text):
     """IDFC-specific name extraction based on actual PDF layout."""
-    raw = lines_of(text)
+    raw = as_document(text).lines
     for i, line in enumerate(raw):
-        if re.search(r"Account\s*Number", line, re.IGNORECASE):
+        if PATTERNS["name.anchor"].search(line):
             # Check the next 12 lines
             for j in range(i + 1, min(i + 12, len(raw))):
                 cand = raw[j].strip()
                 if not cand or len(cand) < 3:
                     continue
                 # skip numeric or currency-like lines
-                if re.search(r"[₹r\d]", cand):
+                if PATTERNS["name.money_like"].search(cand):
                     continue
                 if "TOTAL" in cand.upper() or "AMOUNT" in cand.upper() or "DUE" in cand.upper():
                     continue
@@ -68,13 +96,69 @@ def extract_name_idfc(text):
     return "N/A"
 
 
-def parse(text):
-    """IDFC FIRST Bank Credit Card Statement Parser (final corrected)."""
+def iter_transactions(text):
+    """(date, description, paise, drcr, extra) for every transaction, in order."""
+    return iter_page_transactions([text])
+
+
+def iter_page_transactions(pages):
+    """
+    iter_transactions() over an iterable of page texts, holding one page at
+    a time: the section runs from YOUR TRANSACTIONS across page breaks to
+    the first REWARDS or IMPORTANT INFORMATION after it. A repeated YOUR
+    TRANSACTIONS restarts the section, on the same page or a later one, so
+    its rows are held until the section ends.
+    """
+    seen = set()
+    rows = []
+    inside = False
+    for page in pages:
+        doc = as_document(page)
+        lines = doc.upper_lines
+        tx_start_idx = 0 if inside else -1
+        tx_end_idx = -1
+        heading = False
+        for i, line in enumerate(lines):
+            if "YOUR TRANSACTIONS" in line:
+                tx_start_idx = i
+                heading = True
+            if tx_start_idx != -1 and ("REWARDS" in line or "IMPORTANT INFORMATION" in line):
+                tx_end_idx = i
+                break
+        if tx_start_idx == -1:
+            continue
+        if heading:
+            seen.clear()
+            rows.clear()
+
+        tx_section = doc.line_span(tx_start_idx, tx_end_idx if tx_end_idx != -1 else len(lines))
+        for match in PATTERNS["transactions"].finditer(tx_section):
+            desc = match.group(2).strip()
+            if any(skip in desc for skip in ["Transaction Date", "Transactional Details", "FX Transactions", "Amount", "Page", "Card Number"]):
+                continue
+            row = (match.group(1), " ".join(desc.split()), to_paise(match.group(3)))
+            # statements repeat rows across page breaks; keep the first
+            if row in seen:
+                continue
+            seen.add(row)
+            rows.append((*row, "CR" if match.group(4) else "DR", {}))
+        if tx_end_idx != -1:
+            break
+        inside = True
+    yield from rows
+
+
+def parse(text, limit=None):
+    """
+    IDFC FIRST Bank Credit Card Statement Parser (final corrected).
+    `text` is a Document or a string; `limit` keeps only the first that many transactions.
+    """
+    doc = as_document(text)
+    text = doc.text
     result = {}
-    lines = text.splitlines()
 
     # --- Statement Period ---
-    period = re.search(r"(\d{2}/\d{2}/\d{4})\s*-\s*(\d{2}/\d{2}/\d{4})", text)
+    period = PATTERNS["statement_period"].search(text)
     if period:
         result["statement_period"] = f"{period.group(1)} - {period.group(2)}"
         result["statement_start_date"] = period.group(1)
@@ -87,92 +171,52 @@ def parse(text):
         })
 
     # --- ✅ Fixed Cardholder Name Extraction ---
-    result["cardholder_name"] = extract_name_idfc(text)
+    result["cardholder_name"] = extract_name_idfc(doc)
 
     # --- Account & Relationship ---
-    acc = re.search(r"Account\s*Number\s*[:\s]*([0-9]{6,})", text, re.IGNORECASE)
+    acc = PATTERNS["account_number"].search(text)
     result["account_number"] = acc.group(1) if acc else "N/A"
 
-    rel = re.search(r"Customer\s*Relationship\s*(?:No\.?)?\s*([0-9A-Za-z\-]+)", text, re.IGNORECASE)
+    rel = PATTERNS["customer_relationship_no"].search(text)
     result["customer_relationship_no"] = rel.group(1) if rel else "N/A"
 
     # --- Payment Due Date ---
-    due_match = re.search(r"Payment\s+Due\s+Date.*?(\d{2}/\d{2}/\d{4})", text, re.IGNORECASE | re.DOTALL)
+    due_match = PATTERNS["payment_due_date"].search(text)
     result["payment_due_date"] = due_match.group(1) if due_match else "N/A"
 
     # --- Financial Summary ---
-    summary_idx = next((i for i, l in enumerate(lines) if "STATEMENT SUMMARY" in l.upper()), -1)
+    summary_idx = next((i for i, l in enumerate(doc.upper_lines) if "STATEMENT SUMMARY" in l), -1)
     if summary_idx != -1:
-        summary_section = "\n".join(lines[summary_idx: summary_idx + 25])
-        open_match = re.search(r"Opening\s*Balance.*?r(\d[\d,\.]*)", summary_section, re.IGNORECASE | re.DOTALL)
-        total_match = re.search(r"Total\s*Amount\s*Due.*?r(\d[\d,\.]*)", summary_section, re.IGNORECASE | re.DOTALL)
-        min_match = re.search(r"Minimum\s*Amount\s*Due.*?r(\d[\d,\.]*)", summary_section, re.IGNORECASE | re.DOTALL)
-
-        result["opening_balance"] = normalize_money(open_match.group(1)) if open_match else "0.00"
-        result["total_amount_due"] = normalize_money(total_match.group(1)) if total_match else "0.00"
-        result["minimum_amount_due"] = normalize_money(min_match.group(1)) if min_match else "0.00"
-
-        limit_values = re.findall(r"r(\d{1,3}(?:,\d{2,3})*(?:\.\d+)?)", summary_section, re.IGNORECASE)
-        limits_norm = []
-        for v in limit_values:
-            nv = normalize_money(v)
-            if nv not in limits_norm:
-                limits_norm.append(nv)
-        if len(limits_norm) >= 2:
-            numeric = [(float(x), x) for x in limits_norm]
-            numeric_sorted = sorted(numeric, key=lambda t: t[0], reverse=True)
-            result["credit_limit"] = numeric_sorted[0][1]
-            result["available_credit"] = numeric_sorted[1][1]
+        summary_section = doc.line_span(summary_idx, summary_idx + 25)
+        open_match = PATTERNS["opening_balance"].search(summary_section)
+        total_match = PATTERNS["total_amount_due"].search(summary_section)
+        min_match = PATTERNS["minimum_amount_due"].search(summary_section)
+
+        result["opening_balance"] = to_paise(open_match.group(1)) if open_match else 0
+        result["total_amount_due"] = to_paise(total_match.group(1)) if total_match else 0
+        result["minimum_amount_due"] = to_paise(min_match.group(1)) if min_match else 0
+
+        # the two largest distinct amounts are the limit and what is still available
+        limits = sorted({to_paise(v) for v in PATTERNS["credit_limit"].findall(summary_section)}, reverse=True)
+        if len(limits) >= 2:
+            result["credit_limit"], result["available_credit"] = limits[0], limits[1]
         else:
-            result["credit_limit"] = "0.00"
-            result["available_credit"] = "0.00"
+            result["credit_limit"] = result["available_credit"] = 0
     else:
         result.update({
-            "opening_balance": "0.00",
-            "total_amount_due": "0.00",
-            "minimum_amount_due": "0.00",
-            "credit_limit": "0.00",
-            "available_credit": "0.00"
+            "opening_balance": 0,
+            "total_amount_due": 0,
+            "minimum_amount_due": 0,
+            "credit_limit": 0,
+            "available_credit": 0
         })
 
     # --- Card Number ---
-    card = re.search(r"Card\s*Number\s*[:\s]*XXXX\s*(\d{4})", text, re.IGNORECASE)
+    card = PATTERNS["card_number"].search(text)
     result["card_number"] = f"XXXX{card.group(1)}" if card else "N/A"
 
     # --- Transactions ---
-    transactions = []
-    tx_start_idx = tx_end_idx = -1
-    for i, line in enumerate(lines):
-        if "YOUR TRANSACTIONS" in line.upper():
-            tx_start_idx = i
-        if tx_start_idx != -1 and ("REWARDS" in line.upper() or "IMPORTANT INFORMATION" in line.upper()):
-            tx_end_idx = i
-            break
-
-    if tx_start_idx != -1:
-        tx_end_idx = tx_end_idx if tx_end_idx != -1 else len(lines)
-        tx_section = "\n".join(lines[tx_start_idx:tx_end_idx])
-
-        tx_pattern = re.compile(r"(\d{2}/\d{2}/\d{4})\s+(.+?)\s+(\d[\d,\.]*)\s*(CR)?", re.MULTILINE)
-        for match in tx_pattern.finditer(tx_section):
-            desc = match.group(2).strip()
-            if any(skip in desc for skip in ["Transaction Date", "Transactional Details", "FX Transactions", "Amount", "Page", "Card Number"]):
-                continue
-            transactions.append({
-                "date": match.group(1),
-                "description": " ".join(desc.split()),
-                "amount": normalize_money(match.group(3)),
-                "type": "CR" if match.group(4) else "DR"
-            })
-
-    seen = set()
-    unique_txns = []
-    for tx in transactions:
-        key = (tx["date"], tx["description"], tx["amount"])
-        if key not in seen:
-            seen.add(key)
-            unique_txns.append(tx)
-
-    result["transactions"] = unique_txns
+    transactions = TransactionTable(layout=("date", "description", "amount", "type"))
+    result["transactions"] = transactions.extend(islice(iter_transactions(doc), limit))
     result["bank_detected"] = "idfc"
     return result
@@ -0,0 +1,108 @@
+"""
+Money as integer paise, read with to_paise() and written back as "1289.00"
+by format_paise(). Parsers with an AMOUNT_GROUPING read with printed_paise()
+and keep the form the statement printed: "1,289.00", "30,000", "5217.50",
+"1,234,567.00".
+"""
+import re
+
+# Optional sign and currency prefix (₹, Rs., INR, the "r"/"`" that PDF text
+# extraction leaves for a rupee glyph), digits with any comma grouping
+# (1,23,456 or 123,456), up to two decimals (more are dropped) and an
+# optional Dr/Cr marker.
+_AMOUNT = re.compile(
+    r"(-)?\s*(?:₹|rs\.?|inr|r|`)?\s*(\d[\d,]*)(?:\.(\d{0,2})\d*)?(?:\s*(dr|cr)\b)?",
+    re.IGNORECASE,
+)
+
+# Result keys that hold money; parsers store paise ints under them.
+MONEY_FIELDS = ("total_amount_due", "minimum_amount_due", "credit_limit",
+                "opening_balance", "available_credit")
+
+
+def parse_amount(text):
+    """(paise, "DR"/"CR"/"") for the first amount in `text`; (0, "") if there is none."""
+    m = _AMOUNT.search(text) if text else None
+    if not m:
+        return 0, ""
+    paise = int(m.group(2).replace(",", "")) * 100 + int((m.group(3) or "").ljust(2, "0"))
+    return (-paise if m.group(1) else paise), (m.group(4) or "").upper()
+
+
+def to_paise(text):
+    """Integer paise for an amount like "₹1,23,456.78", "r18,100" or "1,289.00 Dr"."""
+    return parse_amount(text)[0]
+
+
+class Printed(int):
+    """Paise that remember the grouping and decimals the statement printed."""
+    grouping = None
+    decimals = 2
+
+
+def _grouping_of(digits):
+    """ "indian" for 12,34,567, "western" for 1,234,567, None when ungrouped or irregular."""
+    groups = digits.split(",")
+    if len(groups) == 1 or not 1 <= len(groups[0]) <= 3 or len(groups[-1]) != 3:
+        return None
+    middle = {len(g) for g in groups[1:-1]}
+    if middle <= {2} and len(groups[0]) <= 2:
+        return "indian"
+    if middle <= {3}:
+        return "western"
+    return None
+
+
+def printed_paise(text):
+    """to_paise(), keeping the grouping and decimals `text` has ("30,000" has no decimals)."""
+    m = _AMOUNT.search(text) if text else None
+    paise = Printed(parse_amount(text)[0])
+    if m:
+        paise.grouping = _grouping_of(m.group(2))
+        paise.decimals = len(m.group(3) or "")
+    return paise
+
+
+def _group_indian(rupees):
+    head, tail = rupees[:-3], rupees[-3:]
+    while head:
+        head, tail = head[:-2], f"{head[-2:]},{tail}"
+    return tail
+
+
+def _group_western(rupees):
+    return f"{int(rupees):,}"
+
+
+_GROUPERS = {"indian": _group_indian, "western": _group_western}
+
+
+def format_paise(paise, grouping=None, decimals=2):
+    """
+    "1234567.80"; with grouping="indian" "12,34,567.80" and with
+    grouping="western" "1,234,567.80" (any other grouping writes none).
+    `decimals` (0-2) drops trailing paise digits, which are then zero for
+    printed amounts.
+    """
+    sign = "-" if paise < 0 else ""
+    rupees, paise = divmod(abs(paise), 100)
+    group = _GROUPERS.get(grouping)
+    text = sign + (group(str(rupees)) if group else str(rupees))
+    if decimals:
+        text += f".{paise:02d}"[:decimals + 1]
+    return text
+
+
+def format_money_fields(result, grouping=None):
+    """
+    Format the paise ints a parser left in MONEY_FIELDS, in place; a
+    printed_paise() value keeps its own grouping.
+    """
+    for key in MONEY_FIELDS:
+        value = result.get(key)
+        if isinstance(value, int):
+            if isinstance(value, Printed):
+                result[key] = format_paise(value, value.grouping, value.decimals)
+            else:
+                result[key] = format_paise(value, grouping)
+    return result
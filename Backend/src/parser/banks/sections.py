@@ -0,0 +1,83 @@
+"""One-pass index of the labelled sections of a statement's text."""
+import re
+
+HEADER = "header"
+
+# Headings that open a section, in one alternation so a single finditer
+# finds them all. The transaction headings are the ones the general
+# parser has always used to find the transaction list.
+SECTION_HEADINGS = {
+    "payment_summary": r"PAYMENT\s+SUMMARY",
+    "account_summary": r"Account\s+Summary",
+    "transactions": r"TRANSACTION\s+DETAILS|DATE\s+TRANSACTION|Date\s+Description\s+Amount|Account\s+Transactions",
+    "rewards": r"REWARD\s+POINTS?\s+SUMMARY|REWARDS?\s+SUMMARY",
+}
+
+# The lookahead on the headings' first letters lets the scan skip most
+# positions without trying every case-insensitive branch.
+_HEADINGS = re.compile(
+    "(?=[PADRTpadrt])(?i:" + "|".join(f"(?P<{label}>{pattern})" for label, pattern in SECTION_HEADINGS.items()) + ")"
+)
+
+
+class SectionIndex:
+    """
+    Labelled sections of one document with their offsets, found by a single
+    scan that only advances as far as the queries so far have needed.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.starts = {label: [] for label in SECTION_HEADINGS}
+        self._order = []
+        self._scan = _HEADINGS.finditer(text)
+        self._lines = None
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            self._lines = [ln.rstrip() for ln in self.text.splitlines()]
+        return self._lines
+
+    def _advance(self):
+        m = next(self._scan, None)
+        if m is None:
+            self._scan = iter(())
+            return False
+        self.starts[m.lastgroup].append(m.start())
+        self._order.append((m.lastgroup, m.start()))
+        return True
+
+    def find(self, *labels):
+        """Offset of the first heading with any of `labels`, or None."""
+        while not any(self.starts[label] for label in labels):
+            if not self._advance():
+                return None
+        return min(self.starts[label][0] for label in labels if self.starts[label])
+
+    def window(self, labels, length=None):
+        """
+        `length` characters (or the rest of the text) from the first heading
+        with one of `labels`; None if absent.
+        """
+        if isinstance(labels, str):
+            labels = (labels,)
+        start = self.find(*labels)
+        if start is None:
+            return None
+        return self.text[start:] if length is None else self.text[start:start + length]
+
+    def spans(self):
+        """(label, start, end) for the header and every section, in document order."""
+        while self._advance():
+            pass
+        bounds = [(HEADER, 0)] + self._order
+        ends = [start for _, start in bounds[1:]] + [len(self.text)]
+        return [(label, start, end) for (label, start), end in zip(bounds, ends)]
+
+    def search(self, pattern, limit=None):
+        """pattern.search over the first `limit` characters without copying them."""
+        return pattern.search(self.text, 0, len(self.text) if limit is None else limit)
+
+    def findall(self, pattern, limit=None):
+        return pattern.findall(self.text, 0, len(self.text) if limit is None else limit)
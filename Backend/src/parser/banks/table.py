@@ -0,0 +1,152 @@
+"""
+Columnar transaction storage shared by the bank parsers: dates as ordinal
+days, amounts as paise, Dr/Cr as a small code, descriptions interned.
+"""
+import re
+import sys
+from array import array
+from datetime import date
+
+from .money import Printed, format_paise
+
+NO_DRCR, DEBIT, CREDIT = 0, 1, 2
+_DRCR_CODES = {"": NO_DRCR, "DR": DEBIT, "CR": CREDIT}
+_DRCR_TEXT = {NO_DRCR: "", DEBIT: "DR", CREDIT: "CR"}
+
+_DMY = re.compile(r"^(\d{2})/(\d{2})/(\d{4})$")
+
+
+def parse_date(text):
+    """Ordinal day of a dd/mm/yyyy date, or 0 if it is not one."""
+    m = _DMY.match(text)
+    if not m:
+        return 0
+    try:
+        return date(int(m.group(3)), int(m.group(2)), int(m.group(1))).toordinal()
+    except ValueError:
+        return 0
+
+
+def format_date(ordinal):
+    d = date.fromordinal(ordinal)
+    return f"{d.day:02d}/{d.month:02d}/{d.year}"
+
+
+class TransactionTable:
+    """
+    Transactions of one statement, column by column. `layout` is the key
+    order of the records; `drcr_suffix` ("upper" or "capitalize") appends the
+    Dr/Cr marker to the amount, and `grouping` goes to money.format_paise()
+    for amounts that don't carry their own printed grouping.
+    """
+
+    def __init__(self, layout=("date", "description", "amount"), drcr_suffix=None, grouping=None):
+        self.layout = tuple(layout)
+        self.drcr_suffix = drcr_suffix
+        self.grouping = grouping
+        self.dates = array("l")
+        self.amounts = array("q")
+        self.drcr = array("b")
+        self.descriptions = []
+        self.extra = {key: [] for key in self.layout
+                      if key not in ("date", "description", "amount", "type")}
+        self._date_text = {}
+        self._decimals = {}
+        self._groupings = {}
+
+    def __len__(self):
+        return len(self.descriptions)
+
+    def append(self, date_text, description, paise, drcr="", **extra):
+        """Add a row; `paise` is the amount from money.to_paise() or money.printed_paise()."""
+        row = len(self.descriptions)
+        ordinal = parse_date(date_text)
+        if not ordinal or format_date(ordinal) != date_text:
+            self._date_text[row] = date_text
+        decimals = getattr(paise, "decimals", 2)
+        if decimals != 2:
+            self._decimals[row] = decimals
+        if isinstance(paise, Printed) and paise.grouping != self.grouping:
+            self._groupings[row] = paise.grouping
+        self.dates.append(ordinal)
+        try:
+            self.amounts.append(paise)
+        except OverflowError:
+            # a digit run too long for 64 bits (usually a reference number
+            # read as an amount); keep it exact in a plain list
+            self.amounts = list(self.amounts)
+            self.amounts.append(paise)
+        self.drcr.append(_DRCR_CODES[drcr.upper()])
+        self.descriptions.append(sys.intern(description))
+        for key, column in self.extra.items():
+            column.append(extra[key])
+
+    def extend(self, rows):
+        """Append (date_text, description, paise, drcr, extra) rows; returns the table."""
+        for date_text, description, paise, drcr, extra in rows:
+            self.append(date_text, description, paise, drcr, **extra)
+        return self
+
+    def truncate(self, n):
+        """Keep the first `n` rows; returns the table."""
+        if n < len(self):
+            del self.dates[n:], self.amounts[n:], self.drcr[n:], self.descriptions[n:]
+            for column in self.extra.values():
+                del column[n:]
+            self._date_text = {r: t for r, t in self._date_text.items() if r < n}
+            self._decimals = {r: d for r, d in self._decimals.items() if r < n}
+            self._groupings = {r: g for r, g in self._groupings.items() if r < n}
+        return self
+
+    def date_text(self, row):
+        text = self._date_text.get(row)
+        return format_date(self.dates[row]) if text is None else text
+
+    def amount_text(self, row):
+        text = format_paise(self.amounts[row], self._groupings.get(row, self.grouping),
+                            self._decimals.get(row, 2))
+        code = self.drcr[row]
+        if self.drcr_suffix and code:
+            marker = _DRCR_TEXT[code]
+            text = f"{text} {marker.capitalize() if self.drcr_suffix == 'capitalize' else marker}"
+        return text
+
+    def record(self, row):
+        rec = {}
+        for key in self.layout:
+            if key == "date":
+                rec[key] = self.date_text(row)
+            elif key == "description":
+                rec[key] = self.descriptions[row]
+            elif key == "amount":
+                rec[key] = self.amount_text(row)
+            elif key == "type":
+                rec[key] = _DRCR_TEXT[self.drcr[row]]
+            else:
+                rec[key] = self.extra[key][row]
+        return rec
+
+    def records(self):
+        """Rows as dicts, one at a time."""
+        return (self.record(row) for row in range(len(self)))
+
+    def to_records(self):
+        """The list-of-dicts form the parsers have always returned."""
+        return list(self.records())
+
+    def category_totals(self, classifier, categories):
+        """
+        Sum amounts per category into `categories` (a dict of starting
+        totals), classifying every distinct description once. Credits are
+        skipped when the table has a "type" column, which is where
+        categorization has always looked for them.
+        """
+        skip_credits = "type" in self.layout
+        rows = [r for r in range(len(self)) if not (skip_credits and self.drcr[r] == CREDIT)]
+        labels = classifier.classify_many([self.descriptions[r] for r in rows])
+        paise = {}
+        for row, label in zip(rows, labels):
+            paise[label] = paise.get(label, 0) + self.amounts[row]
+        for label, total in paise.items():
+            categories[label] = categories.get(label, 0) + total / 100
+        return categories
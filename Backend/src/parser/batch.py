@@ -0,0 +1,139 @@
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+from cache import digest_of, text_cache
+from main_parser import parse_statement_file, reparse_cached_text
+from protocol import FrameWriter
+from timeouts import time_limit
+
+
+def collect_pdfs(source):
+    """
+    Resolve a batch source to a list of PDF paths:
+      - a directory (searched recursively for *.pdf)
+      - a manifest file (one path per line, relative to the manifest; '#' comments)
+      - a glob pattern (supports '**')
+    Raises FileNotFoundError for a source that is none of these, or a glob
+    that matches nothing.
+    """
+    if os.path.isdir(source):
+        found = []
+        for root, _, files in os.walk(source):
+            found.extend(os.path.join(root, f) for f in files if f.lower().endswith(".pdf"))
+        return sorted(found)
+
+    if os.path.isfile(source) and not source.lower().endswith(".pdf"):
+        base = os.path.dirname(os.path.abspath(source))
+        with open(source, encoding="utf-8") as fh:
+            entries = [ln.strip() for ln in fh]
+        return [os.path.join(base, e) for e in entries if e and not e.startswith("#")]
+
+    found = sorted(glob.glob(source, recursive=True))
+    if not found:
+        raise FileNotFoundError(f"No such file, directory or matching glob: {source}")
+    return found
+
+
+def parse_one(pdf_path, use_cache=None, limit=None):
+    """Worker entry point: never raises, so one bad PDF can't abort the batch."""
+    start = time.perf_counter()
+    record = {"file": pdf_path, "ok": False, "pages": 0, "cached": False}
+    try:
+        # keep parser diagnostics out of the NDJSON stream; give up on a
+        # statement after PARSER_TIMEOUT instead of holding a pool slot
+        with redirect_stdout(sys.stderr), time_limit():
+            # the batch pool already uses every core; keep extraction serial
+            result, pages, cached = parse_statement_file(pdf_path, extract_workers=1, use_cache=use_cache,
+                                                         limit=limit)
+        record.update(ok=True, pages=pages, cached=cached, result=result)
+    except Exception as e:
+        record["error"] = str(e)
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def reparse_one(digest):
+    """Worker entry point for --reparse-cache: parse cached page text, no PDF."""
+    start = time.perf_counter()
+    record = {"digest": digest, "ok": False, "pages": 0}
+    try:
+        with redirect_stdout(sys.stderr), time_limit():
+            result, pages = reparse_cached_text(digest)
+        record.update(ok=True, pages=pages, result=result)
+    except Exception as e:
+        record["error"] = str(e)
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def _stream(worker_fn, items, label, workers, out, extra_args=(), fmt="json"):
+    """
+    Run `worker_fn(item, *extra_args)` for every item across a process pool,
+    writing each record as a "result" or "error" frame in `fmt` (see
+    protocol.py) when it finishes. Returns the summary.
+    """
+    writer = FrameWriter(out, fmt)
+    start = time.perf_counter()
+    parsed = failed = pages = cached = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(worker_fn, item, *extra_args): item for item in items}
+        for fut in as_completed(futures):
+            try:
+                record = fut.result()
+            except Exception as e:  # worker process died (e.g. OOM kill)
+                record = {label: futures[fut], "ok": False, "pages": 0, "error": str(e)}
+            if record["ok"]:
+                parsed += 1
+            else:
+                failed += 1
+            pages += record["pages"]
+            cached += record.get("cached", False)
+            writer.send("result" if record["ok"] else "error", **record)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "statements": len(items),
+        "parsed": parsed,
+        "failed": failed,
+        "pages": pages,
+        "cache_hits": cached,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "statements_per_sec": round(len(items) / elapsed, 2) if elapsed else 0.0,
+        "pages_per_sec": round(pages / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def run_batch(source, workers=None, out=None, use_cache=None, limit=None, fmt="json"):
+    """
+    Parse every PDF in `source` across a process pool, streaming one JSON line
+    per statement to `out` as it finishes. Throughput is reported on stderr.
+    Returns a process exit code (0 when every statement parsed).
+    """
+    try:
+        pdfs = collect_pdfs(source)
+    except OSError as e:
+        FrameWriter(out or sys.stdout, fmt).send("error", ok=False, error=str(e))
+        return 1
+    summary = _stream(parse_one, pdfs, "file", workers or os.cpu_count() or 1,
+                      out or sys.stdout, (use_cache, limit), fmt)
+    print(json.dumps({"summary": summary}), file=sys.stderr)
+    return 0 if summary["failed"] == 0 else 1
+
+
+def run_reparse(workers=None, out=None, fmt="json"):
+    """
+    Re-run every parser over the extracted-text cache without touching the
+    PDFs, refreshing the result cache for the current parser sources. Pages
+    that lazy extraction skipped originally stay skipped.
+    """
+    digests = [digest_of(key) for key in text_cache().keys()]
+    summary = _stream(reparse_one, digests, "digest", workers or os.cpu_count() or 1,
+                      out or sys.stdout, fmt=fmt)
+    print(json.dumps({"summary": summary}), file=sys.stderr)
+    return 0 if summary["failed"] == 0 else 1
@@ -0,0 +1,66 @@
+"""
+Extraction backends on the sample statements: pages per second for each
+backend, and how many of the parsed fields and transactions agree with the
+pdfplumber parse the bank parsers were written against. The fastest backend
+that agrees on everything is the one to name in the bank's registry entry.
+
+    python3 benchmarks/bench_backends.py [--repeat 3] [--backends pdfplumber,pypdfium2]
+"""
+import argparse
+import glob
+import os
+import sys
+import timeit
+from collections import Counter
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from backends import DEFAULT_BACKEND, available_backends  # noqa: E402
+from benchmarks.bench_fields import SAMPLES_DIR  # noqa: E402
+from extraction import extract_pages_native, join_pages  # noqa: E402
+from main_parser import parse_statement_text, plain_result  # noqa: E402
+
+# not fields of the statement
+IGNORED = {"transactions", "transaction_categories", "extraction_method", "confidence", "metrics"}
+
+
+def best_of(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def parse_with(path, backend):
+    pages = extract_pages_native(path, workers=1, backend=backend)
+    return len(pages), plain_result(parse_statement_text(join_pages(pages)))
+
+
+def agreement(result, reference):
+    """(fields equal, fields, reference transactions found, reference transactions)."""
+    fields = [k for k in reference if k not in IGNORED]
+    same = sum(result.get(k) == reference[k] for k in fields)
+    key = lambda tx: tuple(sorted(tx.items()))  # noqa: E731
+    found = Counter(map(key, result.get("transactions", []))) & Counter(map(key, reference["transactions"]))
+    return same, len(fields), sum(found.values()), len(reference["transactions"])
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--backends", default=",".join(available_backends()),
+                    help="comma-separated backends to compare")
+    args = ap.parse_args()
+    backends = args.backends.split(",")
+
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf"))):
+        n_pages, reference = parse_with(path, DEFAULT_BACKEND)
+        print(f"{os.path.basename(path)[:40]:<40} {reference['bank_detected']}, {n_pages} pages")
+        for backend in backends:
+            secs = best_of(lambda: extract_pages_native(path, workers=1, backend=backend), args.repeat)
+            same, fields, found, rows = agreement(parse_with(path, backend)[1], reference)
+            verdict = "agrees" if (same, found) == (fields, rows) else "differs"
+            print(f"  {backend:<11} {n_pages / secs:8.1f} pages/s  {secs * 1000:8.1f} ms"
+                  f"  fields {same:2d}/{fields:<2d}  transactions {found:3d}/{rows:<3d}  {verdict}")
+
+
+if __name__ == "__main__":
+    main()
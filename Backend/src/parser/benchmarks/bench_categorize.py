@@ -0,0 +1,78 @@
+"""
+Aho-Corasick categorizer (alone and behind the merchant LRU) vs the previous
+any()-cascade on synthetic transaction descriptions.
+
+    python3 benchmarks/bench_categorize.py [--rows 100000] [--merchants 5000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import re
+import string
+import sys
+import timeit
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from categorize import MerchantCache  # noqa: E402
+from main_parser import CATEGORIZER, CATEGORY_RULES  # noqa: E402
+
+
+def legacy_classify(desc):
+    desc = re.sub(r'[^a-z0-9 ]+', ' ', desc.lower())
+    for category, keywords in CATEGORY_RULES:
+        if any(word in desc for word in keywords):
+            return category
+    return "Other"
+
+
+def synthetic_descriptions(rows, merchants, seed=7):
+    """
+    Merchant-like strings: a keyword (most of the time) with a city suffix and
+    a fresh reference number on every row, as on real statements.
+    """
+    rng = random.Random(seed)
+    keywords = [w for _, words in CATEGORY_RULES for w in words]
+    cities = ["MUMBAI", "BANGALORE", "NEW DELHI", "GURGAON", "PUNE", "CHENNAI", "KOLKATA"]
+
+    def merchant():
+        filler = "".join(rng.choices(string.ascii_uppercase, k=rng.randint(4, 14)))
+        name = rng.choice(keywords).upper() if rng.random() < 0.8 else filler
+        return f"{filler[:5]} {name}*", f" {rng.choice(cities)} IN"
+
+    pool = [merchant() for _ in range(merchants)]
+    rows_out = []
+    for _ in range(rows):
+        head, city = rng.choice(pool)
+        rows_out.append(head + "".join(rng.choices(string.digits, k=rng.randint(6, 12))) + city)
+    return rows_out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--merchants", type=int, default=5_000,
+                    help="distinct merchants the rows are drawn from")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    descs = synthetic_descriptions(args.rows, args.merchants)
+    expected = [legacy_classify(d) for d in descs]
+    assert expected == CATEGORIZER.classify_many(descs)
+    assert expected == MerchantCache(CATEGORIZER).classify_many(descs)
+
+    legacy = min(timeit.repeat(lambda: [legacy_classify(d) for d in descs], number=1, repeat=args.repeat))
+    single = min(timeit.repeat(lambda: [CATEGORIZER.classify(d) for d in descs], number=1, repeat=args.repeat))
+    batch = min(timeit.repeat(lambda: CATEGORIZER.classify_many(descs), number=1, repeat=args.repeat))
+    merchants = MerchantCache(CATEGORIZER)
+    cached = min(timeit.repeat(lambda: merchants.classify_many(descs), number=1, repeat=args.repeat))
+    print(f"{args.rows} rows / {args.merchants} merchants")
+    for label, secs in (("any() cascade", legacy), ("automaton", single), ("automaton batch", batch),
+                        ("merchant cache", cached)):
+        print(f"  {label:<16} {secs * 1000:9.1f} ms  {args.rows / secs:12,.0f} rows/s")
+    print(f"  merchant cache   {merchants.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Single-pass bank_detect vs the previous one-findall-per-bank detector on
+large concatenated statement texts.
+
+    python3 benchmarks/bench_detect.py [--copies 200] [--repeat 5]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import timeit
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from bank_detect import bank_detect  # noqa: E402
+from extraction import extract_text_native  # noqa: E402
+
+SAMPLES_DIR = os.path.join(PARSER_DIR, "..", "..", "..", "real bank statements for testing")
+
+LEGACY_PATTERNS = {
+    "axis": re.compile(r"(Axis Bank|AXIS BANK|Neo Credit Card|MyZone Credit Card|Flipkart Axis Bank Credit Card)", re.IGNORECASE),
+    "icici": re.compile(r"(ICICI Bank|ICICI Bank Credit Card Statement)", re.IGNORECASE),
+    "hdfc": re.compile(r"(HDFC Bank|HDFC Bank Credit Card Statement)", re.IGNORECASE),
+    "idfc": re.compile(r"(IDFC\s*FIRST\s*Bank|IDFC FIRST Bank Credit Card Statement|IDFC Bank)", re.IGNORECASE),
+}
+
+
+def legacy_bank_detect(text):
+    max_confidence = 0
+    detected_bank = None
+    for bank, pattern in LEGACY_PATTERNS.items():
+        confidence = len(pattern.findall(text)) * 10
+        if confidence > max_confidence:
+            max_confidence = confidence
+            detected_bank = bank
+    return (detected_bank, max_confidence)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--copies", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    texts = [extract_text_native(p, workers=1) for p in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf")))]
+    corpus = {
+        "single statement": texts[0],
+        f"all samples x{args.copies}": "\n".join(texts) * args.copies,
+        f"one bank x{args.copies}": texts[-1] * args.copies,
+    }
+
+    for label, text in corpus.items():
+        assert bank_detect(text) == legacy_bank_detect(text), label
+        legacy = min(timeit.repeat(lambda: legacy_bank_detect(text), number=1, repeat=args.repeat))
+        single = min(timeit.repeat(lambda: bank_detect(text), number=1, repeat=args.repeat))
+        early = min(timeit.repeat(lambda: bank_detect(text, decisive_margin=3), number=1, repeat=args.repeat))
+        print(f"{label:<22} {len(text) / 1e3:8.1f} KB  legacy {legacy * 1000:8.2f} ms  "
+              f"single-pass {single * 1000:8.2f} ms  early-exit {early * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Per-field extraction cost over the sample statements: the shared Document
+and the general parser's extract_* functions that use it, each bank parser's
+parse(), and every entry of the PATTERNS tables. Save a run and compare later ones against it to catch
+regex regressions.
+
+    python3 benchmarks/bench_fields.py [--repeat 5] [--save base.json] [--compare base.json --tolerance 0.25]
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import timeit
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from bank_detect import bank_detect  # noqa: E402
+from banks import BANKS, load_general_parser, load_parser  # noqa: E402
+from banks.document import Document  # noqa: E402
+from extraction import extract_text_native  # noqa: E402
+
+SAMPLES_DIR = os.path.join(PARSER_DIR, "..", "..", "..", "real bank statements for testing")
+
+GENERAL_FIELDS = ("name", "card_number", "statement_date", "due_date", "total_due",
+                  "minimum_due", "credit_limit", "transactions")
+
+
+def best_of(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def pattern_timings(prefix, patterns, text, repeat):
+    """Time a full scan of `text` with every compiled pattern in a PATTERNS table."""
+    timings = {}
+    for name, pats in patterns.items():
+        pats = pats if isinstance(pats, list) else [pats]
+        timings[f"{prefix}:re:{name}"] = best_of(lambda: [p.findall(text) for p in pats], repeat)
+    return timings
+
+
+def measure(texts, repeat):
+    general = load_general_parser()
+    timings = {}
+    corpus = "\n".join(texts.values())
+    # the views are lazy, so build them all to time what a parse may pay for
+    timings["general:document"] = best_of(
+        lambda: (lambda d: (d.spans(), d.lines, d.upper_lines, d.line_starts))(Document(corpus)), repeat)
+    doc = Document(corpus)
+    for field in GENERAL_FIELDS:
+        fn = getattr(general, f"extract_{field}")
+        timings[f"general:{field}"] = best_of(lambda: fn(doc), repeat)
+    timings.update(pattern_timings("general", general.PATTERNS, corpus, repeat))
+
+    for label, text in texts.items():
+        bank, _ = bank_detect(text)
+        if bank not in BANKS:
+            continue
+        parser = load_parser(bank)
+        timings[f"{bank}:parse"] = best_of(lambda: parser.parse(text), repeat)
+        timings.update(pattern_timings(bank, parser.PATTERNS, text, repeat))
+    return timings
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--save", metavar="FILE", help="write the timings as JSON")
+    ap.add_argument("--compare", metavar="FILE", help="fail if any timing regressed against FILE")
+    ap.add_argument("--tolerance", type=float, default=0.25,
+                    help="allowed slowdown as a fraction of the saved timing")
+    args = ap.parse_args()
+
+    texts = {os.path.basename(p): extract_text_native(p, workers=1)
+             for p in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf")))}
+    timings = measure(texts, args.repeat)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+
+    regressions = []
+    for name, secs in sorted(timings.items(), key=lambda kv: kv[1], reverse=True):
+        line = f"{name:<48} {secs * 1e6:10.1f} us"
+        if name in baseline:
+            ratio = secs / baseline[name] if baseline[name] else 1.0
+            line += f"  x{ratio:5.2f}"
+            # sub-10us timings are too noisy to gate on
+            if ratio > 1 + args.tolerance and secs > 1e-5:
+                regressions.append(name)
+                line += "  REGRESSED"
+        print(line)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as fh:
+            json.dump(timings, fh, indent=2, sort_keys=True)
+    if regressions:
+        print(f"{len(regressions)} timing(s) regressed beyond {args.tolerance:.0%}: {', '.join(regressions)}",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Upload handoff under concurrent load: the old path, where each upload is
+written to a temporary file whose path is sent to a warm `--serve` worker
+and unlinked after the reply, vs sending the upload's bytes down the
+worker's stdin. A pool of workers serves many concurrent "uploads" of the
+sample statements, uncached, as the API's parserPool does.
+
+Reports request latency, throughput, the bytes that went through files,
+and the storage writes the kernel counted for this process
+(/proc/self/io write_bytes; page-cache writeback may land later, so the
+file bytes are the surer measure).
+
+    python3 benchmarks/bench_handoff.py [--requests 40] [--clients 8] [--workers 2] [--dir uploads]
+"""
+import argparse
+import glob
+import json
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from benchmarks.bench_fields import SAMPLES_DIR  # noqa: E402
+from benchmarks.bench_worker import MAIN_PARSER, percentile  # noqa: E402
+
+# where upload.controllers.js used to write its temporary files
+UPLOADS_DIR = os.path.join(PARSER_DIR, "..", "..", "uploads")
+
+
+class Worker:
+    def __init__(self):
+        self.proc = subprocess.Popen([sys.executable, MAIN_PARSER, "--serve"], stdin=subprocess.PIPE,
+                                     stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        self.next_id = 0
+
+    def request(self, req, payload=b""):
+        self.next_id += 1
+        self.proc.stdin.write(json.dumps(dict(req, id=self.next_id, cache=False)).encode() + b"\n" + payload)
+        self.proc.stdin.flush()
+        reply = json.loads(self.proc.stdout.readline())
+        if not reply.get("ok"):
+            raise RuntimeError(reply.get("error"))
+        return reply
+
+    def close(self):
+        self.proc.stdin.close()
+        self.proc.wait()
+
+
+def storage_writes():
+    try:
+        with open("/proc/self/io") as fh:
+            return int(dict(line.split(": ") for line in fh.read().splitlines())["write_bytes"])
+    except (OSError, KeyError):
+        return None
+
+
+def run(mode, uploads, workers, clients, upload_dir):
+    """(latencies, seconds, file bytes, storage bytes) of parsing every upload once."""
+    idle = queue.Queue()
+    for _ in range(workers):
+        idle.put(Worker())
+    # one request first per worker, so imports and warm-up are not measured
+    for _ in range(workers):
+        worker = idle.get()
+        worker.request({"size": len(uploads[0][1])}, uploads[0][1])
+        idle.put(worker)
+
+    file_bytes = 0
+
+    def upload(item):
+        nonlocal file_bytes
+        name, data = item
+        started = time.perf_counter()
+        if mode == "tempfile":
+            path = os.path.join(upload_dir, f"{time.time_ns()}-{name}")
+            with open(path, "wb") as fh:
+                fh.write(data)
+            file_bytes += len(data)
+        worker = idle.get()
+        try:
+            if mode == "tempfile":
+                worker.request({"path": path})
+            else:
+                worker.request({"size": len(data), "name": name}, data)
+        finally:
+            idle.put(worker)
+            if mode == "tempfile":
+                os.unlink(path)
+        return time.perf_counter() - started
+
+    before = storage_writes()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        latencies = list(pool.map(upload, uploads))
+    elapsed = time.perf_counter() - started
+    after = storage_writes()
+    while not idle.empty():
+        idle.get().close()
+    return latencies, elapsed, file_bytes, None if before is None else after - before
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--requests", type=int, default=40)
+    ap.add_argument("--clients", type=int, default=8, help="uploads in flight at once")
+    ap.add_argument("--workers", type=int, default=2, help="parser processes")
+    ap.add_argument("--dir", default=UPLOADS_DIR, help="where the temp-file path writes its uploads")
+    args = ap.parse_args()
+
+    samples = sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf")))
+    if not samples:
+        sys.exit(f"No sample PDFs found in {SAMPLES_DIR}")
+    files = []
+    for path in samples:
+        with open(path, "rb") as fh:
+            files.append((os.path.basename(path), fh.read()))
+    uploads = [files[i % len(files)] for i in range(args.requests)]
+
+    os.makedirs(args.dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=args.dir) as upload_dir:
+        for mode in ("tempfile", "stdin"):
+            latencies, elapsed, file_bytes, storage = run(mode, uploads, args.workers, args.clients, upload_dir)
+            print(f"{mode:<9} p50={percentile(latencies, 50) * 1000:8.1f} ms  "
+                  f"p99={percentile(latencies, 99) * 1000:8.1f} ms  {len(latencies) / elapsed:6.1f} req/s  "
+                  f"files {file_bytes / 2**20:6.1f} MiB  storage writes "
+                  + ("n/a" if storage is None else f"{storage / 2**20:6.1f} MiB"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Layout extraction mode vs the text parsers on the sample statements: time to
+extract words and assemble rows (learning the column template, then reusing
+it) against extract_text() plus the bank's regex parse, and rows found.
+
+    python3 benchmarks/bench_layout.py [--repeat 3]
+"""
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+from pdfplumber import open as pdf_open
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from bank_detect import bank_detect  # noqa: E402
+from banks import load_parser  # noqa: E402
+from benchmarks.bench_fields import SAMPLES_DIR  # noqa: E402
+from layout import TemplateStore, page_rows, rows_to_table  # noqa: E402
+
+
+def best_of(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat))
+
+
+def read_pages(path, method):
+    # a fresh document each time: pdfplumber caches layout on its page objects
+    with pdf_open(path) as pdf:
+        return [getattr(page, method)() for page in pdf.pages]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf"))):
+        text = "\n".join(t or "" for t in read_pages(path, "extract_text"))
+        words = read_pages(path, "extract_words")
+        bank, _ = bank_detect(text)
+        parser = load_parser(bank)
+        if not hasattr(parser, "LAYOUT"):
+            continue
+
+        def assemble(store):
+            rows, template = [], None
+            for page_words in words:
+                found, template = page_rows(page_words, bank, parser.LAYOUT, template, store)
+                rows += found
+            return rows_to_table(rows, parser.LAYOUT)
+
+        extract_text = best_of(lambda: read_pages(path, "extract_text"), args.repeat)
+        extract_words = best_of(lambda: read_pages(path, "extract_words"), args.repeat)
+        warm = TemplateStore()
+        assemble(warm)
+        regex = best_of(lambda: parser.parse(text), args.repeat)
+        cold = best_of(lambda: assemble(TemplateStore()), args.repeat)
+        reuse = best_of(lambda: assemble(warm), args.repeat)
+        print(f"{os.path.basename(path)[:40]:<40} {bank}")
+        print(f"  text:   extract {extract_text * 1000:8.1f} ms  parse {regex * 1000:6.2f} ms"
+              f"  {len(parser.parse(text)['transactions']):3d} rows")
+        print(f"  layout: extract {extract_words * 1000:8.1f} ms  rows  {cold * 1000:6.2f} ms learning,"
+              f" {reuse * 1000:6.2f} ms reusing  {len(assemble(warm)):3d} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Peak traced memory of parsing a long statement whole vs as a stream
+(PARSER_STREAM, see main_parser.parse_statement_stream), for synthetic
+text-only PDFs of growing page count, next to what is still held after the
+whole parse (the result and warm caches). Whole, every page's text is held; streamed, the peak should
+barely move with the page count beyond the transactions themselves.
+
+tracemalloc sees Python allocations only. With pdfplumber a single page's
+layout (several MiB, the same either way) dwarfs the text of a few hundred
+pages, so pages are read with pypdfium2 by default, whose layout work stays
+in C. Rows that only the general parser's line fallback reads (--fallback)
+are held until the last page either way, since they count only if no row
+pattern reads anything.
+
+    python3 benchmarks/bench_memory.py [--pages 40 160 640] [--backend pdfplumber] [--fallback]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from benchmarks.bench_stream import synthetic_statement  # noqa: E402
+from backends import available_backends  # noqa: E402
+from main_parser import parse_statement_file  # noqa: E402
+
+LINES_PER_PAGE = 60
+
+
+def _pdf_string(line):
+    return "(" + line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def synthetic_pdf(path, lines, lines_per_page=LINES_PER_PAGE):
+    """Write `lines` as a plain A4 PDF in 9pt Helvetica, `lines_per_page` to a page."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for i in range(0, len(lines), lines_per_page):
+        shown = " T* ".join(_pdf_string(line) + " Tj" for line in lines[i:i + lines_per_page])
+        content = f"BT /F1 9 Tf 12 TL 36 806 Td {shown} ET"
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out, offsets = [b"%PDF-1.4\n"], []
+    for n, body in enumerate(objects, 1):
+        offsets.append(sum(map(len, out)))
+        out.append(f"{n} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = sum(map(len, out))
+    out.append(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    out += [f"{offset:010d} 00000 n \n".encode() for offset in offsets]
+    out.append(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    with open(path, "wb") as fh:
+        fh.writelines(out)
+
+
+def traced(path, stream):
+    """(peak bytes, bytes held after, seconds, transactions) of one uncached, single-process parse."""
+    os.environ["PARSER_STREAM"] = "1" if stream else "0"
+    tracemalloc.start()
+    started = time.perf_counter()
+    with redirect_stdout(sys.stderr):
+        result, _, _ = parse_statement_file(path, extract_workers=1, use_cache=False)
+    elapsed = time.perf_counter() - started
+    held, size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, held, elapsed, len(result["transactions"])
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--pages", type=int, nargs="+", default=[40, 160, 640])
+    ap.add_argument("--backend", default="pypdfium2" if "pypdfium2" in available_backends() else "pdfplumber")
+    ap.add_argument("--fallback", action="store_true", help="rows only the line fallback reads")
+    args = ap.parse_args()
+    os.environ["PARSER_BACKEND"] = args.backend
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            path = os.path.join(tmp, f"statement-{pages}.pdf")
+            statement = synthetic_statement(pages * LINES_PER_PAGE - 3)
+            if not args.fallback:
+                # the reference numbers' "*" keeps the row patterns from reading a row
+                statement = statement.replace("*", " ")
+            synthetic_pdf(path, statement.splitlines())
+            whole, held, whole_secs, rows = traced(path, stream=False)
+            streamed, _, streamed_secs, streamed_rows = traced(path, stream=True)
+            assert streamed_rows == rows
+            print(f"{pages:>5} pages {rows:>6} rows  after {held / 2**20:6.2f} MiB"
+                  f"  whole {whole / 2**20:7.2f} MiB peak {whole_secs:6.1f} s"
+                  f"  streamed {streamed / 2**20:7.2f} MiB peak {streamed_secs:6.1f} s")
+
+if __name__ == "__main__":
+    main()
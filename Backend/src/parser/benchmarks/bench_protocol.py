@@ -0,0 +1,70 @@
+"""
+Throughput of the output frame formats on large synthetic results: the
+streaming JSON writer, orjson and msgpack (each when installed), with
+json.dumps of the list-of-dicts result as the baseline. Encoding writes one
+framed reply as --serve would; decoding reads it back the way a client does.
+
+    python3 benchmarks/bench_protocol.py [--rows 1000 10000 100000] [--repeat 3]
+"""
+import argparse
+import io
+import json
+import os
+import struct
+import sys
+import timeit
+from contextlib import redirect_stdout
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from benchmarks.bench_stream import synthetic_statement  # noqa: E402
+from main_parser import parse_statement_text, plain_result  # noqa: E402
+from protocol import FORMATS, FrameWriter, msgpack, orjson  # noqa: E402
+
+
+def frame(result, fmt):
+    """The bytes one "result" frame of `result` takes in `fmt`."""
+    out = io.TextIOWrapper(io.BytesIO(), encoding="utf-8", write_through=True)
+    FrameWriter(out, fmt).send("result", id=1, ok=True, result=result)
+    return out.buffer.getvalue()
+
+
+def decode(data, fmt):
+    if fmt == "msgpack":
+        (length,) = struct.unpack(">I", data[:4])
+        return msgpack.unpackb(data[4:4 + length])
+    return orjson.loads(data) if fmt == "orjson" else json.loads(data)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    formats = [fmt for fmt in FORMATS if {"orjson": orjson, "msgpack": msgpack}.get(fmt, True) is not None]
+    missing = sorted(set(FORMATS) - set(formats))
+    if missing:
+        print(f"not installed, skipped: {', '.join(missing)}")
+
+    for rows in args.rows:
+        with redirect_stdout(sys.stderr):
+            result = parse_statement_text(synthetic_statement(rows), (None, 0))
+        baseline = json.dumps({"type": "result", "id": 1, "ok": True, "result": plain_result(result)})
+        base_secs = min(timeit.repeat(
+            lambda: json.dumps({"type": "result", "id": 1, "ok": True, "result": plain_result(result)}),
+            number=1, repeat=args.repeat))
+        print(f"{rows:>8} rows  {'json.dumps':<10} encode {base_secs * 1e3:8.1f} ms "
+              f"{len(baseline) / 2**20 / base_secs:7.1f} MiB/s  {len(baseline) / 2**20:6.2f} MiB")
+        for fmt in formats:
+            data = frame(result, fmt)
+            enc = min(timeit.repeat(lambda: frame(result, fmt), number=1, repeat=args.repeat))
+            dec = min(timeit.repeat(lambda: decode(data, fmt), number=1, repeat=args.repeat))
+            assert len(decode(data, fmt)["result"]["transactions"]) == rows
+            print(f"{'':>8}       {fmt:<10} encode {enc * 1e3:8.1f} ms {len(data) / 2**20 / enc:7.1f} MiB/s  "
+                  f"{len(data) / 2**20:6.2f} MiB  decode {dec * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
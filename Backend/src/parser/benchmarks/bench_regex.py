@@ -0,0 +1,129 @@
+"""
+Worst-case regex cost on adversarial and very large statements: every entry
+of every PATTERNS table and every parser's parse() over a long synthetic
+statement built from the sample pages, field labels repeated with no value
+after them, dated rows that never reach an amount, and the same rows run
+together on one line. Each input is timed at two sizes; a growth factor
+near 2 is linear, near 4 or above means the pattern backtracks.
+
+    python3 benchmarks/bench_regex.py [--pages 500] [--size 200000] [--budget 5] [--show 25]
+"""
+import argparse
+import glob
+import itertools
+import os
+import sys
+import time
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from banks import BANKS, load_general_parser, load_parser  # noqa: E402
+from benchmarks.bench_fields import SAMPLES_DIR  # noqa: E402
+from extraction import extract_pages_native  # noqa: E402
+from timeouts import ParseTimeout, time_limit  # noqa: E402
+
+# Labels the lazy "label ... value" patterns start from.
+LABELS = ("Payment Due Date", "Previous Balance", "Total Dues", "Minimum Amount Due", "Credit Limit",
+          "Opening Balance", "Total Amount Due", "Statement for period",
+          "Payment Due Date Total Dues Minimum Amount Due")
+WORDS = ("AMAZON", "PAY", "INDIA", "SWIGGY", "BANGALORE", "UPI", "REF", "RETAIL", "Store", "fuel")
+
+
+def fill(line_source, size, sep="\n"):
+    lines, total = [], 0
+    for line in line_source:
+        if total >= size:
+            break
+        lines.append(line)
+        total += len(line) + 1
+    return sep.join(lines)
+
+
+def repeated_labels(size):
+    """Every label over and over, with words but never a date or amount after it."""
+    return fill((f"{label} {' '.join(WORDS)}" for label in itertools.cycle(LABELS)), size)
+
+
+def undated_rows(size):
+    """Rows that open like a transaction (date, serial) but never reach an amount."""
+    return fill((f"12/05/2024 {i:09d} {' '.join(WORDS * 3)}" for i in itertools.count()), size)
+
+
+def one_line(size):
+    return fill((f"12/05/2024 {i:09d} {' '.join(WORDS * 3)}" for i in itertools.count()), size, sep=" ")
+
+
+def synthetic_statement(pages, sample_pages):
+    """`pages` pages cycled from the sample statements."""
+    return "\n".join(itertools.islice(itertools.cycle(sample_pages), pages))
+
+
+def timed(fn, budget):
+    """Seconds `fn` took, or None if it ran past `budget`."""
+    start = time.perf_counter()
+    try:
+        with time_limit(budget):
+            fn()
+    except ParseTimeout:
+        return None
+    return time.perf_counter() - start
+
+
+def targets():
+    """(name, fn(text)) for every PATTERNS entry and parse() of every parser."""
+    general = load_general_parser()
+    modules = [("general", general)] + [(bank, load_parser(bank)) for bank in BANKS]
+    for prefix, module in modules:
+        yield f"{prefix}:parse", module.parse
+        for name, pats in module.PATTERNS.items():
+            pats = pats if isinstance(pats, list) else [pats]
+            yield f"{prefix}:re:{name}", lambda text, pats=pats: [p.findall(text) for p in pats]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--pages", type=int, default=500, help="pages in the synthetic statement")
+    ap.add_argument("--size", type=int, default=200_000, help="characters in each adversarial input")
+    ap.add_argument("--budget", type=float, default=5.0, help="seconds before a run counts as runaway")
+    ap.add_argument("--show", type=int, default=25, help="slowest targets to list")
+    args = ap.parse_args()
+
+    sample_pages = [page for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf")))
+                    for page in extract_pages_native(path, workers=1)]
+    inputs = {
+        "statement": lambda scale: synthetic_statement(args.pages * scale, sample_pages),
+        "labels": lambda scale: repeated_labels(args.size * scale),
+        "undated_rows": lambda scale: undated_rows(args.size * scale),
+        "one_line": lambda scale: one_line(args.size * scale),
+    }
+    texts = {name: (make(1), make(2)) for name, make in inputs.items()}
+    print(" ".join(f"{name}={len(small) / 1e6:.2f}MB" for name, (small, _) in texts.items()))
+
+    worst = []  # (seconds, name, input, growth)
+    runaway = []
+    for name, fn in targets():
+        slowest = (0.0, None, None)
+        for input_name, (small, large) in texts.items():
+            t1 = timed(lambda: fn(small), args.budget)
+            t2 = timed(lambda: fn(large), args.budget) if t1 is not None else None
+            if t2 is None:
+                runaway.append(f"{name} on {input_name}")
+                slowest = (float("inf"), input_name, None)
+                break
+            if t2 > slowest[0]:
+                slowest = (t2, input_name, t2 / t1 if t1 > 1e-4 else None)
+        worst.append((slowest[0], name) + slowest[1:])
+
+    worst.sort(reverse=True)
+    print(f"{'target':<44} {'worst':>10}  {'input':<13} growth x2")
+    for secs, name, input_name, growth in worst[:args.show]:
+        shown = "runaway" if secs == float("inf") else f"{secs * 1e3:8.1f}ms"
+        print(f"{name:<44} {shown:>10}  {input_name:<13} {'' if growth is None else f'x{growth:.1f}'}")
+    if runaway:
+        print(f"{len(runaway)} target(s) exceeded {args.budget:g}s: {', '.join(runaway)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Full-page vs region-cropped extraction of each sample statement's first
+page, with the bank's own backend: CPU time to read the page, text kept,
+and whether the parse still agrees with the full-page one. Cropping saves
+the layout of what it drops, not the PDF content stream's interpretation.
+
+    python3 benchmarks/bench_regions.py [--repeat 5]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import timeit
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from backends import open_pdf  # noqa: E402
+from benchmarks.bench_backends import agreement  # noqa: E402
+from benchmarks.bench_fields import SAMPLES_DIR  # noqa: E402
+from extraction import extract_pages_native, join_pages  # noqa: E402
+from main_parser import _page_plan, parse_statement_text, plain_result  # noqa: E402
+
+
+def best_of(fn, repeat):
+    return min(timeit.repeat(fn, number=1, repeat=repeat, timer=time.process_time))
+
+
+def first_page(path, backend, regions):
+    # a fresh document each time: pdfplumber caches layout on its page objects
+    with open_pdf(path, backend) as pdf:
+        return pdf.text(0, regions)
+
+
+def parse(path, backend, regions):
+    pages = extract_pages_native(path, workers=1, backend=backend, regions=regions)
+    return plain_result(parse_statement_text(join_pages(pages)))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf"))):
+        (bank, _), _, (backend, regions) = _page_plan(lambda i: first_page(path, None, None), 1)
+        if not regions:
+            continue
+        full = best_of(lambda: first_page(path, backend, None), args.repeat)
+        cropped = best_of(lambda: first_page(path, backend, regions), args.repeat)
+        kept = len(first_page(path, backend, regions)) / max(1, len(first_page(path, backend, None)))
+        same, fields, found, rows = agreement(parse(path, backend, regions), parse(path, backend, None))
+        print(f"{os.path.basename(path)[:40]:<40} {bank:<6} {backend:<10}"
+              f"  full {full * 1000:7.1f} ms  cropped {cropped * 1000:7.1f} ms  ({full / cropped:4.2f}x)"
+              f"  text kept {kept:4.0%}  fields {same}/{fields}  transactions {found}/{rows}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+General parser over the sample statements with one shared Document vs a
+fresh one per extractor (what re-searching the text in every extractor
+used to cost).
+
+    python3 benchmarks/bench_sections.py [--repeat 20]
+"""
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from banks import load_general_parser  # noqa: E402
+from banks.document import Document  # noqa: E402
+from benchmarks.bench_fields import GENERAL_FIELDS, SAMPLES_DIR  # noqa: E402
+from extraction import extract_text_native  # noqa: E402
+
+general = load_general_parser()
+
+
+def per_extractor_parse(text):
+    """Every extractor builds its own index, as if each searched the text itself."""
+    return [getattr(general, f"extract_{field}")(Document(text)) for field in GENERAL_FIELDS]
+
+
+def shared_parse(text):
+    doc = Document(text)
+    return [getattr(general, f"extract_{field}")(doc) for field in GENERAL_FIELDS]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    texts = {os.path.basename(p): extract_text_native(p, workers=1)
+             for p in sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf")))}
+    texts["all samples joined"] = "\n".join(texts.values())
+    for label, text in texts.items():
+        assert per_extractor_parse(text)[:-1] == shared_parse(text)[:-1]
+        per = min(timeit.repeat(lambda: per_extractor_parse(text), number=1, repeat=args.repeat))
+        shared = min(timeit.repeat(lambda: shared_parse(text), number=1, repeat=args.repeat))
+        print(f"{label[:40]:<40} {len(text):>7} chars  per-extractor {per * 1000:7.2f} ms"
+              f"  shared {shared * 1000:7.2f} ms  ({per / shared:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
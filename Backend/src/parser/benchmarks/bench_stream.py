@@ -0,0 +1,59 @@
+"""
+Peak memory of writing a parsed statement with the streaming JSON writer vs
+json.dumps of the list-of-dicts result, for synthetic statements of growing
+length.
+
+    python3 benchmarks/bench_stream.py [--rows 1000 10000 100000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tracemalloc
+from contextlib import redirect_stdout
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from benchmarks.bench_categorize import synthetic_descriptions  # noqa: E402
+from main_parser import parse_statement_text, plain_result  # noqa: E402
+from protocol import write_json  # noqa: E402
+
+
+def synthetic_statement(rows, seed=5):
+    """A general-parser statement with `rows` transaction lines."""
+    rng = random.Random(seed)
+    lines = ["Statement Date: 15/05/2021", "Card No: 5334 67XX XXXX 1060", "TRANSACTION DETAILS"]
+    for desc in synthetic_descriptions(rows, 2000, seed):
+        lines.append(f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2021 {desc} "
+                     f"{rng.randint(1, 99999):,}.{rng.randint(0, 99):02d} {rng.choice(('Dr', 'Cr'))}")
+    return "\n".join(lines)
+
+
+def peak(fn):
+    tracemalloc.start()
+    fn()
+    size = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return size
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = ap.parse_args()
+
+    with open(os.devnull, "w") as sink:
+        for rows in args.rows:
+            with redirect_stdout(sys.stderr):
+                result = parse_statement_text(synthetic_statement(rows), (None, 0))
+            assert len(result["transactions"]) == rows
+            streamed = peak(lambda: write_json(result, sink))
+            dumped = peak(lambda: sink.write(json.dumps(plain_result(result))))
+            print(f"{rows:>8} rows  streaming {streamed / 2**20:7.2f} MiB peak"
+                  f"  json.dumps {dumped / 2**20:7.2f} MiB peak")
+
+
+if __name__ == "__main__":
+    main()
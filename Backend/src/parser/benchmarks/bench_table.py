@@ -0,0 +1,68 @@
+"""
+Memory and category-total time of TransactionTable vs the list-of-dicts
+form for a synthetic multi-year archive.
+
+    python3 benchmarks/bench_table.py [--rows 200000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PARSER_DIR)
+
+from banks.money import format_paise  # noqa: E402
+from banks.table import TransactionTable  # noqa: E402
+from benchmarks.bench_categorize import synthetic_descriptions  # noqa: E402
+from main_parser import MERCHANTS, categorize_transactions  # noqa: E402
+
+
+def synthetic_rows(rows, seed=11):
+    rng = random.Random(seed)
+    descs = synthetic_descriptions(rows, 3000, seed)
+    for desc in descs:
+        day = f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/{rng.randint(2019, 2024)}"
+        yield day, desc, rng.randint(1, 5_000_000), rng.choice(("DR", "DR", "DR", "CR"))
+
+
+def measure(build):
+    tracemalloc.start()
+    data = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return data, size
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, default=200_000)
+    args = ap.parse_args()
+    rows = list(synthetic_rows(args.rows))
+
+    def build_dicts():
+        return [{"date": d, "description": desc, "amount": format_paise(p), "type": t}
+                for d, desc, p, t in rows]
+
+    def build_table():
+        table = TransactionTable(layout=("date", "description", "amount", "type"))
+        for row in rows:
+            table.append(*row)
+        return table
+
+    dicts, dict_bytes = measure(build_dicts)
+    table, table_bytes = measure(build_table)
+    assert table.to_records() == dicts
+
+    for label, data, size in (("list of dicts", dicts, dict_bytes), ("columnar", table, table_bytes)):
+        MERCHANTS.entries.clear()  # same cold start for both
+        start = time.perf_counter()
+        categorize_transactions(data)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<14} {size / 2**20:8.1f} MiB  categorize {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Cold-spawn vs warm-worker latency on the sample statements.
+
+Cold: one `python3 main_parser.py <pdf>` process per statement (the old
+upload path). Warm: a single `main_parser.py --serve` process answering
+NDJSON requests.
+
+    python3 benchmarks/bench_worker.py [--rounds 5]
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import time
+
+PARSER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.abspath(os.path.join(PARSER_DIR, "..", "..", ".."))
+SAMPLES_DIR = os.path.join(REPO_ROOT, "real bank statements for testing")
+MAIN_PARSER = os.path.join(PARSER_DIR, "main_parser.py")
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def bench_cold(pdfs, rounds):
+    timings = []
+    for _ in range(rounds):
+        for pdf in pdfs:
+            start = time.perf_counter()
+            subprocess.run([sys.executable, MAIN_PARSER, pdf], capture_output=True, check=True)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench_warm(pdfs, rounds):
+    proc = subprocess.Popen(
+        [sys.executable, MAIN_PARSER, "--serve"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    timings = []
+    try:
+        req_id = 0
+        for _ in range(rounds):
+            for pdf in pdfs:
+                req_id += 1
+                start = time.perf_counter()
+                proc.stdin.write(json.dumps({"id": req_id, "path": pdf}) + "\n")
+                proc.stdin.flush()
+                reply = json.loads(proc.stdout.readline())
+                timings.append(time.perf_counter() - start)
+                if not reply.get("ok"):
+                    raise RuntimeError(f"{pdf}: {reply.get('error')}")
+    finally:
+        proc.stdin.close()
+        proc.wait()
+    return timings
+
+
+def report(label, timings):
+    print(f"{label:<6} n={len(timings):<4} "
+          f"p50={percentile(timings, 50) * 1000:8.1f} ms  "
+          f"p99={percentile(timings, 99) * 1000:8.1f} ms  "
+          f"mean={sum(timings) / len(timings) * 1000:8.1f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    pdfs = sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf")))
+    if not pdfs:
+        sys.exit(f"No sample PDFs found in {SAMPLES_DIR}")
+
+    report("cold", bench_cold(pdfs, args.rounds))
+    report("warm", bench_warm(pdfs, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
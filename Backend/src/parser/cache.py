@@ -0,0 +1,182 @@
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from functools import lru_cache
+
+from backends import default_backend, regions_enabled
+from extraction import stream_enabled
+
+PARSER_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIR = os.path.join(PARSER_DIR, "..", "..", ".cache")
+
+MAX_BYTES = int(os.environ.get("PARSER_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+TEXT_MAX_BYTES = int(os.environ.get("PARSER_TEXT_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+MAX_AGE = float(os.environ.get("PARSER_CACHE_MAX_AGE_DAYS", "30")) * 86400
+
+
+def cache_enabled():
+    return os.environ.get("PARSER_CACHE", "1").lower() not in ("0", "false", "off", "no")
+
+
+@lru_cache(maxsize=None)
+def parser_fingerprint():
+    """Hash of every source file that shapes a parse result."""
+    sources = sorted(glob.glob(os.path.join(PARSER_DIR, "banks", "*.py")))
+    sources += [os.path.join(PARSER_DIR, name)
+                for name in ("main_parser.py", "bank_detect.py", "extraction.py", "backends.py",
+                             "categorize.py", "layout.py")]
+    h = hashlib.sha256()
+    for path in sources:
+        h.update(os.path.basename(path).encode())
+        with open(path, "rb") as fh:
+            h.update(fh.read())
+    return h.hexdigest()[:16]
+
+
+def file_digest(pdf_path):
+    """SHA-256 of a PDF, given as a path or as its bytes."""
+    if isinstance(pdf_path, bytes):
+        return hashlib.sha256(pdf_path).hexdigest()
+    h = hashlib.sha256()
+    with open(pdf_path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def result_key(digest, layout=False):
+    """
+    Parse results go stale whenever a parser source or how pages are read
+    changes; the entry's "reading" is checked against its bank's backend.
+    """
+    return (f"{digest}:{parser_fingerprint()}:{default_backend()}" + ("" if regions_enabled() else ":full")
+            + (":stream" if stream_enabled() else "") + (":layout" if layout else ""))
+
+
+def text_key(digest):
+    """
+    Extracted text only depends on the PDF and how it was read; the entry
+    records the backend (and its version) under "backend", the first page's
+    "regions", and the "detection" (bank, confidence) they were read for.
+    """
+    return f"{digest}:text"
+
+
+def digest_of(key):
+    return key.split(":", 1)[0]
+
+
+class DiskCache:
+    """
+    On-disk key/value store of JSON values. Entries are zlib-compressed JSON
+    in SQLite; the least recently used ones are evicted once the store
+    exceeds `max_bytes`, and anything older than `max_age` seconds is dropped.
+    """
+
+    def __init__(self, name, path=None, max_bytes=MAX_BYTES, max_age=MAX_AGE):
+        if path is None:
+            cache_dir = os.environ.get("PARSER_CACHE_DIR", DEFAULT_CACHE_DIR)
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, f"{name}.sqlite3")
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = self.misses = self.stores = self.evictions = 0
+
+        # several warm workers / batch processes share one file
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, payload BLOB NOT NULL, size INTEGER NOT NULL,"
+            " created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed)")
+
+    def get(self, key):
+        """Return the cached value or None. A broken store counts as a miss."""
+        now = time.time()
+        try:
+            row = self.db.execute(
+                "SELECT payload, created FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[1] <= self.max_age:
+                self.db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                return json.loads(zlib.decompress(row[0]))
+        except (sqlite3.Error, zlib.error, ValueError):
+            pass
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        payload = zlib.compress(json.dumps(value, separators=(",", ":")).encode(), 6)
+        now = time.time()
+        try:
+            self.db.execute(
+                "INSERT OR REPLACE INTO entries (key, payload, size, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now, now),
+            )
+            self.stores += 1
+            self.evict()
+        except sqlite3.Error:
+            # caching is best-effort; a locked or full disk must not fail the parse
+            pass
+
+    def evict(self):
+        cur = self.db.execute("DELETE FROM entries WHERE created < ?", (time.time() - self.max_age,))
+        self.evictions += cur.rowcount
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.db.execute(
+            "SELECT key, size FROM entries ORDER BY accessed ASC"
+        ).fetchall():
+            self.db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def keys(self):
+        return [row[0] for row in self.db.execute("SELECT key FROM entries ORDER BY created")]
+
+    def stats(self):
+        entries, size = self.db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+
+_caches = {}
+
+
+def result_cache():
+    """Process-wide store of parse results, opened on first use."""
+    if "results" not in _caches:
+        _caches["results"] = DiskCache("results")
+    return _caches["results"]
+
+
+def text_cache():
+    """
+    Process-wide store of extracted page texts. Kept apart from the results
+    so a parser change only invalidates the cheap regex stage.
+    """
+    if "texts" not in _caches:
+        _caches["texts"] = DiskCache("texts", max_bytes=TEXT_MAX_BYTES)
+    return _caches["texts"]
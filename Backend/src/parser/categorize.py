@@ -0,0 +1,188 @@
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+
+
+def normalize_description(desc):
+    """Lower-case and collapse punctuation to spaces, as the keyword rules expect."""
+    return _NON_ALNUM.sub(" ", desc.lower())
+
+
+class Categorizer:
+    """
+    Keyword categorizer: a description belongs to the first rule with a
+    keyword in it, found in one Aho-Corasick scan, else to `default`.
+    """
+
+    def __init__(self, rules, default="Other", normalize=normalize_description):
+        self.rules = tuple((category, tuple(keywords)) for category, keywords in rules)
+        self.default = default
+        self.normalize = normalize
+        self._categories = [category for category, _ in self.rules] + [default]
+        self._build()
+
+    def _build(self):
+        no_match = len(self.rules)
+        goto = [{}]
+        out = [no_match]
+        for priority, (_, keywords) in enumerate(self.rules):
+            for word in keywords:
+                state = 0
+                for ch in word:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto.append({})
+                        out.append(no_match)
+                        goto[state][ch] = nxt
+                    state = nxt
+                out[state] = min(out[state], priority)
+
+        # breadth-first: fail links, then a full transition table so scanning
+        # never has to walk fail links. Characters outside the keyword alphabet
+        # are simply missing and send the scan back to the root.
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = list(goto[0].values())
+        for state in queue:
+            out[state] = min(out[state], out[fail[state]])
+            row = dict(delta[fail[state]]) if state else {}
+            for ch, nxt in goto[state].items():
+                if state:
+                    fail[nxt] = delta[fail[state]].get(ch, 0)
+                row[ch] = nxt
+                queue.append(nxt)
+            delta[state] = row
+        self._delta = delta
+        self._out = out
+
+    def priority(self, desc):
+        """Index of the first matching rule, or len(rules) for no match."""
+        delta, out = self._delta, self._out
+        best = len(self.rules)
+        state = 0
+        for ch in self.normalize(desc) if self.normalize else desc:
+            state = delta[state].get(ch, 0)
+            if out[state] < best:
+                best = out[state]
+                if best == 0:
+                    break
+        return best
+
+    def classify(self, desc):
+        return self._categories[self.priority(desc)]
+
+    def classify_many(self, descriptions):
+        """Categories for a batch of descriptions; repeated ones are scanned once."""
+        seen = {}
+        result = []
+        for desc in descriptions:
+            category = seen.get(desc)
+            if category is None:
+                category = seen[desc] = self.classify(desc)
+            result.append(category)
+        return result
+
+
+def _key_char(ch):
+    if ch.isdigit():
+        return "0"
+    return ch.lower() if ch.isalpha() or ch == " " else "_"
+
+
+# ASCII translation for merchant keys: letters lower-cased, digits -> "0",
+# other punctuation -> "_". Non-ASCII characters are kept as they are.
+_KEY_CHARS = str.maketrans({chr(c): _key_char(chr(c)) for c in range(128)})
+_ZERO_RUNS = re.compile(r"0{2,}")
+
+# Trailing location tokens card networks append to merchant names (single words).
+CITY_SUFFIXES = (
+    "in", "ind", "india", "mumbai", "bombay", "delhi", "gurgaon", "gurugram",
+    "noida", "bangalore", "bengaluru", "pune", "chennai", "hyderabad", "kolkata",
+    "ahmedabad", "jaipur", "lucknow", "chandigarh", "kochi", "indore", "thane",
+)
+
+
+class MerchantCache:
+    """
+    Bounded LRU of merchant key -> category in front of a Categorizer; the
+    key folds digits, punctuation and trailing city names out of a description.
+    """
+
+    def __init__(self, categorizer, max_entries=4096, suffixes=CITY_SUFFIXES):
+        self.categorizer = categorizer
+        self.max_entries = max_entries
+        keywords = [w for _, words in categorizer.rules for w in words]
+        self.suffixes = frozenset(s for s in suffixes if self._droppable(s, keywords))
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    @staticmethod
+    def _droppable(suffix, keywords):
+        # the suffix can't hide a keyword, nor complete one that starts before it
+        return not any(k in suffix or any(" " + suffix[:i] in k for i in range(1, len(suffix) + 1))
+                       for k in keywords)
+
+    def fingerprint(self):
+        spec = repr((self.categorizer.rules, self.categorizer.default, sorted(self.suffixes)))
+        return hashlib.sha256(spec.encode()).hexdigest()[:16]
+
+    def key(self, desc):
+        key = _ZERO_RUNS.sub("0", desc.translate(_KEY_CHARS).strip())
+        while True:
+            head, _, last = key.rpartition(" ")
+            if not head or last not in self.suffixes:
+                return key
+            key = head.rstrip()
+
+    def classify(self, desc):
+        key = self.key(desc)
+        entries = self.entries
+        category = entries.get(key)
+        if category is not None:
+            entries.move_to_end(key)
+            self.hits += 1
+            return category
+        self.misses += 1
+        category = entries[key] = self.categorizer.classify(desc)
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return category
+
+    def classify_many(self, descriptions):
+        return [self.classify(desc) for desc in descriptions]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+        }
+
+    def save(self, path):
+        """Write the entries (oldest first) to `path`, replacing it atomically."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"fingerprint": self.fingerprint(), "entries": list(self.entries.items())}, fh)
+        os.replace(tmp, path)
+
+    def load(self, path):
+        """Restore a snapshot; one written for other rules is ignored. Returns entries loaded."""
+        try:
+            with open(path, encoding="utf-8") as fh:
+                snapshot = json.load(fh)
+        except (OSError, ValueError):
+            return 0
+        if snapshot.get("fingerprint") != self.fingerprint():
+            return 0
+        for key, category in snapshot["entries"][-self.max_entries:]:
+            self.entries[key] = category
+        return len(self.entries)
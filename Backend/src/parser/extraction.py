@@ -0,0 +1,249 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from backends import default_backend, detect_backend, open_pdf
+from timeouts import time_limit
+
+# Below this many pages the cost of forking workers and re-opening the PDF
+# outweighs the layout work saved, so extraction stays serial.
+PARALLEL_MIN_PAGES = int(os.environ.get("PARSER_PARALLEL_MIN_PAGES", "8"))
+
+# Pages bank detection reads at least, before it may stop at a clear lead.
+DETECT_PAGES = int(os.environ.get("PARSER_DETECT_PAGES", "1"))
+
+# Pages a streamed parse keeps for the summary fields, and the characters
+# it keeps at least: the furthest the general parser's fields search.
+STREAM_HEAD_PAGES = int(os.environ.get("PARSER_STREAM_HEAD_PAGES", "2"))
+STREAM_HEAD_CHARS = int(os.environ.get("PARSER_STREAM_HEAD_CHARS", "5000"))
+
+
+def stream_enabled():
+    return os.environ.get("PARSER_STREAM", "0").lower() in ("1", "true", "on", "yes")
+
+
+def default_workers():
+    env = os.environ.get("PARSER_EXTRACT_WORKERS")
+    if env:
+        return max(1, int(env))
+    return min(4, os.cpu_count() or 1)
+
+
+def _page_text(pdf, index, regions):
+    # regions describe the first page; tables continue on the others from the top
+    return pdf.text(index, regions if index == 0 else None)
+
+
+def _extract_page_range(pdf_path, start, stop, backend, regions):
+    # the parent's time limit does not reach into the pool, and leaving the
+    # pool waits for every range; so each worker gives up on its own
+    with time_limit(), open_pdf(pdf_path, backend) as pdf:
+        return [_page_text(pdf, i, regions) for i in range(start, stop)]
+
+
+def _page_ranges(start, n_pages, n_chunks):
+    size, extra = divmod(n_pages - start, n_chunks)
+    ranges = []
+    for i in range(n_chunks):
+        stop = start + size + (1 if i < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def extract_pages_native(pdf_path, workers=None, min_pages=None, start=0, backend=None, regions=None):
+    """
+    Text of every page from `start` on; long documents are split into page
+    ranges extracted by separate processes. Only `regions` of the first page
+    are read when given.
+    """
+    workers = default_workers() if workers is None else max(1, workers)
+    min_pages = PARALLEL_MIN_PAGES if min_pages is None else min_pages
+    backend = backend or default_backend()
+
+    with open_pdf(pdf_path, backend) as pdf:
+        n_pages = len(pdf)
+        if workers == 1 or n_pages - start < max(min_pages, 2):
+            return [_page_text(pdf, i, regions) for i in range(start, n_pages)]
+
+    ranges = _page_ranges(start, n_pages, min(workers, n_pages - start))
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        chunks = pool.map(_extract_page_range, [pdf_path] * len(ranges),
+                          [r[0] for r in ranges], [r[1] for r in ranges],
+                          [backend] * len(ranges), [regions] * len(ranges))
+        return [text for chunk in chunks for text in chunk]
+
+
+def _plan_satisfied(plan, page_text, seen_start):
+    """
+    Check one page against a parser's PAGE_PLAN. Returns (seen_start, done):
+    the plan is done on the first page where a stop marker appears at or
+    after the start marker.
+    """
+    upper = page_text.upper()
+    pos = 0
+    if not seen_start:
+        pos = upper.find(plan["start"])
+        if pos == -1:
+            return False, False
+    return True, any(upper.find(m, pos) != -1 for m in plan["stop"])
+
+
+def iter_pages(pdf_path, backend=None, regions=None):
+    """
+    Yield the text of every page, keeping nothing of a page once its text is
+    taken. Close the generator when stopping early.
+    """
+    with open_pdf(pdf_path, backend) as pdf:
+        for i in range(len(pdf)):
+            yield _page_text(pdf, i, regions)
+
+
+def stream_head(pages):
+    """The leading page texts a streamed parse keeps, taken from the iterator `pages`."""
+    head = list(islice(pages, STREAM_HEAD_PAGES))
+    size = sum(map(len, head))
+    while size < STREAM_HEAD_CHARS:
+        text = next(pages, None)
+        if text is None:
+            break
+        head.append(text)
+        size += len(text) + 1
+    return head
+
+
+def until_planned(pages, plan):
+    """`pages` up to the one that satisfies a parser's PAGE_PLAN; the rest are not read."""
+    seen_start = not plan.get("start")
+    for text in pages:
+        yield text
+        seen_start, done = _plan_satisfied(plan, text, seen_start)
+        if done:
+            return
+
+
+class _PageSource:
+    """
+    Page texts of one PDF, seeded with an already-extracted prefix and read
+    as `reading` (backend, regions) says; the PDF is opened only when a page
+    beyond the prefix is needed.
+    """
+
+    def __init__(self, pdf_path, known_pages=None, n_pages=None, reading=None):
+        self.pdf_path = pdf_path
+        self.texts = list(known_pages or [])
+        self.n_pages = len(self.texts) if pdf_path is None else n_pages
+        self.reading = reading or (default_backend(), None)
+        self.pdf = None
+        self.pool = None
+        # pages extracted here, including any use() drops
+        self.reads = 0
+
+    def _open(self):
+        if self.pdf is None:
+            self.pdf = open_pdf(self.pdf_path, self.reading[0])
+            self.n_pages = len(self.pdf)
+        return self.pdf
+
+    def use(self, reading):
+        """Read pages as `reading` says from now on, dropping what was read otherwise."""
+        if reading is None or reading == self.reading or self.pdf_path is None:
+            return
+        self.close()
+        self.reading = reading
+        self.texts = []
+
+    def __len__(self):
+        if self.n_pages is None:
+            self._open()
+        return self.n_pages
+
+    def read_through(self, index):
+        while len(self.texts) <= index:
+            self.texts.append(_page_text(self._open(), len(self.texts), self.reading[1]))
+            self.reads += 1
+
+    def read_chunk(self, workers):
+        """
+        Read the next PARALLEL_MIN_PAGES pages split across `workers`
+        processes, kept for the chunks after it, if that many are left;
+        otherwise just the next page.
+        """
+        start = len(self.texts)
+        stop = min(len(self), start + max(PARALLEL_MIN_PAGES, 2))
+        if workers == 1 or stop - start < max(PARALLEL_MIN_PAGES, 2):
+            self.read_through(start)
+            return
+        if self.pool is None:
+            self.pool = ProcessPoolExecutor(max_workers=workers)
+        backend, regions = self.reading
+        ranges = _page_ranges(start, stop, min(workers, stop - start))
+        for chunk in self.pool.map(_extract_page_range, [self.pdf_path] * len(ranges),
+                                   [r[0] for r in ranges], [r[1] for r in ranges],
+                                   [backend] * len(ranges), [regions] * len(ranges)):
+            self.texts += chunk
+            self.reads += len(chunk)
+
+    def text(self, index):
+        self.read_through(index)
+        return self.texts[index]
+
+    def close(self):
+        if self.pdf is not None:
+            self.pdf.close()
+            self.pdf = None
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+
+def extract_pages_planned(pdf_path, plan_for, workers=None, known_pages=None, n_pages=None, known_reading=None):
+    """
+    Extract the pages a bank's PAGE_PLAN needs. `plan_for(page_text, n_pages)`
+    detects the bank from whole pages and returns (key, plan, reading), the
+    (backend, regions) its pages are read with. `known_pages`, read as
+    `known_reading` says, seed the leading pages; with `pdf_path=None` they
+    are all there is. Returns (page_texts, key, n_pages, reading, pages_read).
+    """
+    src = _PageSource(pdf_path, known_pages, n_pages, known_reading if known_pages else (detect_backend(), None))
+    try:
+        total = len(src)
+        key, plan, reading = plan_for(src.text, total)
+        src.use(reading)
+
+        if plan is not None:
+            # long statements are read a chunk of pages at a time in parallel,
+            # checking the plan after each chunk
+            workers = default_workers() if workers is None else max(1, workers)
+            seen_start = not plan.get("start")
+            last = total - 1
+            for i in range(total):
+                if i >= len(src.texts):
+                    src.read_chunk(workers)
+                seen_start, done = _plan_satisfied(plan, src.texts[i], seen_start)
+                if done:
+                    last = i
+                    break
+            return src.texts[:last + 1], key, total, src.reading, src.reads
+
+        if len(src.texts) < total:
+            # the rest may be long enough for the page-parallel path
+            src.close()
+            backend, regions = src.reading
+            rest = extract_pages_native(pdf_path, workers=workers, start=len(src.texts),
+                                        backend=backend, regions=regions)
+            src.texts += rest
+            src.reads += len(rest)
+        return src.texts[:total], key, total, src.reading, src.reads
+    finally:
+        src.close()
+
+
+def join_pages(text_pages):
+    text = "\n".join(text_pages)
+    if not text.strip():
+        raise ValueError("No text extracted from PDF. Ensure it's not a scanned image.")
+    return text
+
+
+def extract_text_native(pdf_path, workers=None, backend=None):
+    return join_pages(extract_pages_native(pdf_path, workers=workers, backend=backend))
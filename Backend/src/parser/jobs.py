@@ -0,0 +1,144 @@
+"""
+File-spool job queue, for parser workers that run apart from the API
+(PARSER_QUEUE_WORKERS=0). Jobs move by atomic renames, so workers sharing
+the directory never claim the same job or read a partial file:
+
+    incoming/<id>.pdf   queued
+    working/<id>.pdf    claimed by a worker
+    done/<id>.json      a "result" frame (see protocol.py)
+    failed/<id>.json    an "error" frame
+
+A job left in working/ past STALE_AFTER is failed, not retried.
+"""
+import logging
+import os
+import shutil
+import sys
+import time
+import uuid
+from contextlib import redirect_stdout
+
+from main_parser import parse_credit_card_statement
+from protocol import write_json
+from timeouts import DEFAULT_TIMEOUT, time_limit
+
+PARSER_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SPOOL_DIR = os.path.join(PARSER_DIR, "..", "..", ".spool")
+
+POLL_SECONDS = float(os.environ.get("PARSER_QUEUE_POLL", "0.5"))
+# A live worker gives up on a job after PARSER_TIMEOUT, so anything claimed
+# well before that is orphaned.
+STALE_AFTER = DEFAULT_TIMEOUT * 2 + 60 if DEFAULT_TIMEOUT else None
+
+# Spool directory of each state, and the name a client sees for it.
+STATES = {"incoming": "queued", "working": "running", "done": "done", "failed": "failed"}
+
+log = logging.getLogger("parser.jobs")
+
+
+def spool_dir():
+    return os.environ.get("PARSER_SPOOL_DIR") or DEFAULT_SPOOL_DIR
+
+
+class JobSpool:
+    """One spool directory: submit(), claim() and finish() move jobs through it."""
+
+    def __init__(self, root=None):
+        self.root = root or spool_dir()
+        for state in STATES:
+            os.makedirs(os.path.join(self.root, state), exist_ok=True)
+
+    def path(self, state, job_id):
+        ext = ".json" if state in ("done", "failed") else ".pdf"
+        return os.path.join(self.root, state, job_id + ext)
+
+    def _publish(self, state, job_id, write, binary=False):
+        """Write a file under a dot-name with `write(fh)`, then rename it into place."""
+        tmp = os.path.join(self.root, state, f".{job_id}.{os.getpid()}.tmp")
+        with (open(tmp, "wb") if binary else open(tmp, "w", encoding="utf-8")) as fh:
+            write(fh)
+        os.replace(tmp, self.path(state, job_id))
+
+    def submit(self, pdf_path, job_id=None):
+        """Queue a copy of `pdf_path`; returns the job id."""
+        job_id = job_id or uuid.uuid4().hex
+        with open(pdf_path, "rb") as src:
+            self._publish("incoming", job_id, lambda fh: shutil.copyfileobj(src, fh), binary=True)
+        return job_id
+
+    def status(self, job_id):
+        """State of a job: queued, running, done or failed; None if it is unknown."""
+        for state in ("done", "failed", "working", "incoming"):
+            if os.path.exists(self.path(state, job_id)):
+                return STATES[state]
+        return None
+
+    def _jobs(self, state):
+        """(mtime, job id) of the jobs in `state`, oldest first."""
+        jobs = []
+        with os.scandir(os.path.join(self.root, state)) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.name.endswith(".pdf"):
+                    continue
+                try:
+                    jobs.append((entry.stat().st_mtime, entry.name[:-4]))
+                except FileNotFoundError:  # claimed meanwhile
+                    pass
+        return sorted(jobs)
+
+    def claim(self):
+        """Move the oldest queued job to working/ and return its id; None if there is none."""
+        for _, job_id in self._jobs("incoming"):
+            try:
+                os.rename(self.path("incoming", job_id), self.path("working", job_id))
+            except FileNotFoundError:
+                continue  # another worker got there first
+            # the claim time, for fail_stale()
+            os.utime(self.path("working", job_id))
+            return job_id
+        return None
+
+    def finish(self, job_id, msg_type, **fields):
+        """Publish the job's frame to done/ or failed/ and drop its PDF."""
+        state = "done" if msg_type == "result" else "failed"
+        message = {"type": msg_type, "id": job_id, **fields}
+        self._publish(state, job_id, lambda fh: write_json(message, fh))
+        try:
+            os.remove(self.path("working", job_id))
+        except FileNotFoundError:
+            pass
+
+    def fail_stale(self, max_age=STALE_AFTER):
+        if max_age is None:
+            return
+        cutoff = time.time() - max_age
+        for claimed, job_id in self._jobs("working"):
+            if claimed < cutoff:
+                log.warning("job %s was abandoned by its worker", job_id)
+                self.finish(job_id, "error", ok=False, error="The parser worker stopped while parsing this statement.")
+
+
+def run_worker(spool=None, poll=POLL_SECONDS, once=False, use_cache=None):
+    """
+    Take jobs from the spool until interrupted (or, with `once`, until it
+    is empty), publishing a result or error frame for each.
+    """
+    spool = spool or JobSpool()
+    while True:
+        spool.fail_stale()
+        job_id = spool.claim()
+        if job_id is None:
+            if once:
+                return
+            time.sleep(poll)
+            continue
+        start = time.perf_counter()
+        try:
+            # stray prints stay out of the way; a runaway job is abandoned
+            with redirect_stdout(sys.stderr), time_limit():
+                result = parse_credit_card_statement(spool.path("working", job_id), use_cache=use_cache)
+            spool.finish(job_id, "result", ok=True, result=result)
+            log.info("job %s parsed in %.2fs", job_id, time.perf_counter() - start)
+        except Exception as e:
+            spool.finish(job_id, "error", ok=False, error=str(e))
+            log.warning("job %s failed: %s", job_id, e)
@@ -0,0 +1,296 @@
+"""
+Transaction rows read from pdfplumber word positions, with columns learned
+from a bank's table header and wrapped descriptions joined to their row.
+Opt-in with PARSER_LAYOUT=1 for banks that declare a LAYOUT;
+PARSER_LAYOUT_TEMPLATES keeps learned templates in a JSON file.
+"""
+import json
+import os
+import re
+from bisect import bisect_right
+
+from pdfplumber import open as pdf_open
+
+from backends import as_file
+from banks.money import parse_amount, printed_paise
+from banks.table import TransactionTable
+
+DATE_WORD = re.compile(r"(\d{2}/\d{2}/\d{4})")
+
+# Words whose tops differ by less than this (in points) are one line.
+LINE_TOLERANCE = 2.5
+# Minimum horizontal whitespace between two columns when learning them.
+COLUMN_GAP = 6.0
+# Farthest a wrapped description line sits from its dated row.
+WRAP_DISTANCE = 8.0
+# How far a date may sit outside its column heading.
+HEADER_SLACK = 20.0
+
+TEMPLATE_PATH = os.environ.get("PARSER_LAYOUT_TEMPLATES")
+
+
+def layout_enabled():
+    return os.environ.get("PARSER_LAYOUT", "0").lower() in ("1", "true", "on", "yes")
+
+
+def group_lines(words, tolerance=LINE_TOLERANCE):
+    """[(top, words left to right)] for pdfplumber words, top to bottom."""
+    lines = []
+    for w in sorted(words, key=lambda w: (w["top"], w["x0"])):
+        if lines and w["top"] - lines[-1][0] <= tolerance:
+            lines[-1][1].append(w)
+        else:
+            lines.append((w["top"], [w]))
+    for _, line in lines:
+        line.sort(key=lambda w: w["x0"])
+    return lines
+
+
+def find_header(lines, columns):
+    """
+    Index of the first line naming the date and amount columns, with the
+    (column, x0, x1) spans of its heading words; (None, None) if there is none.
+    """
+    for i, (_, words) in enumerate(lines):
+        spans = []
+        for w in words:
+            text = w["text"].upper()
+            for name, keywords in columns.items():
+                if text.startswith(keywords):
+                    spans.append((name, w["x0"], w["x1"]))
+        found = {name for name, _, _ in spans}
+        if "date" in found and "amount" in found:
+            return i, spans
+    return None, None
+
+
+def header_fingerprint(spans):
+    """Heading names and positions, on a 5pt grid so rendering jitter still matches."""
+    return ";".join(f"{name}@{round(x0 / 5) * 5}" for name, x0, _ in sorted(spans, key=lambda s: s[1]))
+
+
+def _overlap(a0, a1, b0, b1):
+    return min(a1, b1) - max(a0, b0)
+
+
+def _near_anchor(tops, anchor_tops):
+    """Tops within WRAP_DISTANCE of an anchor top; both lists ascending."""
+    near, j = set(), 0
+    for top in tops:
+        while j < len(anchor_tops) and anchor_tops[j] < top - WRAP_DISTANCE:
+            j += 1
+        if j < len(anchor_tops) and abs(anchor_tops[j] - top) <= WRAP_DISTANCE:
+            near.add(top)
+    return near
+
+
+def learn_template(lines, spans):
+    """
+    Column template from the lines under a header: a list of (name, left x)
+    in x order, where a column runs to the next one's left edge and name is
+    None for columns the bank does not use. Returns None when the rows do
+    not give a date, description and amount column.
+    """
+    date_spans = [(x0, x1) for name, x0, x1 in spans if name == "date"]
+    anchors = []
+    for top, words in lines:
+        for w in words:
+            if DATE_WORD.match(w["text"]) and any(
+                    _overlap(w["x0"], w["x1"], x0 - HEADER_SLACK, x1 + HEADER_SLACK) > 0 for x0, x1 in date_spans):
+                anchors.append((top, w["x0"]))
+                break
+    if not anchors:
+        return None
+    left = min(x0 for _, x0 in anchors)
+
+    # whitespace rivers between the words of the rows (and their wrapped
+    # lines) separate the columns
+    near = _near_anchor([top for top, _ in lines], [top for top, _ in anchors])
+    intervals = sorted((w["x0"], w["x1"]) for top, words in lines if top in near
+                       for w in words if w["x0"] >= left)
+    clusters = []
+    for x0, x1 in intervals:
+        if clusters and x0 - clusters[-1][1] < COLUMN_GAP:
+            clusters[-1][1] = max(clusters[-1][1], x1)
+        else:
+            clusters.append([x0, x1])
+
+    template = []
+    prev_x1 = None
+    for x0, x1 in clusters:
+        best = max(spans, key=lambda s: _overlap(x0, x1, s[1], s[2]))
+        name = best[0] if _overlap(x0, x1, best[1], best[2]) > 0 else None
+        edge = left - COLUMN_GAP / 2 if prev_x1 is None else (prev_x1 + x0) / 2
+        # a column split by a gap that only these rows have stays one column
+        if not template or template[-1][0] != name:
+            template.append((name, edge))
+        prev_x1 = x1
+    names = {name for name, _ in template}
+    if not {"date", "description", "amount"} <= names:
+        return None
+    return template
+
+
+def assemble_rows(lines, template):
+    """
+    Rows of a page as dicts of column text, using `template`. A row starts
+    at a line with a date in the date column; lines with words only in the
+    description column within WRAP_DISTANCE of a row are its wrapped text.
+    """
+    edges = [x for _, x in template]
+    names = [name for name, _ in template]
+    anchors, wraps = [], []
+    for top, words in lines:
+        cells = {}
+        desc_only = True
+        for w in words:
+            i = bisect_right(edges, w["x0"]) - 1
+            if i < 0:
+                continue  # left of the table (side panels)
+            name = names[i]
+            if name != "description":
+                desc_only = False
+            if name:
+                cells.setdefault(name, []).append(w["text"])
+        if not cells and desc_only:
+            continue
+        date = DATE_WORD.match(cells["date"][0]) if "date" in cells else None
+        if date and "amount" in cells:
+            anchors.append((top, date.group(1), cells))
+        elif desc_only:
+            wraps.append((top, cells["description"]))
+
+    # attach each wrapped line to the nearest row (both lists are by top)
+    before = {i: [] for i in range(len(anchors))}
+    after = {i: [] for i in range(len(anchors))}
+    j = 0
+    for top, words in wraps:
+        while j + 1 < len(anchors) and anchors[j + 1][0] <= top:
+            j += 1
+        candidates = [k for k in (j, j + 1) if k < len(anchors)]
+        if not candidates:
+            continue
+        k = min(candidates, key=lambda k: abs(anchors[k][0] - top))
+        if abs(anchors[k][0] - top) <= WRAP_DISTANCE:
+            (before if top < anchors[k][0] else after)[k].extend(words)
+
+    rows = []
+    for k, (_, date, cells) in enumerate(anchors):
+        row = {name: " ".join(words) for name, words in cells.items()}
+        row["date"] = date
+        row["description"] = " ".join(before[k] + cells.get("description", []) + after[k])
+        rows.append(row)
+    return rows
+
+
+class TemplateStore:
+    """
+    Learned column templates by bank and header fingerprint. With a `path`
+    they are read from it on first use and written back whenever a new one
+    is learned.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.templates = None
+
+    def _loaded(self):
+        if self.templates is None:
+            self.templates = {}
+            if self.path:
+                try:
+                    with open(self.path, encoding="utf-8") as fh:
+                        self.templates = {key: [tuple(col) for col in cols]
+                                          for key, cols in json.load(fh).items()}
+                except (OSError, ValueError):
+                    pass
+        return self.templates
+
+    def get(self, bank, fingerprint):
+        return self._loaded().get(f"{bank}|{fingerprint}")
+
+    def put(self, bank, fingerprint, template):
+        self._loaded()[f"{bank}|{fingerprint}"] = template
+        if self.path:
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(self.templates, fh)
+            os.replace(tmp, self.path)
+
+
+TEMPLATES = TemplateStore(TEMPLATE_PATH)
+
+
+def page_rows(words, bank, spec, template=None, store=TEMPLATES):
+    """
+    Rows on one page and the template they were read with. A page without a
+    header continues the previous page's table with `template`.
+    """
+    lines = group_lines(words)
+    index, spans = find_header(lines, spec["columns"])
+    if index is not None:
+        lines = lines[index + 1:]
+        fingerprint = header_fingerprint(spans)
+        template = store.get(bank, fingerprint)
+        if template is None:
+            template = learn_template(lines, spans)
+            if template is not None:
+                store.put(bank, fingerprint, template)
+    if template is None:
+        return [], None
+    return assemble_rows(lines, template), template
+
+
+def rows_to_table(rows, spec):
+    """Fill a TransactionTable the way the bank's text parser lays it out."""
+    table = TransactionTable(**spec.get("table", {}))
+    extra = list(table.extra)
+    seen = set()
+    for row in rows:
+        paise, drcr = parse_amount(row["amount"])
+        if table.grouping:
+            # written back as printed, like the text parser's amounts
+            paise = printed_paise(row["amount"])
+        if spec.get("skip_zero") and paise == 0:
+            continue
+        if spec.get("dedupe"):
+            key = (row["date"], row["description"], paise)
+            if key in seen:
+                continue
+            seen.add(key)
+        table.append(row["date"], row["description"], paise, drcr or spec.get("default_drcr", ""),
+                     **{key: row.get(key, "") for key in extra})
+    return table
+
+
+def reconcile(table, reference):
+    """
+    `table` (the layout read) checked against `reference` (the text
+    parser's table): None if it misses a row the text parser found, by date
+    and amount. Blank bank-specific columns take the matching reference
+    row's value, since one the text parser reads (an ICICI reward points
+    "0") is not always under its heading.
+    """
+    rows = {}
+    for r in range(len(table)):
+        rows.setdefault((table.date_text(r), table.amounts[r]), []).append(r)
+    for ref in range(len(reference)):
+        matches = rows.get((reference.date_text(ref), reference.amounts[ref]))
+        if not matches:
+            return None
+        r = matches.pop(0)
+        for key, column in table.extra.items():
+            if column[r] == "" and key in reference.extra:
+                column[r] = reference.extra[key][ref]
+    return table
+
+
+def layout_transactions(pdf_path, n_pages, bank, spec, store=TEMPLATES):
+    """Transactions of the first `n_pages` pages read by position, as a TransactionTable."""
+    rows, template = [], None
+    with pdf_open(as_file(pdf_path)) as pdf:
+        for page in pdf.pages[:n_pages]:
+            found, template = page_rows(page.extract_words(), bank, spec, template, store)
+            rows += found
+            page.close()
+    return rows_to_table(rows, spec)
@@ -1,57 +1,296 @@
 import os
+import sys
 import json
-import re
-from pdfplumber import open as pdf_open
-from bank_detect import bank_detect
-from banks.axis_parser import parse as axis_parse
-from banks.hdfc_parser import parse as hdfc_parse
-from banks.icici_parser import parse as icici_parse
-from banks.idfc_parser import parse as idfc_parse
-from banks.general_parser import parse as general_parse
-
-def extract_text_native(pdf_path):
-    text = ""
-    with pdf_open(pdf_path) as pdf:
-        text_pages = [page.extract_text() or "" for page in pdf.pages]
-        text = "\n".join(text_pages)
-    if not text.strip():
-        raise ValueError("No text extracted from PDF. Ensure it's not a scanned image.")
-    return text
-
-def parse_credit_card_statement(pdf_path):
-    text = extract_text_native(pdf_path)
-    bank, confidence = bank_detect(text)
-    print(f"Detected: {bank} ({confidence})")
-    parsers = {
-        "axis": axis_parse,
-        "hdfc": hdfc_parse,
-        "icici": icici_parse,
-        "idfc": idfc_parse,
-    }
+import logging
+from contextlib import closing, redirect_stdout
+from itertools import chain, islice
+from extraction import (DETECT_PAGES, extract_pages_planned, iter_pages, join_pages, stream_enabled, stream_head,
+                        until_planned)
+from bank_detect import bank_counts, bank_detect, decisive, leading_bank
+from cache import cache_enabled, file_digest, result_cache, result_key, text_cache, text_key
+from backends import (BACKENDS, available_backends, backend_tag, default_backend, detect_backend, get_backend,
+                      open_pdf, region_boxes, regions_enabled, tag_backend)
+from banks import bank_backend, load_general_parser, load_parser, page_transactions
+from banks.document import Document, as_document
+from banks.money import format_money_fields, to_paise
+from banks.table import TransactionTable
+from categorize import Categorizer, MerchantCache
+from layout import layout_enabled, layout_transactions, reconcile
+from metrics import ParseMetrics, metrics_enabled, profile_dir, profiled, write_metrics
+from protocol import FORMATS, FrameWriter, write_json
+from timeouts import DEFAULT_TIMEOUT, time_limit
+
+# Diagnostics go to stderr (configured below when run as a script), so stdout
+# carries nothing but the result. PARSER_LOG_LEVEL adjusts how much.
+log = logging.getLogger("parser")
+
+# Detection reads whole pages until one bank has this many more signature
+# hits than any other, which is enough to pick the bank's page plan.
+DECISIVE_HITS = 3
+
+def _page_plan(page_text, n_pages):
+    """((bank, confidence), page plan, reading) from page_text(i) of whole pages."""
+    counts = {}
+    for i in range(n_pages):
+        counts = bank_counts(page_text(i), counts=counts or None)
+        if i + 1 >= DETECT_PAGES and decisive(counts, DECISIVE_HITS):
+            break
+    detection = leading_bank(counts)
+    return (detection,) + _bank_plan(detection)
+
+def _bank_plan(detection):
+    bank, confidence = detection
+    if not bank or confidence < 10:
+        return None, (default_backend(), None)
+    parser = load_parser(bank)
+    return getattr(parser, "PAGE_PLAN", None), _reading(bank, parser)
+
+def _reading(bank, parser):
+    """(backend, regions) the bank's pages are read with."""
+    # a bank's preferred backend is an optimisation; without its package the default does
+    backend = bank_backend(bank)
+    if backend not in available_backends():
+        backend = default_backend()
+    # regions are only kept where the backend crops to them, so the text cache
+    # and metrics never describe cropping that did not happen
+    if not (regions_enabled() and get_backend(backend).crops):
+        return backend, None
+    return backend, region_boxes(getattr(parser, "REGIONS", None))
+
+def load_statement(pdf_path, extract_workers=None, digest=None, metrics=None):
+    """
+    Extract the pages the detected bank's parser needs, reusing cached page
+    texts when `digest` is given (only those with `pdf_path=None`).
+    Returns (page_texts, text, (bank, confidence), (backend, regions)).
+    """
+    metrics = metrics or ParseMetrics()
+    tcache = text_cache() if digest else None
+    with metrics.stage("text_cache"):
+        entry = tcache.get(text_key(digest)) if tcache else None
+    if entry is not None and "detection" not in entry:
+        entry = None  # cached before the detection was kept with the pages
+    known = entry["pages"] if entry else []
+    n_pages = entry["n_pages"] if entry else None
+    if pdf_path is None and entry is None:
+        raise ValueError("Statement text is not in the text cache.")
+    # pages from another backend, or another version of it, are read again
+    known_backend = tag_backend(entry.get("backend")) if entry else None
+    if pdf_path and known_backend is None:
+        known = []
+    known_reading = (known_backend, region_boxes(entry.get("regions"))) if known else None
+    plan_for = _page_plan
+    if known:
+        # the detection made on whole pages when these were read still stands
+        detection = tuple(entry["detection"])
+        plan_for = lambda _page_text, _n_pages: (detection,) + _bank_plan(detection)  # noqa: E731
+
+    with metrics.stage("extract"):
+        pages, detection, n_pages, reading, pages_read = extract_pages_planned(
+            pdf_path, plan_for, workers=extract_workers, known_pages=known, n_pages=n_pages,
+            known_reading=known_reading)
+        text = join_pages(pages)
+
+    backend, regions = reading
+    if tcache and pdf_path and (len(pages) > len(known) or reading != known_reading):
+        with metrics.stage("text_cache"):
+            tcache.put(text_key(digest), {"pages": pages, "n_pages": n_pages, "backend": backend_tag(backend),
+                                          "regions": regions, "detection": list(detection)})
+    metrics.count(pages_read=pages_read, pages_total=n_pages, pages_cached=len(known), text_chars=len(text),
+                  backend=backend, regions=bool(regions))
+    return pages, text, detection, reading
+
+def parse_statement_file(pdf_path, extract_workers=None, use_cache=None, limit=None, name=None):
+    """
+    Parse one PDF, a path or its bytes, through the result and text caches.
+    Returns (result, pages_read, cached).
+    """
+    metrics = ParseMetrics()
+    source = name or ("<memory>" if isinstance(pdf_path, bytes) else pdf_path)
+    with profiled(profile_dir(), source):
+        result, pages, cached = _parse_statement_file(pdf_path, extract_workers, use_cache, limit, metrics)
+        metrics.count(cached=cached)
+        summary = metrics.as_dict()
+    write_metrics(summary, source)
+    if metrics_enabled():
+        result = dict(result, metrics=summary)
+    return result, pages, cached
+
+def _parse_statement_file(pdf_path, extract_workers, use_cache, limit, metrics):
+    with metrics.stage("digest"):
+        digest = file_digest(pdf_path) if (cache_enabled() if use_cache is None else use_cache) else None
+    layout = layout_enabled()
+    # a limited parse is partial, so it neither reads nor fills the result cache
+    cache_result = digest and limit is None
+    if cache_result:
+        with metrics.stage("result_cache"):
+            entry = result_cache().get(result_key(digest, layout))
+        # a result read with another backend or regions than its bank's now is parsed again
+        if entry is not None and entry.get("reading") == _reading_tag(_bank_reading(entry["result"])):
+            return entry["result"], entry["pages"], True
+
+    if stream_enabled():
+        result, pages_read, reading = parse_statement_stream(pdf_path, limit=limit, metrics=metrics)
+    else:
+        pages, text, detection, reading = load_statement(pdf_path, extract_workers, digest, metrics)
+        result = parse_statement_text(Document(text, pages), detection,
+                                      layout_from=(pdf_path, len(pages)) if layout else None,
+                                      limit=limit, metrics=metrics)
+        pages_read = metrics.counts["pages_read"]
+    if cache_result:
+        with metrics.stage("result_cache"):
+            result_cache().put(result_key(digest, layout), {"result": plain_result(result), "pages": pages_read,
+                                                            "reading": _reading_tag(reading)})
+    return result, pages_read, False
+
+def _bank_reading(result):
+    """(backend, regions) a parse of `result`'s bank reads pages with now."""
+    bank = result.get("bank_detected", "Unknown")
+    if bank == "Unknown":
+        return default_backend(), None
+    return _reading(bank, load_parser(bank))
+
+def _reading_tag(reading):
+    """A (backend, regions) reading as a result cache entry keeps it."""
+    backend, regions = reading
+    return [backend_tag(backend), [list(box) for box in regions] if regions else None]
+
+def parse_statement_stream(pdf_path, limit=None, metrics=None):
+    """
+    Parse holding one page at a time, skipping the text cache and layout mode.
+    Returns (result, pages_read, (backend, regions)).
+    """
+    metrics = metrics or ParseMetrics()
+    pages_read = 0
+    def detect_text(index):
+        nonlocal pages_read
+        pages_read += 1
+        return pdf.text(index)
+
+    # detected as load_statement() does, so both modes agree on the bank
+    with metrics.stage("extract"), open_pdf(pdf_path, detect_backend()) as pdf:
+        n_pages = len(pdf)
+        detection, plan, (backend, regions) = _page_plan(detect_text, n_pages)
+
+    def counted(pages):
+        nonlocal pages_read
+        for text in pages:
+            pages_read += 1
+            yield text
+
+    with closing(iter_pages(pdf_path, backend, regions)) as raw:
+        pages = until_planned(counted(raw), plan) if plan else counted(raw)
+        with metrics.stage("extract"):
+            head = stream_head(pages)
+            text = join_pages(head)
+        # reading the rest of the pages is timed as part of "parse"
+        result = parse_statement_text(Document(text, head), detection, limit=limit, metrics=metrics, rest=pages)
+    metrics.count(pages_read=pages_read, pages_total=n_pages, text_chars=len(text), backend=backend,
+                  regions=bool(regions), streamed=True)
+    return result, pages_read, (backend, regions)
+
+def reparse_cached_text(digest):
+    """Parse cached page texts again, without the PDF."""
+    pages, text, detection, reading = load_statement(None, digest=digest)
+    result = parse_statement_text(Document(text, pages), detection)
+    if cache_enabled() and result["bank_detected"] != "Unknown":
+        rcache, key = result_cache(), result_key(digest)
+        # a reparse refreshes a result; it never trades it for a weaker detection
+        entry = rcache.get(key)
+        if entry is None or result["confidence"] >= entry["result"].get("confidence", 0):
+            rcache.put(key, {"result": plain_result(result), "pages": len(pages), "reading": _reading_tag(reading)})
+    return result, len(pages)
+
+def parse_credit_card_statement(pdf_path, extract_workers=None, use_cache=None, limit=None, name=None):
+    return parse_statement_file(pdf_path, extract_workers, use_cache, limit, name)[0]
+
+def parse_statement_text(text, detection=None, layout_from=None, limit=None, metrics=None, rest=None):
+    """
+    Run the detected bank's parser, or the general one, over `text` (a
+    Document or a string). `layout_from=(pdf_path, n_pages)` takes the
+    transactions from word positions when that finds every row; `rest` is
+    the page texts after `text`, searched a page at a time for transactions.
+    """
+    metrics = metrics or ParseMetrics()
+    doc = as_document(text)
+    if detection is None:
+        with metrics.stage("detect"):
+            detection = bank_detect(doc.text)
+    bank, confidence = detection
+    log.info("Detected: %s (%s)", bank, confidence)
 
     if bank and confidence >= 10:
-        parser = parsers.get(bank.lower())
+        parser = load_parser(bank.lower())
         if parser:
-            result = parser(text)
+            with metrics.stage("parse"):
+                result = _run_parser(parser, doc, limit, rest)
             result["bank_detected"] = bank
+            if layout_from and hasattr(parser, "LAYOUT"):
+                with metrics.stage("layout"):
+                    table = layout_transactions(*layout_from, bank.lower(), parser.LAYOUT)
+                    # positions replace the text parser's rows only where they find all of them
+                    table = reconcile(table, result["transactions"])
+                if table:
+                    result["transactions"] = table if limit is None else table.truncate(limit)
         else:
-            print(f"Specific parser not found for {bank}; using general.")
-            result = general_parse(text)
+            log.info("Specific parser not found for %s; using general.", bank)
+            parser = load_general_parser()
+            with metrics.stage("parse"):
+                result = _run_parser(parser, doc, limit, rest)
             result["bank_detected"] = bank
     else:
-        print("Bank detection failed/low confidence; using general parser.")
-        result = general_parse(text)
+        log.info("Bank detection failed/low confidence; using general parser.")
+        parser = load_general_parser()
+        with metrics.stage("parse"):
+            result = _run_parser(parser, doc, limit, rest)
         result["bank_detected"] = "Unknown"
         confidence = 0
 
     if "bank_detected" not in result:
         result["bank_detected"] = bank or "Unknown"
 
-    result["transaction_categories"] = categorize_transactions(result.get("transactions", []))
+    transactions = result.get("transactions", [])
+    with metrics.stage("categorize"):
+        result["transaction_categories"] = categorize_transactions(transactions)
+    metrics.count(transactions=len(transactions))
+    format_money_fields(result, getattr(parser, "AMOUNT_GROUPING", None))
     result["extraction_method"] = "Native"
     result["confidence"] = confidence
     return result
 
+def _run_parser(parser, doc, limit, rest):
+    if rest is None:
+        return parser.parse(doc, limit=limit)
+    # the parser lays out its table; the rows come from all pages, a page at a time
+    result = parser.parse(doc, limit=0)
+    pages = chain(doc.pages or [doc.text], rest)
+    result["transactions"].extend(islice(page_transactions(parser, pages), limit))
+    return result
+
+def plain_result(result):
+    """`result` with its transactions as the list of dicts callers have always seen."""
+    transactions = result.get("transactions")
+    if isinstance(transactions, TransactionTable):
+        return dict(result, transactions=transactions.to_records())
+    return result
+
+# Checked in order: a description takes the first category with a keyword in it.
+CATEGORY_RULES = (
+    ("Fuel", ("fuel", "petrol", "diesel", "hpcl", "ioc", "indianoil", "bharat petroleum", "shell", "pump")),
+    ("Food", ("food", "zomato", "swiggy", "restaurant", "cafe", "dominos", "pizza", "mcdonald", "kfc", "burger", "dining")),
+    ("Shopping", ("flipkart", "amazon", "myntra", "ajio", "meesho", "store", "shopping", "bigbasket", "reliance digital", "rel retail", "digital", "retail", "mall")),
+    ("Travel", ("makemytrip", "ixigo", "irctc", "goibibo", "uber", "ola", "rapido", "flight", "hotel", "booking", "bus", "train")),
+    ("Bills", ("electricity", "water", "gas", "broadband", "mobile", "recharge", "postpaid", "dth", "billdesk", "bill payment", "airtel", "jio")),
+    ("Entertainment", ("netflix", "hotstar", "prime video", "spotify", "bookmyshow", "movie", "game", "youtube", "pvr", "inox")),
+    ("Bills", ("upi", "neft", "imps", "payment", "transfer")),
+)
+
+CATEGORIZER = Categorizer(CATEGORY_RULES)
+
+# Merchants repeat across statements, so a warm worker keeps their categories.
+# Set PARSER_MERCHANT_SNAPSHOT to a file path to carry them across restarts.
+MERCHANTS = MerchantCache(CATEGORIZER, max_entries=int(os.environ.get("PARSER_MERCHANT_CACHE_SIZE", "4096")))
+MERCHANT_SNAPSHOT = os.environ.get("PARSER_MERCHANT_SNAPSHOT")
+
 def categorize_transactions(transactions):
     categories = {
         "Fuel": 0,
@@ -63,42 +302,171 @@ def categorize_transactions(transactions):
         "Other": 0,
     }
 
-    for tx in transactions:
-        desc = tx.get("description", "").lower()
-        desc = re.sub(r'[^a-z0-9 ]+', ' ', desc)
-        amount_str = re.sub(r"[^\d.]", "", str(tx.get("amount", 0)))
-        amount = float(amount_str) if amount_str else 0
-        tx_type = str(tx.get("type", "")).upper()
+    if isinstance(transactions, TransactionTable):
+        return transactions.category_totals(MERCHANTS, categories)
 
-        if "CR" in tx_type or tx.get("is_credit"):
+    debits = [tx for tx in transactions
+              if not ("CR" in str(tx.get("type", "")).upper() or tx.get("is_credit"))]
+    labels = MERCHANTS.classify_many(tx.get("description", "") for tx in debits)
+    paise = {}
+    for tx, category in zip(debits, labels):
+        paise[category] = paise.get(category, 0) + to_paise(str(tx.get("amount", "")))
+    for category, total in paise.items():
+        categories[category] += total / 100
+
+    return categories
+
+# Fields a serve request may carry and the JSON types they take.
+REQUEST_FIELDS = {"cmd": str, "path": str, "size": int, "name": str, "limit": int,
+                  "timeout": (int, float), "cache": bool}
+
+
+def _check_request(req):
+    """Raise ValueError naming the first missing or mistyped field of a serve request."""
+    for field, kind in REQUEST_FIELDS.items():
+        value = req.get(field)
+        if value is None:
             continue
+        if not isinstance(value, kind) or (isinstance(value, bool) and kind is not bool) \
+                or (kind is int and value < 0):
+            raise ValueError(f"bad field: {field}")
+    if req.get("cmd") not in (None, "stats"):
+        raise ValueError(f"unknown cmd: {req['cmd']}")
+    if req.get("cmd") is None and req.get("path") is None and req.get("size") is None:
+        raise ValueError("missing field: path")
 
-        if any(word in desc for word in ["fuel", "petrol", "diesel", "hpcl", "ioc", "indianoil", "bharat petroleum", "shell", "pump"]):
-            categories["Fuel"] += amount
-        elif any(word in desc for word in ["food", "zomato", "swiggy", "restaurant", "cafe", "dominos", "pizza", "mcdonald", "kfc", "burger", "dining"]):
-            categories["Food"] += amount
-        elif any(word in desc for word in ["flipkart", "amazon", "myntra", "ajio", "meesho", "store", "shopping", "bigbasket", "reliance digital", "rel retail", "digital", "retail", "mall"]):
-            categories["Shopping"] += amount
-        elif any(word in desc for word in ["makemytrip", "ixigo", "irctc", "goibibo", "uber", "ola", "rapido", "flight", "hotel", "booking", "bus", "train"]):
-            categories["Travel"] += amount
-        elif any(word in desc for word in ["electricity", "water", "gas", "broadband", "mobile", "recharge", "postpaid", "dth", "billdesk", "bill payment", "airtel", "jio"]):
-            categories["Bills"] += amount
-        elif any(word in desc for word in ["netflix", "hotstar", "prime video", "spotify", "bookmyshow", "movie", "game", "youtube", "pvr", "inox"]):
-            categories["Entertainment"] += amount
-        elif any(word in desc for word in ["upi", "neft", "imps", "payment", "transfer"]):
-            categories["Bills"] += amount
-        else:
-            categories["Other"] += amount
 
-    return categories
+def serve(stdin=None, stdout=None, fmt="json"):
+    """
+    Worker mode: answer one JSON request per line of stdin (binary) until it
+    closes, one `fmt` frame per reply. A "size" request is followed by that
+    many bytes of PDF.
+
+    Request:  {"id": 1, "path": "uploads/statement.pdf"}   (optional "limit", "timeout")
+              {"id": 3, "size": 48213, "name": "statement.pdf"}\n<48213 bytes of PDF>
+              {"id": 2, "cmd": "stats"}
+    Response: {"type": "result", "id": 1, "ok": true, "result": {...}}
+              {"type": "error", "id": 1, "ok": false, "error": "missing field: path"}
+    """
+    stdin = stdin or sys.stdin.buffer
+    writer = FrameWriter(stdout or sys.stdout, fmt)
+    if MERCHANT_SNAPSHOT:
+        MERCHANTS.load(MERCHANT_SNAPSHOT)
+    for line in stdin:
+        line = line.strip()
+        if not line:
+            continue
+        req_id = None
+        try:
+            req = json.loads(line)
+            if not isinstance(req, dict):
+                raise ValueError("request is not a JSON object")
+            req_id = req.get("id")
+            # the bytes are read before anything can fail, or they would be taken for requests
+            size = req.get("size")
+            pdf = stdin.read(size) if type(size) is int and size >= 0 else None
+            if pdf is not None and len(pdf) != size:
+                raise ValueError(f"Expected {size} bytes of PDF, got {len(pdf)}.")
+            _check_request(req)
+            if req.get("cmd") == "stats":
+                msg_type = "stats"
+                result = dict(result_cache().stats(), merchants=MERCHANTS.stats())
+            else:
+                msg_type = "result"
+                # stray prints must not interleave with protocol replies;
+                # a runaway parse is abandoned so the worker stays available
+                with redirect_stdout(sys.stderr), time_limit(req.get("timeout", DEFAULT_TIMEOUT)):
+                    result = parse_credit_card_statement(req["path"] if pdf is None else pdf,
+                                                         use_cache=req.get("cache"), limit=req.get("limit"),
+                                                         name=req.get("name"))
+            reply = (msg_type, {"id": req_id, "ok": True, "result": result})
+        except Exception as e:
+            reply = ("error", {"id": req_id, "ok": False, "error": str(e)})
+        writer.send(reply[0], **reply[1])
+    if MERCHANT_SNAPSHOT:
+        try:
+            MERCHANTS.save(MERCHANT_SNAPSHOT)
+        except OSError as e:
+            log.warning("merchant snapshot not saved: %s", e)
+
+USAGE = ("Usage: python main_parser.py <pdf_path|-> | --serve | --batch <dir|glob|manifest> "
+         "| --reparse-cache | --queue-worker [--workers N] [--no-cache] [--limit N] [--metrics] [--profile DIR] "
+         "[--format pretty|json|orjson|msgpack] [--backend pdfplumber|pdfminer|pypdfium2] [--stream]")
 
 if __name__ == "__main__":
-    import sys
-    if len(sys.argv) != 2:
-        print(json.dumps({"error": "Usage: python main_parser.py <pdf_path>"}))
+    import argparse
+    ap = argparse.ArgumentParser(usage=USAGE)
+    ap.add_argument("pdf_path", nargs="?")
+    ap.add_argument("--serve", action="store_true")
+    ap.add_argument("--batch", metavar="SOURCE")
+    ap.add_argument("--reparse-cache", action="store_true")
+    ap.add_argument("--queue-worker", action="store_true", help="take jobs from the spool (see jobs.py)")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--no-cache", dest="use_cache", action="store_false", default=None)
+    ap.add_argument("--limit", type=int, default=None, help="keep only the first N transactions")
+    ap.add_argument("--metrics", action="store_true", help="attach per-stage timings under \"metrics\"")
+    ap.add_argument("--profile", metavar="DIR", help="write cProfile and tracemalloc reports per statement")
+    ap.add_argument("--format", choices=("pretty",) + FORMATS, default=None,
+                    help="output framing: pretty (a single file's default) or json lines (the others' default)")
+    ap.add_argument("--backend", choices=BACKENDS, default=None,
+                    help="text extraction backend for detection and banks that do not name one")
+    ap.add_argument("--stream", action="store_true", help="hold one page at a time (for very long statements)")
+    args, unknown = ap.parse_known_args()
+    modes = [bool(args.pdf_path), args.serve, bool(args.batch), args.reparse_cache, args.queue_worker]
+    if unknown or sum(modes) != 1 or (args.format == "pretty" and not args.pdf_path):
+        print(json.dumps({"error": USAGE}))
         sys.exit(1)
+    logging.basicConfig(stream=sys.stderr, level=os.environ.get("PARSER_LOG_LEVEL", "INFO").upper(),
+                        format="%(levelname)s %(name)s: %(message)s")
+    # through the environment, so batch workers see them too
+    if args.metrics:
+        os.environ["PARSER_METRICS"] = "1"
+    if args.profile:
+        os.environ["PARSER_PROFILE_DIR"] = args.profile
+    if args.backend:
+        os.environ["PARSER_BACKEND"] = args.backend
+    if args.stream:
+        os.environ["PARSER_STREAM"] = "1"
+
+    fmt = args.format or ("pretty" if args.pdf_path else "json")
     try:
-        result = parse_credit_card_statement(sys.argv[1])
-        print(json.dumps(result, indent=2))
+        get_backend()
+        writer = None if fmt == "pretty" else FrameWriter(sys.stdout, fmt)
+    except ValueError as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+
+    if args.serve:
+        serve(fmt=fmt)
+        sys.exit(0)
+    if args.batch:
+        from batch import run_batch
+        sys.exit(run_batch(args.batch, workers=args.workers, use_cache=args.use_cache, limit=args.limit,
+                           fmt=fmt))
+    if args.reparse_cache:
+        from batch import run_reparse
+        sys.exit(run_reparse(workers=args.workers, fmt=fmt))
+    if args.queue_worker:
+        from jobs import run_worker
+        try:
+            run_worker(use_cache=args.use_cache)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+    try:
+        # "-" reads the PDF itself from stdin
+        pdf = sys.stdin.buffer.read() if args.pdf_path == "-" else args.pdf_path
+        with redirect_stdout(sys.stderr):
+            result = parse_credit_card_statement(pdf, use_cache=args.use_cache, limit=args.limit,
+                                                 name="<stdin>" if args.pdf_path == "-" else None)
     except Exception as e:
-        print(json.dumps({"error": str(e)}))
\ No newline at end of file
+        if writer:
+            writer.send("error", ok=False, error=str(e))
+        else:
+            print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+    if writer:
+        writer.send("result", ok=True, result=result)
+    else:
+        write_json(result, sys.stdout, indent=2)
+        print()
\ No newline at end of file
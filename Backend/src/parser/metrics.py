@@ -0,0 +1,125 @@
+"""
+Per-stage timings, page counts, text size and peak memory of one parse.
+PARSER_METRICS=1 attaches them to each result under "metrics",
+PARSER_METRICS_FILE appends them to a file as JSON lines, and
+PARSER_PROFILE_DIR writes cProfile and tracemalloc reports per statement.
+"""
+import cProfile
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Allocation sites listed in a .mem.txt report.
+TOP_ALLOCATIONS = 25
+
+
+def metrics_enabled():
+    return os.environ.get("PARSER_METRICS", "0").lower() in ("1", "true", "on", "yes")
+
+
+def metrics_file():
+    return os.environ.get("PARSER_METRICS_FILE") or None
+
+
+def profile_dir():
+    return os.environ.get("PARSER_PROFILE_DIR") or None
+
+
+def max_rss_kb():
+    """Peak resident memory of this process so far, in KiB (None where unknown)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class ParseMetrics:
+    """
+    Timings and counts for one parse. Wrap each stage in `with
+    metrics.stage(name):` (a stage entered twice adds up) and record sizes
+    with count(); as_dict() gives the JSON-ready summary.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.counts = {}
+        self._started = (time.perf_counter(), time.process_time())
+
+    @contextmanager
+    def stage(self, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            prev_wall, prev_cpu = self.stages.get(name, (0.0, 0.0))
+            self.stages[name] = (prev_wall + time.perf_counter() - wall,
+                                 prev_cpu + time.process_time() - cpu)
+
+    def count(self, **values):
+        self.counts.update(values)
+
+    def as_dict(self):
+        wall, cpu = self._started
+        summary = {
+            "wall_ms": round((time.perf_counter() - wall) * 1e3, 3),
+            "cpu_ms": round((time.process_time() - cpu) * 1e3, 3),
+            "stages": {name: {"wall_ms": round(w * 1e3, 3), "cpu_ms": round(c * 1e3, 3)}
+                       for name, (w, c) in self.stages.items()},
+        }
+        summary.update(self.counts)
+        summary["max_rss_kb"] = max_rss_kb()
+        if tracemalloc.is_tracing():
+            summary["traced_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+        return summary
+
+
+def write_metrics(summary, source, path=None):
+    """Append `summary` for `source` as one JSON line to `path` (default PARSER_METRICS_FILE)."""
+    path = path or metrics_file()
+    if not path:
+        return
+    with open(path, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps({"file": source, **summary}) + "\n")
+
+
+@contextmanager
+def profiled(directory, source):
+    """
+    Run the block under cProfile and tracemalloc and write both reports to
+    `directory`, named after `source`. Does nothing without a directory.
+    """
+    if not directory:
+        yield
+        return
+    os.makedirs(directory, exist_ok=True)
+    stem = os.path.splitext(os.path.basename(str(source)))[0]
+    base = os.path.join(directory, f"{stem}-{os.getpid()}-{time.time_ns() // 1_000_000}")
+
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    else:
+        tracemalloc.reset_peak()
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(base + ".prof")
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        if started:
+            tracemalloc.stop()
+        with open(base + ".mem.txt", "w", encoding="utf-8") as fh:
+            fh.write(f"traced memory: {current // 1024} KiB at the end, {peak // 1024} KiB peak\n")
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                fh.write(f"{stat}\n")
@@ -0,0 +1,100 @@
+"""
+Framed parser output: every message is a dict whose "type" ("result",
+"error" or "stats") comes first. Formats are json (one object per line,
+the default), orjson (optional, faster) and msgpack (optional; a 4-byte
+big-endian length, then the map).
+"""
+import json
+import struct
+
+from banks.table import TransactionTable
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+FORMATS = ("json", "orjson", "msgpack")
+_PACKAGES = {"orjson": orjson, "msgpack": msgpack}
+
+
+def iter_json(value, indent=None, _depth=0):
+    """
+    The text json.dumps(value, indent=indent) would give, in pieces. A
+    TransactionTable is encoded a record at a time, so however long the
+    statement, neither its records nor the whole document are held at once.
+    """
+    if isinstance(value, dict):
+        items = ((json.dumps(str(k)) + ": ", v) for k, v in value.items())
+        opening, closing = "{", "}"
+    elif isinstance(value, (list, tuple, TransactionTable)):
+        rows = value.records() if isinstance(value, TransactionTable) else value
+        items = (("", v) for v in rows)
+        opening, closing = "[", "]"
+    else:
+        yield json.dumps(value)
+        return
+    if not len(value):
+        yield opening + closing
+        return
+    if indent is None:
+        first, separator, last = "", ", ", ""
+    else:
+        first = "\n" + " " * (indent * (_depth + 1))
+        separator, last = "," + first, "\n" + " " * (indent * _depth)
+    yield opening
+    for i, (key, item) in enumerate(items):
+        yield (separator if i else first) + key
+        yield from iter_json(item, indent, _depth + 1)
+    yield last + closing
+
+
+def write_json(value, fh, indent=None):
+    for chunk in iter_json(value, indent):
+        fh.write(chunk)
+
+
+def _records(value):
+    """default= hook for the binary encoders."""
+    if isinstance(value, TransactionTable):
+        return value.to_records()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+
+def encode(message, fmt):
+    """One whole frame of `message` as bytes (orjson and msgpack only)."""
+    if fmt == "orjson":
+        return orjson.dumps(message, default=_records, option=orjson.OPT_APPEND_NEWLINE)
+    payload = msgpack.packb(message, default=_records)
+    return struct.pack(">I", len(payload)) + payload
+
+
+class FrameWriter:
+    """
+    Writes framed messages to the text stream `out`, or to its binary
+    buffer for orjson and msgpack, flushing after each one.
+    """
+
+    def __init__(self, out, fmt="json"):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown output format {fmt!r}; expected one of: {', '.join(FORMATS)}.")
+        if fmt in _PACKAGES and _PACKAGES[fmt] is None:
+            raise ValueError(f"Output format {fmt!r} needs the {fmt} package.")
+        self.out = out
+        self.format = fmt
+
+    def send(self, msg_type, **fields):
+        message = {"type": msg_type, **fields}
+        if self.format == "json":
+            write_json(message, self.out)
+            self.out.write("\n")
+            self.out.flush()
+            return
+        self.out.flush()
+        self.out.buffer.write(encode(message, self.format))
+        self.out.buffer.flush()
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import collect_pdfs, run_batch  # noqa: E402
+
+
+def test_collect_pdfs(tmp_path):
+    (tmp_path / "a").mkdir()
+    for name in ("a/one.pdf", "two.PDF", "notes.txt"):
+        (tmp_path / name).write_bytes(b"")
+    manifest = tmp_path / "list.txt"
+    manifest.write_text("# statements\na/one.pdf\n\ntwo.PDF\n")
+
+    assert collect_pdfs(str(tmp_path)) == sorted([str(tmp_path / "a/one.pdf"), str(tmp_path / "two.PDF")])
+    assert collect_pdfs(str(manifest)) == [str(tmp_path / "a/one.pdf"), str(tmp_path / "two.PDF")]
+    assert collect_pdfs(str(tmp_path / "**" / "*.pdf")) == [str(tmp_path / "a/one.pdf")]
+
+
+def test_missing_source_fails_the_batch(tmp_path, capsys):
+    for source in (tmp_path / "missing", tmp_path / "*.pdf"):
+        with pytest.raises(FileNotFoundError):
+            collect_pdfs(str(source))
+        assert run_batch(str(source)) == 1
+        assert str(source) in capsys.readouterr().out
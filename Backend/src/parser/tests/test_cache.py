@@ -0,0 +1,102 @@
+import glob
+import os
+import sys
+from itertools import count
+from types import SimpleNamespace
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PARSER_DIR = os.path.dirname(TESTS_DIR)
+SAMPLES_DIR = os.path.join(PARSER_DIR, "..", "..", "..", "real bank statements for testing")
+
+sys.path.insert(0, PARSER_DIR)
+
+import cache  # noqa: E402
+import main_parser  # noqa: E402
+
+SAMPLES = sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf")))
+ICICI = glob.glob(os.path.join(SAMPLES_DIR, "*ICICI*.pdf"))
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("PARSER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(cache, "_caches", {})
+    return tmp_path
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """cache.time.time() ticking one second per call."""
+    ticks = count(1000)
+    monkeypatch.setattr(cache, "time", SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    store = cache.DiskCache("t", path=str(tmp_path / "t.sqlite3"))
+    for key in "abc":
+        store.put(key, "x" * 100)
+    store.max_bytes = store.stats()["bytes"]
+    assert store.get("a") == "x" * 100
+    store.put("d", "x" * 100)
+    assert store.keys() == ["a", "c", "d"]
+    assert store.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_misses_and_dropped(tmp_path, clock):
+    store = cache.DiskCache("t", path=str(tmp_path / "t.sqlite3"), max_age=5)
+    store.put("old", 1)
+    for _ in range(5):
+        store.put("new", 2)
+    assert store.get("old") is None and store.get("new") == 2
+    assert store.keys() == ["new"]
+
+
+def test_result_key(monkeypatch):
+    monkeypatch.delenv("PARSER_BACKEND", raising=False)
+    monkeypatch.setenv("PARSER_STREAM", "0")
+    monkeypatch.setenv("PARSER_REGIONS", "1")
+    key = cache.result_key("abc")
+    assert cache.digest_of(key) == "abc"
+    variants = {key, cache.result_key("abc", layout=True)}
+    for name, value in (("PARSER_BACKEND", "pdfminer"), ("PARSER_STREAM", "1"), ("PARSER_REGIONS", "0")):
+        with monkeypatch.context() as m:
+            m.setenv(name, value)
+            variants.add(cache.result_key("abc"))
+    assert len(variants) == 5
+    assert cache.result_key("abc") == key
+
+
+@pytest.mark.skipif(not ICICI or "pypdfium2" not in main_parser.available_backends(),
+                    reason="needs the ICICI sample and pypdfium2")
+def test_result_read_with_another_backend_is_parsed_again(cache_dir, monkeypatch):
+    path = ICICI[0]
+    assert main_parser.parse_statement_file(path, use_cache=True)[2] is False
+    assert main_parser.parse_statement_file(path, use_cache=True)[2] is True
+
+    # without pypdfium2 ICICI is read with pdfplumber, so its cached result is stale
+    monkeypatch.setattr(main_parser, "available_backends", lambda: ["pdfplumber", "pdfminer"])
+    assert main_parser.parse_statement_file(path, use_cache=True)[2] is False
+    assert main_parser.parse_statement_file(path, use_cache=True)[2] is True
+
+
+@pytest.mark.skipif(not SAMPLES, reason=f"no sample PDFs in {SAMPLES_DIR}")
+def test_page_text_outlives_the_result(cache_dir):
+    path = SAMPLES[0]
+    first, pages, _ = main_parser.parse_statement_file(path, use_cache=True)
+    assert pages > 0
+
+    # a parser change only invalidates results; the pages are not read again
+    cache.result_cache().db.execute("DELETE FROM entries")
+    again, pages, cached = main_parser.parse_statement_file(path, use_cache=True)
+    assert (pages, cached) == (0, False)
+    assert main_parser.plain_result(again) == main_parser.plain_result(first)
+
+    # pages read with another backend are read again
+    key = cache.text_key(cache.file_digest(path))
+    assert cache.digest_of(key) == cache.file_digest(path)
+    entry = cache.text_cache().get(key)
+    cache.text_cache().put(key, dict(entry, backend="pdfminer-0.0"))
+    cache.result_cache().db.execute("DELETE FROM entries")
+    assert main_parser.parse_statement_file(path, use_cache=True)[1] > 0
@@ -0,0 +1,35 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from categorize import Categorizer, MerchantCache  # noqa: E402
+
+RULES = (("Food", ("swiggy", "zomato")), ("Fuel", ("hpcl",)))
+
+
+def test_merchant_keys_fold_numbers_and_cities():
+    merchants = MerchantCache(Categorizer(RULES))
+    assert merchants.key("SWIGGY*ORDER 12345 BANGALORE IN") == merchants.key("SWIGGY*ORDER 67 MUMBAI")
+    assert merchants.classify_many(["SWIGGY 1 PUNE", "SWIGGY 22 DELHI", "HPCL 9"]) == ["Food", "Food", "Fuel"]
+    assert merchants.stats()["hits"] == 1
+
+
+def test_least_recently_used_merchant_is_evicted():
+    merchants = MerchantCache(Categorizer(RULES), max_entries=2)
+    merchants.classify_many(["SWIGGY", "ZOMATO", "SWIGGY", "HPCL"])
+    assert list(merchants.entries) == [merchants.key("SWIGGY"), merchants.key("HPCL")]
+    assert merchants.stats() == {"hits": 1, "misses": 3, "hit_rate": 0.25, "evictions": 1, "entries": 2}
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / "merchants.json")
+    merchants = MerchantCache(Categorizer(RULES))
+    merchants.classify_many(["SWIGGY", "UNKNOWN SHOP"])
+    merchants.save(path)
+
+    restored = MerchantCache(Categorizer(RULES), max_entries=1)
+    assert restored.load(path) == 1
+    assert list(restored.entries) == [merchants.key("UNKNOWN SHOP")]
+    # a snapshot taken under other rules is ignored
+    assert MerchantCache(Categorizer(RULES[:1])).load(path) == 0
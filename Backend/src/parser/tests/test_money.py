@@ -0,0 +1,45 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from banks.money import format_money_fields, format_paise, printed_paise, to_paise  # noqa: E402
+from banks.table import TransactionTable  # noqa: E402
+
+
+def test_to_paise():
+    assert to_paise("₹1,23,456.78") == 12345678
+    assert to_paise("1,289.00 Dr") == 128900
+
+
+def test_format_paise():
+    assert format_paise(123456780) == "1234567.80"
+    assert format_paise(123456780, "indian") == "12,34,567.80"
+    assert format_paise(-50, "indian") == "-0.50"
+
+
+def test_printed_amounts_round_trip():
+    for text in ("22,935.00", "30,000", "1,23,456.7", "999.50"):
+        paise = printed_paise(text)
+        assert format_paise(paise, "indian", paise.decimals) == text
+
+
+def test_printed_amounts_keep_their_grouping():
+    for text in ("5217.50", "1,234,567.00", "12,34,567.00", "30,000", "1,289.5"):
+        paise = printed_paise(text)
+        assert format_paise(paise, paise.grouping, paise.decimals) == text
+
+    result = {"total_amount_due": printed_paise("5217.50"), "credit_limit": printed_paise("1,234,567.00")}
+    format_money_fields(result, "indian")
+    assert result == {"total_amount_due": "5217.50", "credit_limit": "1,234,567.00"}
+
+    table = TransactionTable(grouping="indian")
+    for text in ("5217.50", "1,234,567.00", "22,935.00"):
+        table.append("01/01/2024", "ROW", printed_paise(text))
+    assert [record["amount"] for record in table.records()] == ["5217.50", "1,234,567.00", "22,935.00"]
+
+
+def test_format_money_fields():
+    result = {"credit_limit": printed_paise("30,000"), "total_amount_due": to_paise("22,935.00")}
+    format_money_fields(result, "indian")
+    assert result == {"credit_limit": "30,000", "total_amount_due": "22,935.00"}
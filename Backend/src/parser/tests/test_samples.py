@@ -0,0 +1,80 @@
+"""
+Regression tests over the sample statements: every way of running the
+parser must give the output pinned in fixtures/ (<name>.layout.json where
+PARSER_LAYOUT=1 reads more than the text parser).
+
+    python3 -m pytest -q tests
+"""
+import glob
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PARSER_DIR = os.path.dirname(TESTS_DIR)
+FIXTURES_DIR = os.path.join(TESTS_DIR, "fixtures")
+SAMPLES_DIR = os.path.join(PARSER_DIR, "..", "..", "..", "real bank statements for testing")
+MAIN_PARSER = os.path.join(PARSER_DIR, "main_parser.py")
+
+sys.path.insert(0, PARSER_DIR)
+
+from cache import file_digest  # noqa: E402
+
+SAMPLES = sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf")))
+
+pytestmark = pytest.mark.skipif(not SAMPLES, reason=f"no sample PDFs in {SAMPLES_DIR}")
+
+
+def _name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def expected(path, layout=False):
+    fixture = os.path.join(FIXTURES_DIR, _name(path))
+    if layout and os.path.exists(fixture + ".layout.json"):
+        fixture += ".layout"
+    with open(fixture + ".json", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def run_parser(*args, **env):
+    environ = dict(os.environ, PARSER_CACHE="0", PARSER_STREAM="0", PARSER_LAYOUT="0", PARSER_METRICS="0")
+    environ.update(env)
+    proc = subprocess.run([sys.executable, MAIN_PARSER, *args], cwd=PARSER_DIR, env=environ,
+                          stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, timeout=300)
+    assert proc.returncode == 0, proc.stdout
+    return proc.stdout
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=_name)
+def test_normal(path):
+    assert json.loads(run_parser(path)) == expected(path)
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=_name)
+def test_stream(path):
+    assert json.loads(run_parser(path, "--stream")) == expected(path)
+
+
+@pytest.mark.parametrize("path", SAMPLES, ids=_name)
+def test_layout(path):
+    assert json.loads(run_parser(path, PARSER_LAYOUT="1")) == expected(path, layout=True)
+
+
+def test_reparse_cache(tmp_path):
+    cached = dict(PARSER_CACHE="1", PARSER_CACHE_DIR=str(tmp_path))
+    for path in SAMPLES:
+        assert json.loads(run_parser(path, **cached)) == expected(path)
+
+    frames = [json.loads(line) for line in run_parser("--reparse-cache", **cached).splitlines()]
+    results = {frame["digest"]: frame["result"] for frame in frames if frame["type"] == "result"}
+    assert len(frames) == len(SAMPLES)
+    for path in SAMPLES:
+        assert results[file_digest(path)] == expected(path)
+
+    # the refreshed result cache answers the next parse
+    for path in SAMPLES:
+        assert json.loads(run_parser(path, **cached)) == expected(path)
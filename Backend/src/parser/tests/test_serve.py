@@ -0,0 +1,84 @@
+import glob
+import io
+import json
+import os
+import struct
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PARSER_DIR = os.path.dirname(TESTS_DIR)
+SAMPLES_DIR = os.path.join(PARSER_DIR, "..", "..", "..", "real bank statements for testing")
+
+sys.path.insert(0, PARSER_DIR)
+
+import cache  # noqa: E402
+from main_parser import serve  # noqa: E402
+
+SAMPLES = sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf")))
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("PARSER_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(cache, "_caches", {})
+
+
+def run_serve(requests, fmt="json"):
+    """serve() over `requests` (dicts, or bytes sent as they are); the raw output."""
+    stdin = io.BytesIO(b"".join(r if isinstance(r, bytes) else json.dumps(r).encode() + b"\n" for r in requests))
+    out = io.BytesIO()
+    stdout = io.TextIOWrapper(out, encoding="utf-8", write_through=True)
+    serve(stdin=stdin, stdout=stdout, fmt=fmt)
+    stdout.flush()
+    return out.getvalue()
+
+
+def test_bad_requests_name_the_field():
+    replies = [json.loads(line) for line in run_serve([
+        {"id": 1},
+        {"id": 2, "path": "x.pdf", "limit": "ten"},
+        {"id": 3, "cmd": "reload"},
+        b"[1, 2]\n",
+        b"not json\n",
+    ]).splitlines()]
+    assert [r["type"] for r in replies] == ["error"] * 5
+    assert [r["id"] for r in replies] == [1, 2, 3, None, None]
+    assert replies[0]["error"] == "missing field: path"
+    assert replies[1]["error"] == "bad field: limit"
+    assert replies[2]["error"] == "unknown cmd: reload"
+    assert replies[3]["error"] == "request is not a JSON object"
+
+
+def test_ndjson_frames_follow_the_requests():
+    replies = [json.loads(line) for line in run_serve([
+        {"id": 1, "cmd": "stats"},
+        b'{"id": 2, "size": 10}\n%PDF-',
+    ]).splitlines()]
+    assert [(r["type"], r["id"], r["ok"]) for r in replies] == [("stats", 1, True), ("error", 2, False)]
+    assert replies[1]["error"] == "Expected 10 bytes of PDF, got 5."
+
+
+@pytest.mark.skipif(not SAMPLES, reason=f"no sample PDFs in {SAMPLES_DIR}")
+def test_pdf_bytes_and_path_give_the_same_result():
+    with open(SAMPLES[0], "rb") as fh:
+        pdf = fh.read()
+    replies = [json.loads(line) for line in run_serve([
+        b'{"id": 1, "cache": false, "size": %d}\n' % len(pdf) + pdf,
+        {"id": 2, "cache": False, "path": SAMPLES[0]},
+    ]).splitlines()]
+    assert [(r["type"], r["id"]) for r in replies] == [("result", 1), ("result", 2)]
+    assert replies[0]["result"] == replies[1]["result"]
+
+
+def test_msgpack_frames():
+    msgpack = pytest.importorskip("msgpack")
+    raw = run_serve([{"id": 1}, {"id": 2, "cmd": "stats"}], fmt="msgpack")
+    frames = []
+    while raw:
+        (size,) = struct.unpack(">I", raw[:4])
+        frames.append(msgpack.unpackb(raw[4:4 + size]))
+        raw = raw[4 + size:]
+    assert [(f["type"], f["id"]) for f in frames] == [("error", 1), ("stats", 2)]
+    assert frames[0]["error"] == "missing field: path"
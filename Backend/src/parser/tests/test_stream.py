@@ -0,0 +1,79 @@
+"""A streamed parse, a page at a time, must find what a whole one does."""
+import glob
+import os
+import random
+import sys
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+PARSER_DIR = os.path.dirname(TESTS_DIR)
+SAMPLES_DIR = os.path.join(PARSER_DIR, "..", "..", "..", "real bank statements for testing")
+
+sys.path.insert(0, PARSER_DIR)
+
+from banks import BANKS, general_parser, load_general_parser, load_parser, page_transactions  # noqa: E402
+from benchmarks.bench_memory import LINES_PER_PAGE, synthetic_pdf  # noqa: E402
+from benchmarks.bench_stream import synthetic_statement  # noqa: E402
+from main_parser import load_statement, parse_statement_file, plain_result  # noqa: E402
+
+SAMPLES = sorted(glob.glob(os.path.join(SAMPLES_DIR, "*.pdf")))
+PARSERS = sorted(BANKS) + ["general"]
+
+
+def _parser(name):
+    return load_general_parser() if name == "general" else load_parser(name)
+
+
+def _split(lines, pages, rng):
+    cuts = sorted(rng.sample(range(1, len(lines)), pages - 1))
+    return ["\n".join(lines[a:b]) for a, b in zip([0] + cuts, cuts + [len(lines)])]
+
+
+@pytest.mark.skipif(not SAMPLES, reason="no sample PDFs")
+@pytest.mark.parametrize("path", SAMPLES, ids=os.path.basename)
+@pytest.mark.parametrize("name", PARSERS)
+def test_every_parser_pages_like_whole_text(path, name):
+    pages, text, _, _ = load_statement(path)
+    parser = _parser(name)
+    assert list(page_transactions(parser, pages)) == list(parser.iter_transactions(text))
+
+
+STATEMENTS = {
+    "heading": synthetic_statement(300),
+    "no heading": "\n".join(synthetic_statement(300).splitlines()[3:]),
+    # a dated line before the heading must not become a row
+    "summary first": "11/02/2023 PAYMENT SUMMARY 1,234.00\n" + synthetic_statement(300),
+    "late heading": "01/02/2023 STRAY SHOP 5.00\n" * 40 + "TRANSACTION\nDETAILS\n" + synthetic_statement(50),
+    # rows spread over lines, so most page breaks fall inside one
+    "wrapped rows": "TRANSACTION DETAILS\n" + "01/02/2023\nHELLO WORLD\nSHOP\n1,234.00\nDr\n" * 200,
+    "line fallback": "TRANSACTION DETAILS\n" + "03/04/2023 aa 7\n" * 100,
+}
+
+
+@pytest.mark.parametrize("name", sorted(STATEMENTS))
+def test_general_parser_pages_like_whole_text(name):
+    text = STATEMENTS[name]
+    lines = text.split("\n")
+    whole = list(general_parser.iter_transactions(text))
+    assert whole
+    rng = random.Random(name)
+    for pages in (1, 2, 7, 40):
+        assert list(general_parser.iter_page_transactions(_split(lines, pages, rng))) == whole
+
+
+def test_stream_parse_like_whole_parse(tmp_path, monkeypatch):
+    # the heading is on the third page, past the pages a stream keeps
+    lines = ["Statement Date: 15/05/2021", "11/02/2023 PAYMENT SUMMARY 1,234.00"]
+    lines += ["filler"] * (2 * LINES_PER_PAGE)
+    lines += synthetic_statement(400).splitlines()
+    path = str(tmp_path / "statement.pdf")
+    synthetic_pdf(path, lines)
+
+    results = []
+    for stream in ("0", "1"):
+        monkeypatch.setenv("PARSER_STREAM", stream)
+        result, _, _ = parse_statement_file(path, extract_workers=1, use_cache=False)
+        results.append(plain_result(result))
+    assert len(results[0]["transactions"]) == 400
+    assert results[1] == results[0]
@@ -0,0 +1,58 @@
+import os
+import signal
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timeouts import ParseTimeout, time_limit  # noqa: E402
+
+needs_alarm = pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="no SIGALRM on this platform")
+
+
+def spin(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+@needs_alarm
+def test_runaway_block_is_abandoned():
+    previous = signal.getsignal(signal.SIGALRM)
+    start = time.monotonic()
+    with pytest.raises(ParseTimeout, match="0.05s"):
+        with time_limit(0.05):
+            spin(5)
+    assert time.monotonic() - start < 1
+    # the alarm is disarmed and the old handler is back
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+    assert signal.getsignal(signal.SIGALRM) is previous
+
+
+@needs_alarm
+def test_block_within_the_limit_is_left_alone():
+    with time_limit(5):
+        spin(0.01)
+    assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+
+
+def test_no_limit_off_the_main_thread_or_when_off():
+    with time_limit(0):
+        spin(0.01)
+
+    errors = []
+
+    def worker():
+        try:
+            with time_limit(0.01):
+                spin(0.05)
+        except Exception as e:
+            errors.append(e)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    assert errors == []
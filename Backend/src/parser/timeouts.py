@@ -0,0 +1,38 @@
+"""
+Wall-clock limit for one parse: time_limit() arms SIGALRM around a block
+and abandons it with ParseTimeout. PARSER_TIMEOUT is the default in
+seconds (0 turns it off).
+"""
+import os
+import signal
+import threading
+from contextlib import contextmanager
+
+DEFAULT_TIMEOUT = float(os.environ.get("PARSER_TIMEOUT", "120"))
+
+
+class ParseTimeout(Exception):
+    pass
+
+
+@contextmanager
+def time_limit(seconds=DEFAULT_TIMEOUT):
+    """
+    Raise ParseTimeout inside the block once it has run `seconds`. Does
+    nothing for a falsy `seconds`, off the main thread or where SIGALRM is
+    not available (Windows).
+    """
+    if not seconds or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise ParseTimeout(f"parse took longer than {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
@@ -1,6 +1,25 @@
 import { useState } from 'react';
 import axios from 'axios';
 
+const API_URL = 'https://credit-card-parser-backend-u1mf.onrender.com/api';
+const POLL_INTERVAL_MS = 1000;
+const POLL_LIMIT = 300;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// The upload is answered as soon as it is queued; poll its statement until
+// the parser has finished with it.
+const waitForStatement = async (id) => {
+  for (let i = 0; i < POLL_LIMIT; i++) {
+    const { data } = await axios.get(`${API_URL}/statements/${id}`);
+    const statement = data.data;
+    if (statement.status === 'Parsed') return statement.parsedData;
+    if (statement.status === 'Failed') throw new Error(statement.errorMessage || 'Parsing failed');
+    await sleep(POLL_INTERVAL_MS);
+  }
+  throw new Error('Parsing is taking too long');
+};
+
 const UploadPage = ({ setParsedData, setLoading, loading }) => {
   const [file, setFile] = useState(null);
   const [dragActive, setDragActive] = useState(false);
@@ -40,10 +59,10 @@ const UploadPage = ({ setParsedData, setLoading, loading }) => {
     formData.append('file', file);
 
     try {
-      const response = await axios.post('https://credit-card-parser-backend-u1mf.onrender.com/api/upload', formData, {
+      const response = await axios.post(`${API_URL}/upload`, formData, {
         headers: { 'Content-Type': 'multipart/form-data' },
       });
-      setParsedData(response.data.data);
+      setParsedData(await waitForStatement(response.data.data.id));
     } catch (error) {
       console.error('Upload failed:', error);
       alert('Upload failed. Please try again.');